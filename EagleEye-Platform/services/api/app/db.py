@@ -1,9 +1,21 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from decimal import Decimal
+import orjson
 import os
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./eagleeye.db")
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"not JSON serializable: {type(value).__name__}")
+
+def json_dumps(value) -> str:
+    """orjson codec for JSON/JSONB columns (datetimes and UUIDs encode natively)"""
+    return orjson.dumps(value, default=_json_default).decode()
+
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, json_serializer=json_dumps, json_deserializer=orjson.loads)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -0,0 +1,66 @@
+"""Estimate storage on the structured JSON(B) columns.
+
+Each save is a new version per project; "latest" is the highest version, read
+through ix_estimates_project_version. Totals are read with JSON path
+expressions on `summary`, so listing them never loads or decodes base line
+items.
+"""
+from typing import Optional
+import uuid
+
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .models import Estimate
+
+SECTIONS = ("base", "alternates", "allowances", "summary")
+SAVE_ATTEMPTS = 3
+
+
+def save_estimate(db: Session, project_id: uuid.UUID, payload: dict) -> Estimate:
+    """Store payload as the project's next version (retries if a concurrent save took it)"""
+    for attempt in range(SAVE_ATTEMPTS):
+        current = db.execute(select(func.max(Estimate.version)).where(Estimate.project_id == project_id)).scalar()
+        est = Estimate(project_id=project_id, version=(current or 0) + 1, **{k: payload.get(k) for k in SECTIONS})
+        try:
+            # Savepoint: a lost version race must not discard the caller's other pending changes
+            with db.begin_nested():
+                db.add(est)
+        except IntegrityError:
+            if attempt == SAVE_ATTEMPTS - 1:
+                raise
+            continue
+        db.commit()
+        return est
+
+
+def latest_estimate(db: Session, project_id: uuid.UUID) -> Optional[Estimate]:
+    stmt = select(Estimate).where(Estimate.project_id == project_id).order_by(Estimate.version.desc()).limit(1)
+    return db.execute(stmt).scalar()
+
+
+def estimate_payload(est: Estimate) -> dict:
+    """The four sections as one document; rows from before the JSON columns fall back to `payload`"""
+    if est.summary is None and est.base is None and est.payload:
+        return orjson.loads(est.payload)
+    return {k: getattr(est, k) for k in SECTIONS}
+
+
+def latest_totals(db: Session, project_id: uuid.UUID) -> Optional[dict]:
+    """Latest version's totals, extracted by the database from `summary`"""
+    stmt = (
+        select(
+            Estimate.id,
+            Estimate.version,
+            Estimate.summary["subtotal"].as_float().label("subtotal"),
+            Estimate.summary["total"].as_float().label("total"),
+            Estimate.created_at,
+        )
+        .where(Estimate.project_id == project_id)
+        .order_by(Estimate.version.desc())
+        .limit(1)
+    )
+    row = db.execute(stmt).first()
+    return row._asdict() if row else None
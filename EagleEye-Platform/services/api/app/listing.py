@@ -0,0 +1,95 @@
+"""Keyset pagination and NDJSON streaming for list endpoints.
+
+On Postgres rows are ordered oldest first by (created_at, id) and a page
+continues with `(created_at, id) > cursor`, so every page is an index range
+scan no matter how deep (ix_*_created indexes) and paging follows creation
+order; id only breaks ties between rows created in the same instant.
+
+Other dialects (SQLite in development) page on id alone, so their order is
+stable but arbitrary: SQLite keeps server-default timestamps as second-precision
+text, which does not compare reliably with bound datetimes.
+
+The cursor for the next page comes back in the X-Next-Cursor header (absent on
+the last page).
+"""
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Session
+
+from .db import engine
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_LIMIT = 1000
+NDJSON_BATCH = 1000
+
+
+def parse_uuid(value: str, name: str = "id") -> uuid.UUID:
+    try:
+        return uuid.UUID(value)
+    except (ValueError, AttributeError, TypeError):
+        raise HTTPException(status_code=400, detail=f"invalid {name}: {value!r}")
+
+
+def _by_created(bind) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: uuid.UUID) -> str:
+    value = [created_at.isoformat() if created_at else None, str(row_id)]
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+def decode_cursor(cursor: str, by_created: bool) -> Tuple[Optional[datetime], uuid.UUID]:
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if by_created:
+            return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+        return None, uuid.UUID(row_id)
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise HTTPException(status_code=400, detail=f"invalid cursor: {cursor!r}")
+
+
+def _ordered(stmt: Select, bind, created_at, key) -> Select:
+    return stmt.order_by(created_at, key) if _by_created(bind) else stmt.order_by(key)
+
+
+def keyset_page(db: Session, stmt: Select, created_at, key, limit: int, cursor: Optional[str],
+                response: Response) -> list:
+    """
+    Rows of one page (projected columns only, which must include created_at
+    and id); sets X-Next-Cursor if there are more.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    bind = db.get_bind()
+    by_created = _by_created(bind)
+    if cursor:
+        after_created, after_id = decode_cursor(cursor, by_created)
+        stmt = stmt.where(tuple_(created_at, key) > tuple_(after_created, after_id) if by_created else key > after_id)
+    rows = db.execute(_ordered(stmt, bind, created_at, key).limit(limit + 1)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at if by_created else None, last.id)
+    return rows
+
+
+def _ndjson_lines(stmt: Select, to_dict: Callable[[Any], dict]) -> Iterator[str]:
+    # Own connection: the request's Session is closed before a streamed body is sent
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=NDJSON_BATCH).execute(stmt)
+        for rows in result.partitions():
+            yield "".join(json.dumps(to_dict(row), default=str) + "\n" for row in rows)
+
+
+def ndjson_response(stmt: Select, created_at, key, to_dict: Callable[[Any], dict]) -> StreamingResponse:
+    """Every matching row as newline-delimited JSON, in page order, fetched and sent in batches"""
+    return StreamingResponse(_ndjson_lines(_ordered(stmt, engine, created_at, key), to_dict),
+                             media_type="application/x-ndjson")
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import JSON, Column, String, DateTime, ForeignKey, Index, Integer, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -26,8 +26,13 @@ class Contact(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    # Keyset paging on (created_at, id), overall and per account (see listing.py)
+    __table_args__ = (
+        Index("ix_projects_created", "created_at", "id"),
+        Index("ix_projects_account_created", "account_id", "created_at", "id"),
+    )
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    account_id = Column(UUID(as_uuid=True), ForeignKey("accounts.id"))
+    account_id = Column(UUID(as_uuid=True), ForeignKey("accounts.id"), index=True)
     name = Column(String, nullable=False)
     jurisdiction = Column(String)
     address = Column(Text)
@@ -45,8 +50,9 @@ class File(Base):
 
 class Finding(Base):
     __tablename__ = "findings"
+    __table_args__ = (Index("ix_findings_project_created", "project_id", "created_at", "id"),)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"))
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), index=True)
     severity = Column(String)  # red/orange/yellow/info
     discipline = Column(String)
     location = Column(String)
@@ -56,9 +62,18 @@ class Finding(Base):
     ve_alt = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+# JSONB on Postgres (same columns as infra/db/schema.sql), JSON on SQLite
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 class Estimate(Base):
     __tablename__ = "estimates"
+    __table_args__ = (Index("ix_estimates_project_version", "project_id", "version", unique=True),)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"))
-    payload = Column(Text)  # JSON string (base/alternates/allowances/summary)
+    version = Column(Integer, nullable=False, default=1)
+    base = Column(JSONDocument)
+    alternates = Column(JSONDocument)
+    allowances = Column(JSONDocument)
+    summary = Column(JSONDocument)
+    payload = Column(Text)  # legacy JSON string, read only for rows written before the JSON columns
     created_at = Column(DateTime(timezone=True), server_default=func.now())
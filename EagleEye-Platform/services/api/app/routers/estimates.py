@@ -1,33 +1,57 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-import json
+from typing import Optional
 from ..db import get_db
-from ..models import Estimate, Finding
+from ..estimate_store import estimate_payload, latest_estimate, latest_totals, save_estimate
+from ..listing import keyset_page, ndjson_response, parse_uuid
+from ..models import Finding
 
 router = APIRouter(prefix="/estimates", tags=["estimates"])
 
 @router.post("/{project_id}/quick")
 def quick_estimate(project_id: str, db: Session = Depends(get_db)):
     # Minimal placeholder logic: create a tiny estimate and one sample finding
+    pid = parse_uuid(project_id, "project_id")
     payload = {
         "base": [{"ee_code":"EE-RBL-DW-HANG-001","uom":"SF","qty":1000,"unit":1.75,"ext":1750}],
         "alternates": [{"name":"Standing seam roof","amount":12000}],
         "allowances": [{"name":"Inspections/Testing","amount":500}],
         "summary": {"subtotal":14250, "op":0.10, "cont":0.05, "total":14250*1.15}
     }
-    est = Estimate(project_id=project_id, payload=json.dumps(payload))
-    db.add(est)
-    f = Finding(project_id=project_id, severity="orange", discipline="Envelope", location="A1/Details-03", code_citation="IRC 2018 R703.4", impact="Moisture intrusion risk", recommendation="Add pan flashing & end dams at head/jamb", ve_alt="Factory-flashed unit")
+    f = Finding(project_id=pid, severity="orange", discipline="Envelope", location="A1/Details-03", code_citation="IRC 2018 R703.4", impact="Moisture intrusion risk", recommendation="Add pan flashing & end dams at head/jamb", ve_alt="Factory-flashed unit")
     db.add(f)
-    db.commit(); db.refresh(est)
-    return {"estimate_id": str(est.id), "payload": payload}
+    est = save_estimate(db, pid, payload)
+    return {"estimate_id": str(est.id), "version": est.version, "payload": payload}
 
 @router.get("/{project_id}")
 def get_latest_estimate(project_id: str, db: Session = Depends(get_db)):
-    row = db.query(Estimate).filter(Estimate.project_id==project_id).order_by(Estimate.created_at.desc()).first()
-    return {"estimate_id": str(row.id), "payload": json.loads(row.payload)} if row else {"estimate_id": None, "payload": None}
+    row = latest_estimate(db, parse_uuid(project_id, "project_id"))
+    return {"estimate_id": str(row.id), "version": row.version, "payload": estimate_payload(row)} if row else {"estimate_id": None, "payload": None}
+
+@router.get("/{project_id}/totals")
+def get_latest_totals(project_id: str, db: Session = Depends(get_db)):
+    """Subtotal/total of the latest version, without loading line items"""
+    totals = latest_totals(db, parse_uuid(project_id, "project_id"))
+    if totals is None:
+        return {"estimate_id": None}
+    estimate_id = totals.pop("id")
+    return {"estimate_id": str(estimate_id), **totals}
+
+FINDING_COLUMNS = (Finding.id, Finding.severity, Finding.discipline, Finding.location, Finding.code_citation, Finding.impact, Finding.recommendation, Finding.ve_alt, Finding.created_at)
+
+def _finding_dict(x) -> dict:
+    return {"id": str(x.id), "severity": x.severity, "discipline": x.discipline, "location": x.location, "code_citation": x.code_citation, "impact": x.impact, "recommendation": x.recommendation, "ve_alt": x.ve_alt}
+
+def _findings_query(project_id: str):
+    return select(*FINDING_COLUMNS).where(Finding.project_id == parse_uuid(project_id, "project_id"))
 
 @router.get("/{project_id}/findings")
-def list_findings(project_id: str, db: Session = Depends(get_db)):
-    q = db.query(Finding).filter(Finding.project_id==project_id).all()
-    return [{"id": str(x.id), "severity": x.severity, "discipline": x.discipline, "location": x.location, "code_citation": x.code_citation, "impact": x.impact, "recommendation": x.recommendation, "ve_alt": x.ve_alt} for x in q]
+def list_findings(project_id: str, response: Response, limit: int = 500, cursor: Optional[str] = None, db: Session = Depends(get_db)):
+    rows = keyset_page(db, _findings_query(project_id), Finding.created_at, Finding.id, limit, cursor, response)
+    return [_finding_dict(x) for x in rows]
+
+@router.get("/{project_id}/findings/export.ndjson")
+def export_findings(project_id: str):
+    """All of a project's findings as NDJSON, streamed"""
+    return ndjson_response(_findings_query(project_id), Finding.created_at, Finding.id, _finding_dict)
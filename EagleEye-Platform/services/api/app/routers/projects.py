@@ -1,11 +1,25 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from typing import Optional
 from ..db import get_db
+from ..listing import keyset_page, ndjson_response, parse_uuid
 from ..models import Project
 from ..schemas import ProjectIn, ProjectOut
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+PROJECT_COLUMNS = (Project.id, Project.account_id, Project.name, Project.jurisdiction, Project.address, Project.status, Project.created_at)
+
+def _project_dict(p) -> dict:
+    return {"id": str(p.id), "account_id": str(p.account_id), "name": p.name, "jurisdiction": p.jurisdiction, "address": p.address, "status": p.status}
+
+def _projects_query(account_id: Optional[str]):
+    stmt = select(*PROJECT_COLUMNS)
+    if account_id:
+        stmt = stmt.where(Project.account_id == parse_uuid(account_id, "account_id"))
+    return stmt
+
 @router.post("/", response_model=ProjectOut)
 def create_project(data: ProjectIn, db: Session = Depends(get_db)):
     obj = Project(**data.model_dump())
@@ -13,6 +27,11 @@ def create_project(data: ProjectIn, db: Session = Depends(get_db)):
     return ProjectOut(id=str(obj.id), status=obj.status, **data.model_dump())
 
 @router.get("/", response_model=list[ProjectOut])
-def list_projects(db: Session = Depends(get_db)):
-    q = db.query(Project).all()
-    return [ProjectOut(id=str(p.id), account_id=str(p.account_id), name=p.name, jurisdiction=p.jurisdiction, address=p.address, status=p.status) for p in q]
+def list_projects(response: Response, limit: int = 100, cursor: Optional[str] = None, account_id: Optional[str] = None, db: Session = Depends(get_db)):
+    rows = keyset_page(db, _projects_query(account_id), Project.created_at, Project.id, limit, cursor, response)
+    return [_project_dict(p) for p in rows]
+
+@router.get("/export.ndjson")
+def export_projects(account_id: Optional[str] = None):
+    """All projects as NDJSON (one object per line), streamed for bulk/BI consumers"""
+    return ndjson_response(_projects_query(account_id), Project.created_at, Project.id, _project_dict)
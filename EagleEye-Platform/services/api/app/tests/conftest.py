@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# app.db builds its engine at import time: point it at a throwaway SQLite file first
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='eagleeye-test-')}/test.db")
@@ -0,0 +1,93 @@
+import uuid
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app import estimate_store
+from app.db import SessionLocal
+from app.estimate_store import estimate_payload, latest_estimate, save_estimate
+from app.main import app
+from app.models import Estimate, Project
+
+client = TestClient(app)
+
+PAYLOAD = {
+    "base": [{"ee_code": "EE-RBL-DW-HANG-001", "uom": "SF", "qty": 1000, "unit": 1.75, "ext": 1750}],
+    "alternates": [],
+    "allowances": [{"name": "Inspections/Testing", "amount": 500}],
+    "summary": {"subtotal": 2250, "total": 2587.5},
+}
+
+
+@pytest.fixture
+def project_id():
+    pid = uuid.uuid4()
+    with SessionLocal() as db:
+        db.add(Project(id=pid, name="Estimate test"))
+        db.commit()
+    return pid
+
+
+def test_each_save_is_the_next_version(project_id):
+    with SessionLocal() as db:
+        versions = [save_estimate(db, project_id, PAYLOAD).version for _ in range(3)]
+        assert versions == [1, 2, 3]
+        latest = latest_estimate(db, project_id)
+        assert latest.version == 3
+        assert estimate_payload(latest) == PAYLOAD
+
+
+def test_latest_endpoints(project_id):
+    with SessionLocal() as db:
+        save_estimate(db, project_id, {**PAYLOAD, "summary": {"subtotal": 1, "total": 1}})
+        est = save_estimate(db, project_id, PAYLOAD)
+        est_id = str(est.id)
+
+    latest = client.get(f"/estimates/{project_id}").json()
+    assert latest == {"estimate_id": est_id, "version": 2, "payload": PAYLOAD}
+
+    totals = client.get(f"/estimates/{project_id}/totals").json()
+    assert totals["estimate_id"] == est_id
+    assert (totals["version"], totals["subtotal"], totals["total"]) == (2, 2250, 2587.5)
+
+
+def test_no_estimate_yet(project_id):
+    assert client.get(f"/estimates/{project_id}").json() == {"estimate_id": None, "payload": None}
+    assert client.get(f"/estimates/{project_id}/totals").json() == {"estimate_id": None}
+
+
+def test_legacy_row_reads_payload_column(project_id):
+    with SessionLocal() as db:
+        db.add(Estimate(project_id=project_id, version=1, payload=orjson.dumps(PAYLOAD).decode()))
+        db.commit()
+        assert estimate_payload(latest_estimate(db, project_id)) == PAYLOAD
+
+
+def test_lost_version_race_retries_without_dropping_pending_changes(project_id, monkeypatch):
+    with SessionLocal() as db:
+        save_estimate(db, project_id, PAYLOAD)
+        # A concurrent save takes version 2 between our max() read and our insert
+        real_max = estimate_store.func.max
+        calls = []
+
+        def stale_max(column):
+            calls.append(column)
+            if len(calls) == 1:
+                with SessionLocal() as other:
+                    other.add(Estimate(project_id=project_id, version=2, **PAYLOAD))
+                    other.commit()
+                return real_max(column) - 1
+            return real_max(column)
+
+        monkeypatch.setattr(estimate_store.func, "max", stale_max, raising=False)
+        db.add(Project(id=uuid.uuid4(), name="pending alongside the estimate"))
+        est = save_estimate(db, project_id, PAYLOAD)
+        assert est.version == 3
+        assert len(calls) == 2
+
+    with SessionLocal() as db:
+        versions = db.execute(select(Estimate.version).where(Estimate.project_id == project_id)).scalars().all()
+        assert sorted(versions) == [1, 2, 3]
+        assert db.execute(select(Project).where(Project.name == "pending alongside the estimate")).scalar()
@@ -0,0 +1,87 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.db import SessionLocal
+from app.listing import NEXT_CURSOR_HEADER, _ordered, decode_cursor, encode_cursor
+from app.main import app
+from app.models import Finding, Project
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def project_with_findings():
+    project_id = uuid.uuid4()
+    started = datetime(2026, 1, 1)
+    with SessionLocal() as db:
+        db.add(Project(id=project_id, name="Listing test"))
+        db.add_all(
+            Finding(project_id=project_id, severity="red", discipline="Envelope", created_at=started + timedelta(minutes=i))
+            for i in range(7)
+        )
+        db.commit()
+    return project_id
+
+
+def test_findings_page_through_every_row_once(project_with_findings):
+    url = f"/estimates/{project_with_findings}/findings"
+    seen, cursor = [], None
+    while True:
+        response = client.get(url, params={"limit": 3, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 3
+        seen.extend(f["id"] for f in page)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 7
+
+
+def test_ndjson_export_streams_the_same_rows(project_with_findings):
+    url = f"/estimates/{project_with_findings}/findings"
+    listed = [f["id"] for f in client.get(url, params={"limit": 100}).json()]
+    response = client.get(f"{url}/export.ndjson")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    exported = [json.loads(line)["id"] for line in response.text.splitlines()]
+    assert exported == listed
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(None, uuid.uuid4())[:-4] + "!!!!"])
+def test_bad_cursor_is_a_400(project_with_findings, cursor):
+    response = client.get(f"/estimates/{project_with_findings}/findings", params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_postgres_pages_in_creation_order():
+    created_at, row_id = datetime(2026, 1, 1, 12, 30, 0, 123456), uuid.uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id), by_created=True) == (created_at, row_id)
+
+    class Bind:
+        class dialect:
+            name = "postgresql"
+
+    sql = str(_ordered(select(Finding.id), Bind, Finding.created_at, Finding.id).compile(dialect=postgresql.dialect()))
+    assert sql.endswith("ORDER BY findings.created_at, findings.id")
+
+
+def test_projects_page_and_export_by_account():
+    account_id = uuid.uuid4()
+    with SessionLocal() as db:
+        db.add_all(Project(id=uuid.uuid4(), account_id=account_id, name=f"P{i}") for i in range(5))
+        db.commit()
+    first = client.get("/projects/", params={"account_id": str(account_id), "limit": 3})
+    second = client.get("/projects/", params={"account_id": str(account_id), "limit": 3,
+                                              "cursor": first.headers[NEXT_CURSOR_HEADER]})
+    assert NEXT_CURSOR_HEADER not in second.headers
+    paged = [p["id"] for p in first.json() + second.json()]
+    assert len(set(paged)) == 5
+
+    export = client.get("/projects/export.ndjson", params={"account_id": str(account_id)})
+    assert [json.loads(line)["id"] for line in export.text.splitlines()] == paged
@@ -0,0 +1,8 @@
+-- Keyset paging indexes for GET /projects/ and GET /estimates/{project_id}/findings
+-- (see app/listing.py). New databases get them from Base.metadata.create_all.
+-- CONCURRENTLY cannot run inside a transaction: apply with plain psql, e.g.
+--   psql "$DATABASE_URL" -f migrations/001_listing_indexes.sql
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_projects_created ON projects (created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_projects_account_created ON projects (account_id, created_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_findings_project_created ON findings (project_id, created_at, id);
@@ -0,0 +1,25 @@
+-- Versioned estimates with structured JSON sections (see app/estimate_store.py).
+-- Databases created before these columns existed have many rows per project and
+-- no version, so the unique index cannot be built until every row is numbered.
+-- Run in one transaction:
+--   psql "$DATABASE_URL" -1 -f migrations/002_estimate_versions.sql
+
+ALTER TABLE estimates ADD COLUMN IF NOT EXISTS version integer;
+ALTER TABLE estimates ADD COLUMN IF NOT EXISTS base jsonb;
+ALTER TABLE estimates ADD COLUMN IF NOT EXISTS alternates jsonb;
+ALTER TABLE estimates ADD COLUMN IF NOT EXISTS allowances jsonb;
+ALTER TABLE estimates ADD COLUMN IF NOT EXISTS summary jsonb;
+
+-- Number each project's existing rows oldest first; id breaks created_at ties
+UPDATE estimates e
+SET version = v.version
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY project_id ORDER BY created_at, id) AS version
+    FROM estimates
+) v
+WHERE e.id = v.id AND e.version IS NULL;
+
+ALTER TABLE estimates ALTER COLUMN version SET DEFAULT 1;
+ALTER TABLE estimates ALTER COLUMN version SET NOT NULL;
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_estimates_project_version ON estimates (project_id, version);
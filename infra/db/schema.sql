@@ -249,11 +249,13 @@ CREATE INDEX idx_projects_account ON projects(account_id);
 CREATE INDEX idx_projects_address ON projects(address_id);
 CREATE INDEX idx_projects_jurisdiction ON projects(jurisdiction_id);
 CREATE INDEX idx_projects_status ON projects(status);
+CREATE INDEX idx_projects_created ON projects(created_at DESC, id DESC);
 CREATE INDEX idx_files_project ON files(project_id);
-CREATE INDEX idx_findings_project ON findings(project_id);
+CREATE INDEX idx_findings_project ON findings(project_id, created_at, id);
 CREATE INDEX idx_findings_severity ON findings(severity);
 CREATE INDEX idx_findings_status ON findings(status);
 CREATE INDEX idx_estimates_project ON estimates(project_id);
+CREATE UNIQUE INDEX idx_estimates_project_version ON estimates(project_id, version);
 CREATE INDEX idx_pricing_catalog_trade ON pricing_catalog(trade);
 CREATE INDEX idx_pricing_catalog_region ON pricing_catalog(region);
 CREATE INDEX idx_regional_factors_region ON regional_factors(region);
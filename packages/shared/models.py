@@ -71,6 +71,25 @@ class Estimate(BaseModel):
     created_by: Optional[str] = None
 
 
+class LineItemDiff(BaseModel):
+    op: str = Field("update", description="add, update, or remove")
+    line_id: Optional[int] = Field(None, description="Target line; omitted for add")
+    item: Optional[LineItem] = Field(None, description="Full replacement (update) or new line (add)")
+    qty: Optional[float] = Field(None, description="New quantity for update")
+    unit_cost: Optional[float] = Field(None, description="New unit cost for update")
+
+
+class EstimateDelta(BaseModel):
+    project_id: Optional[UUID] = None
+    base_version: int
+    version: int
+    updated: Dict[int, LineItem] = Field(default_factory=dict, description="Added or changed lines by line_id")
+    removed: List[int] = Field(default_factory=list)
+    trade_subtotals: Dict[str, float] = Field(default_factory=dict, description="Only trades touched by this delta")
+    allowances: Dict[str, float] = Field(default_factory=dict)
+    summary: EstimateSummary
+
+
 # Project Models
 class ProjectAddress(BaseModel):
     street: str
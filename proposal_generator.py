@@ -6,7 +6,9 @@ High-end automated proposal generation with branding, AI polish, and perfect for
 """
 
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, Iterator, List, TextIO
+import html as html_lib
+import io
 import json
 
 # ============================================================================
@@ -34,14 +36,22 @@ COMPANY_INFO = {
 # PROFESSIONAL PROPOSAL TEMPLATES
 # ============================================================================
 
-class ProposalGenerator:
-    """Generates high-end professional proposals with Eagle Eye branding"""
-    
-    @staticmethod
-    def generate_pdf_proposal(project: Dict, estimate: Dict, compliance: Dict) -> str:
-        """Generate professional PDF proposal"""
-        
-        proposal = f"""
+# Line items / findings per page before a page break and a repeated header
+LINE_ITEMS_PER_PAGE = 40
+FINDINGS_PER_PAGE = 60
+PAGE_BREAK = "\f"
+
+RULE_LIGHT = "─" * 77
+
+LINE_ITEM_TABLE_HEADER = (
+    "Item | Description         | Qty  | Unit Price | Extension\n"
+    "─────┼──────────────────────┼──────┼────────────┼──────────────\n"
+)
+
+
+def _pdf_cover(project: Dict) -> str:
+    """Header, client block and overview, up to the line item table"""
+    return f"""
 ╔════════════════════════════════════════════════════════════════════════════╗
 ║                                                                            ║
 ║                         🦅 EAGLE EYE ESTIMATES                            ║
@@ -86,25 +96,22 @@ COST BREAKDOWN - LINE ITEMS
 ─────────────────────────────────────────────────────────────────────────────
 
 """
-        
-        # Add line items
-        if "line_items" in estimate:
-            proposal += "Item | Description         | Qty  | Unit Price | Extension\n"
-            proposal += "─────┼──────────────────────┼──────┼────────────┼──────────────\n"
-            
-            for idx, item in enumerate(estimate["line_items"][:10], 1):
-                component = item.get("component", "")
-                qty = item.get("quantity", 0)
-                total = item.get("total", 0)
-                labor = item.get("labor", 0)
-                material = item.get("material", 0)
-                
-                proposal += f"{idx:>4} │ {component:<20} │ {qty:>5.0f} │ ${total/qty if qty else 0:>9,.2f} │ ${total:>10,.2f}\n"
-            
-            if len(estimate.get("line_items", [])) > 10:
-                proposal += f"\n... and {len(estimate['line_items']) - 10} more line items\n"
-        
-        proposal += f"""
+
+
+def _pdf_line_item_row(idx: int, item: Dict) -> str:
+    component = item.get("component", "")
+    qty = item.get("quantity", 0)
+    total = item.get("total", 0)
+    return f"{idx:>4} │ {component:<20} │ {qty:>5.0f} │ ${total/qty if qty else 0:>9,.2f} │ ${total:>10,.2f}\n"
+
+
+def _pdf_continued(title: str) -> str:
+    return f"{PAGE_BREAK}\n{title} (continued)\n{RULE_LIGHT}\n\n"
+
+
+def _pdf_financials(estimate: Dict) -> str:
+    """Financial summary, timeline and the compliance intro"""
+    return f"""
 
 ═════════════════════════════════════════════════════════════════════════════
 
@@ -143,11 +150,11 @@ CODE COMPLIANCE ANALYSIS
 Our analysis has identified the following code compliance items:
 
 """
-        
-        # Add compliance findings
-        if compliance.get("summary"):
-            summary = compliance["summary"]
-            proposal += f"""
+
+
+def _pdf_compliance_summary(summary: Dict) -> str:
+    """Critical / important / informational counts"""
+    return f"""
 🔴 CRITICAL ITEMS (Must Address):        {summary.get('critical', 0)}
    These items must be corrected before permit approval.
 
@@ -158,17 +165,11 @@ Our analysis has identified the following code compliance items:
    These are best practices and optional recommendations.
 
 """
-        
-        # Add compliance details
-        if compliance.get("findings"):
-            proposal += "\nDETAILED FINDINGS:\n"
-            for finding in compliance["findings"][:5]:
-                severity = finding.get("severity", "YELLOW")
-                code = finding.get("rule_code", "N/A")
-                title = finding.get("title", "N/A")
-                proposal += f"  [{severity}] {code} - {title}\n"
-        
-        proposal += f"""
+
+
+def _pdf_closing(project: Dict) -> str:
+    """Terms, next steps, signature block and footer"""
+    return f"""
 
 ═════════════════════════════════════════════════════════════════════════════
 
@@ -225,74 +226,10 @@ Questions? Contact us:
 EAGLE EYE - Professional Construction Estimating at the Speed of Light ⚡
 
 """
-        return proposal
-    
-    @staticmethod
-    def generate_excel_proposal(project: Dict, estimate: Dict, compliance: Dict) -> Dict:
-        """Generate Excel-compatible data structure with professional formatting"""
-        
-        excel_data = {
-            "metadata": {
-                "title": f"Eagle Eye Estimate - {project.get('project_name', 'Project')}",
-                "author": "Eagle Eye Estimating System",
-                "created": datetime.now().isoformat(),
-                "logo": "🦅 EAGLE EYE",
-                "colors": COMPANY_INFO["colors"]
-            },
-            "sheets": {
-                "Cover": {
-                    "title": "EAGLE EYE ESTIMATE",
-                    "company": COMPANY_INFO["name"],
-                    "date": datetime.now().strftime("%B %d, %Y"),
-                    "project_info": {
-                        "Client": project.get("client_name", ""),
-                        "Project": project.get("project_name", ""),
-                        "Address": project.get("address", ""),
-                        "City": project.get("city", ""),
-                        "State": project.get("state", ""),
-                        "ZIP": project.get("zip_code", "")
-                    }
-                },
-                "Line Items": {
-                    "headers": ["Component", "Quantity", "Unit", "Unit Price", "Labor", "Material", "Total"],
-                    "data": estimate.get("line_items", []),
-                    "summary": {
-                        "Total Labor": estimate["summary"]["labor"],
-                        "Total Material": estimate["summary"]["material"],
-                        "Total Permits": estimate["summary"]["permit"],
-                        "Subtotal": estimate["summary"]["subtotal"],
-                        "Markup (30%)": estimate["summary"]["margin_30pct"],
-                        "Final Price": estimate["summary"]["selling_price"]
-                    }
-                },
-                "Compliance": {
-                    "headers": ["Code", "Title", "Severity", "Description"],
-                    "data": compliance.get("findings", []),
-                    "summary": compliance.get("summary", {})
-                },
-                "Summary": {
-                    "project": project,
-                    "estimate": estimate["summary"],
-                    "compliance": compliance["summary"],
-                    "timeline_days": estimate["summary"]["timeline_days"]
-                }
-            }
-        }
-        
-        return excel_data
-    
-    @staticmethod
-    def generate_html_proposal(project: Dict, estimate: Dict, compliance: Dict) -> str:
-        """Generate beautiful HTML proposal with Eagle Eye branding"""
-        
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Eagle Eye Estimate - {project.get('project_name', 'Project')}</title>
-    <style>
+
+
+# Evaluated once: depends only on the branding
+_HTML_STYLE = f"""    <style>
         * {{ margin: 0; padding: 0; box-sizing: border-box; }}
         body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; line-height: 1.6; color: #374151; }}
         
@@ -374,7 +311,24 @@ EAGLE EYE - Professional Construction Estimating at the Speed of Light ⚡
         .signature {{ margin: 40px 0; }}
         .signature-line {{ border-top: 2px solid #374151; padding-top: 10px; margin-top: 20px; }}
     </style>
-</head>
+"""
+
+
+def _html_head(project: Dict) -> str:
+    """Doctype through <title>"""
+    return f"""
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Eagle Eye Estimate - {project.get('project_name', 'Project')}</title>
+"""
+
+
+def _html_summary(project: Dict, estimate: Dict) -> str:
+    """Header, project info and cost breakdown"""
+    return f"""</head>
 <body>
     <div class="header">
         <h1>🦅 EAGLE EYE ESTIMATES</h1>
@@ -424,14 +378,24 @@ EAGLE EYE - Professional Construction Estimating at the Speed of Light ⚡
             </div>
         </div>
         
-        <div class="section">
+"""
+
+
+def _html_compliance(compliance: Dict) -> str:
+    """Compliance status counts"""
+    return f"""        <div class="section">
             <h3 class="section-title">Compliance Status</h3>
             <p><span class="compliance-critical">🔴 Critical:</span> {compliance['summary'].get('critical', 0)} items</p>
             <p><span class="compliance-warning">🟠 Important:</span> {compliance['summary'].get('important', 0)} items</p>
             <p><span class="compliance-info">🟡 Notice:</span> {compliance['summary'].get('notice', 0)} items</p>
         </div>
         
-        <div class="section">
+"""
+
+
+def _html_closing(estimate: Dict) -> str:
+    """Timeline, signature and footer"""
+    return f"""        <div class="section">
             <h3 class="section-title">Project Timeline</h3>
             <p>Estimated completion: <strong>{estimate['summary']['timeline_days']} days</strong></p>
         </div>
@@ -454,7 +418,210 @@ EAGLE EYE - Professional Construction Estimating at the Speed of Light ⚡
 </body>
 </html>
 """
-        return html
+
+
+def _html_escape(value) -> str:
+    return html_lib.escape(str(value))
+
+
+def _iter_html_line_items(line_items: List[Dict], per_page: int) -> Iterator[str]:
+    """Every line item, one <table> per page with the header repeated"""
+    header = (
+        '            <table>\n'
+        '                <tr>\n'
+        '                    <th>#</th>\n'
+        '                    <th>Description</th>\n'
+        '                    <th style="text-align: right;">Qty</th>\n'
+        '                    <th style="text-align: right;">Unit Price</th>\n'
+        '                    <th style="text-align: right;">Extension</th>\n'
+        '                </tr>\n'
+    )
+    yield '        <div class="section">\n            <h3 class="section-title">Line Items</h3>\n'
+    for idx, item in enumerate(line_items, 1):
+        if (idx - 1) % per_page == 0:
+            if idx > 1:
+                yield '            </table>\n            <div style="page-break-after: always;"></div>\n'
+            yield header
+        qty = item.get("quantity", 0)
+        total = item.get("total", 0)
+        yield (
+            f'                <tr><td>{idx}</td><td>{_html_escape(item.get("component", ""))}</td>'
+            f'<td style="text-align: right;">{qty:,.0f}</td>'
+            f'<td style="text-align: right;">${total/qty if qty else 0:,.2f}</td>'
+            f'<td style="text-align: right;">${total:,.2f}</td></tr>\n'
+        )
+    if line_items:
+        yield '            </table>\n'
+    yield '        </div>\n        \n'
+
+
+def _iter_html_findings(findings: List[Dict], per_page: int) -> Iterator[str]:
+    severity_class = {"RED": "compliance-critical", "ORANGE": "compliance-warning"}
+    header = (
+        '            <table>\n'
+        '                <tr>\n'
+        '                    <th>Severity</th>\n'
+        '                    <th>Code</th>\n'
+        '                    <th>Finding</th>\n'
+        '                </tr>\n'
+    )
+    yield '        <div class="section">\n            <h3 class="section-title">Detailed Findings</h3>\n'
+    for idx, finding in enumerate(findings):
+        if idx % per_page == 0:
+            if idx:
+                yield '            </table>\n            <div style="page-break-after: always;"></div>\n'
+            yield header
+        severity = finding.get("severity", "YELLOW")
+        yield (
+            f'                <tr><td class="{severity_class.get(severity, "compliance-info")}">{_html_escape(severity)}</td>'
+            f'<td>{_html_escape(finding.get("rule_code", "N/A"))}</td>'
+            f'<td>{_html_escape(finding.get("title", "N/A"))}</td></tr>\n'
+        )
+    if findings:
+        yield '            </table>\n'
+    yield '        </div>\n        \n'
+
+
+class ProposalGenerator:
+    """Generates high-end professional proposals with Eagle Eye branding"""
+    
+    @staticmethod
+    def iter_pdf_proposal(project: Dict, estimate: Dict, compliance: Dict,
+                          items_per_page: int = LINE_ITEMS_PER_PAGE,
+                          findings_per_page: int = FINDINGS_PER_PAGE) -> Iterator[str]:
+        """
+        Yield the text proposal piece by piece. Every line item and finding is
+        included; long lists break into pages with the table header repeated.
+        """
+        
+        yield _pdf_cover(project)
+        
+        # Add line items
+        if "line_items" in estimate:
+            yield LINE_ITEM_TABLE_HEADER
+            for idx, item in enumerate(estimate["line_items"], 1):
+                if idx > 1 and (idx - 1) % items_per_page == 0:
+                    yield _pdf_continued("COST BREAKDOWN - LINE ITEMS")
+                    yield LINE_ITEM_TABLE_HEADER
+                yield _pdf_line_item_row(idx, item)
+        
+        yield _pdf_financials(estimate)
+        
+        # Add compliance findings
+        if compliance.get("summary"):
+            yield _pdf_compliance_summary(compliance["summary"])
+        
+        # Add compliance details
+        if compliance.get("findings"):
+            yield "\nDETAILED FINDINGS:\n"
+            for idx, finding in enumerate(compliance["findings"]):
+                if idx and idx % findings_per_page == 0:
+                    yield _pdf_continued("DETAILED FINDINGS")
+                severity = finding.get("severity", "YELLOW")
+                code = finding.get("rule_code", "N/A")
+                title = finding.get("title", "N/A")
+                yield f"  [{severity}] {code} - {title}\n"
+        
+        yield _pdf_closing(project)
+    
+    @staticmethod
+    def generate_pdf_proposal(project: Dict, estimate: Dict, compliance: Dict) -> str:
+        """Generate professional PDF proposal"""
+        
+        proposal = io.StringIO()
+        for chunk in ProposalGenerator.iter_pdf_proposal(project, estimate, compliance):
+            proposal.write(chunk)
+        return proposal.getvalue()
+    
+    @staticmethod
+    def write_pdf_proposal(stream: TextIO, project: Dict, estimate: Dict, compliance: Dict):
+        """Stream the text proposal to a file or response without building it in memory"""
+        for chunk in ProposalGenerator.iter_pdf_proposal(project, estimate, compliance):
+            stream.write(chunk)
+    
+    @staticmethod
+    def generate_excel_proposal(project: Dict, estimate: Dict, compliance: Dict) -> Dict:
+        """Generate Excel-compatible data structure with professional formatting"""
+        
+        excel_data = {
+            "metadata": {
+                "title": f"Eagle Eye Estimate - {project.get('project_name', 'Project')}",
+                "author": "Eagle Eye Estimating System",
+                "created": datetime.now().isoformat(),
+                "logo": "🦅 EAGLE EYE",
+                "colors": COMPANY_INFO["colors"]
+            },
+            "sheets": {
+                "Cover": {
+                    "title": "EAGLE EYE ESTIMATE",
+                    "company": COMPANY_INFO["name"],
+                    "date": datetime.now().strftime("%B %d, %Y"),
+                    "project_info": {
+                        "Client": project.get("client_name", ""),
+                        "Project": project.get("project_name", ""),
+                        "Address": project.get("address", ""),
+                        "City": project.get("city", ""),
+                        "State": project.get("state", ""),
+                        "ZIP": project.get("zip_code", "")
+                    }
+                },
+                "Line Items": {
+                    "headers": ["Component", "Quantity", "Unit", "Unit Price", "Labor", "Material", "Total"],
+                    "data": estimate.get("line_items", []),
+                    "summary": {
+                        "Total Labor": estimate["summary"]["labor"],
+                        "Total Material": estimate["summary"]["material"],
+                        "Total Permits": estimate["summary"]["permit"],
+                        "Subtotal": estimate["summary"]["subtotal"],
+                        "Markup (30%)": estimate["summary"]["margin_30pct"],
+                        "Final Price": estimate["summary"]["selling_price"]
+                    }
+                },
+                "Compliance": {
+                    "headers": ["Code", "Title", "Severity", "Description"],
+                    "data": compliance.get("findings", []),
+                    "summary": compliance.get("summary", {})
+                },
+                "Summary": {
+                    "project": project,
+                    "estimate": estimate["summary"],
+                    "compliance": compliance["summary"],
+                    "timeline_days": estimate["summary"]["timeline_days"]
+                }
+            }
+        }
+        
+        return excel_data
+    
+    @staticmethod
+    def iter_html_proposal(project: Dict, estimate: Dict, compliance: Dict,
+                           include_details: bool = False,
+                           items_per_page: int = LINE_ITEMS_PER_PAGE,
+                           findings_per_page: int = FINDINGS_PER_PAGE) -> Iterator[str]:
+        """
+        Yield the HTML proposal piece by piece. With include_details, the full
+        line item and finding tables are added, paginated for print.
+        """
+        
+        yield _html_head(project)
+        yield _HTML_STYLE
+        yield _html_summary(project, estimate)
+        if include_details:
+            yield from _iter_html_line_items(estimate.get("line_items", []), items_per_page)
+        yield _html_compliance(compliance)
+        if include_details:
+            yield from _iter_html_findings(compliance.get("findings", []), findings_per_page)
+        yield _html_closing(estimate)
+    
+    @staticmethod
+    def generate_html_proposal(project: Dict, estimate: Dict, compliance: Dict,
+                               include_details: bool = False) -> str:
+        """Generate beautiful HTML proposal with Eagle Eye branding"""
+        
+        html = io.StringIO()
+        for chunk in ProposalGenerator.iter_html_proposal(project, estimate, compliance, include_details):
+            html.write(chunk)
+        return html.getvalue()
 
 
 # ============================================================================
@@ -0,0 +1,89 @@
+"""
+Eagle Eye Fast Analysis - Analysis Job Handler
+The job_queue worker side of POST /api/v1/analyze:
+
+    python job_queue.py worker --handler analysis_jobs:AnalysisWorker
+
+Each worker process builds one AnalysisWorker, which keeps a single event loop
+and a single pooled service client for every job it runs, and closes both
+when the worker exits. The pipeline (ANALYSIS_PIPELINE, 'module:coroutine')
+is called as pipeline(project_id, excel_file, pdf_files, spool=..., final_attempt=...).
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from job_queue import Job, resolve
+from progress_bus import progress_bus
+from service_client import service_client
+from upload_spool import SpooledFile, UploadSpool, remove_stale_uploads
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_PIPELINE = os.getenv("ANALYSIS_PIPELINE", "fast_analysis:run_full_analysis")
+SPOOL_SWEEP_INTERVAL_S = 3600.0
+
+Pipeline = Callable[..., Awaitable[None]]
+
+
+def job_uploads(job: Job) -> Tuple[Optional[SpooledFile], List[SpooledFile], UploadSpool]:
+    """The spooled files a queued analysis refers to, plus a spool that owns them"""
+    payload = job.payload
+    excel_file = SpooledFile.from_dict(payload["excel_file"]) if payload.get("excel_file") else None
+    pdf_files = [SpooledFile.from_dict(f) for f in payload.get("pdf_files", [])]
+    spool = UploadSpool()
+    spool.files = ([excel_file] if excel_file else []) + pdf_files
+    return excel_file, pdf_files, spool
+
+
+class AnalysisWorker:
+    """
+    Example:
+        worker = AnalysisWorker()        # once per worker process
+        worker(job)                      # for each claimed job
+        worker.close()                   # on worker shutdown
+    """
+
+    def __init__(self, pipeline: Optional[Pipeline] = None):
+        self.preflight()
+        self.pipeline = pipeline or resolve(ANALYSIS_PIPELINE)
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(service_client.start())
+        self._swept_at = 0.0
+
+    @staticmethod
+    def preflight():
+        """Progress must cross from worker processes to the web tier"""
+        progress_bus.require_shared("Analysis workers")
+
+    def __call__(self, job: Job):
+        self._sweep_spool()
+        excel_file, pdf_files, spool = job_uploads(job)
+        self.loop.run_until_complete(self.pipeline(
+            job.payload["project_id"],
+            excel_file,
+            pdf_files,
+            spool=spool,
+            final_attempt=job.is_final_attempt
+        ))
+
+    def on_dead(self, job: Job):
+        """The last attempt raised before the pipeline cleaned up; nothing will read the uploads again"""
+        job_uploads(job)[2].cleanup()
+
+    def _sweep_spool(self):
+        now = time.monotonic()
+        if now - self._swept_at >= SPOOL_SWEEP_INTERVAL_S:
+            self._swept_at = now
+            removed = remove_stale_uploads()
+            if removed:
+                logger.info("Removed %d stale spooled uploads", removed)
+
+    def close(self):
+        try:
+            self.loop.run_until_complete(service_client.close())
+            self.loop.run_until_complete(progress_bus.close())
+        finally:
+            self.loop.close()
@@ -0,0 +1,280 @@
+"""
+Eagle Eye Fast Analysis - Streaming Excel I/O
+Reads the intake template in openpyxl read-only mode (rows are streamed from
+the sheet XML, never materialized as a cell grid) and writes the output
+workbook in write-only mode with style objects created once and shared.
+
+Layout is the same as the original full-mode code:
+- PROJECT_INFO: B3..B10 project fields
+- COMPONENTS_SCHEDULE: header row, then type | qty | unit | size_spec | location | notes
+- FINDINGS_OUTPUT / ESTIMATE_OUTPUT: title row, header row, data rows
+
+Benchmark (rows/sec and tracemalloc peak, against full-mode baselines):
+    python excel_io.py --rows 50000
+"""
+import argparse
+import io
+import time
+import tracemalloc
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+
+PROJECT_INFO_FIELDS = (
+    "project_name",
+    "client_name",
+    "client_email",
+    "address",
+    "city_state_zip",
+    "jurisdiction",
+    "scope",
+    "special_conditions",
+)  # B3..B10
+
+# Shared styles: one object each, reused for every styled cell
+SEVERITY_FILLS = {
+    "RED": PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid"),
+    "ORANGE": PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid"),
+}
+BOLD = Font(bold=True)
+BOLD_LARGE = Font(bold=True, size=14)
+
+
+# ============================================================================
+# READ
+# ============================================================================
+
+def iter_component_rows(sheet) -> Iterator[Tuple]:
+    """Stream COMPONENTS_SCHEDULE data rows (values only)"""
+    for row in sheet.iter_rows(min_row=2, max_col=6, values_only=True):
+        if row and row[0]:  # Component type
+            yield row + (None,) * (6 - len(row))
+
+
+def read_template(source: Union[str, BinaryIO]) -> Dict:
+    """
+    Parse project info and components from an intake workbook.
+    Returns: {"project_info": {...}, "excel_components": {...}}
+    """
+    workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+    try:
+        project_sheet = workbook["PROJECT_INFO"]
+        values = [
+            row[0] if row else None
+            for row in project_sheet.iter_rows(min_row=3, max_row=10, min_col=2, max_col=2, values_only=True)
+        ]
+        values += [None] * (len(PROJECT_INFO_FIELDS) - len(values))
+        project_info = dict(zip(PROJECT_INFO_FIELDS, values))
+
+        excel_components = {}
+        for comp_type, qty, unit, size_spec, location, notes in iter_component_rows(workbook["COMPONENTS_SCHEDULE"]):
+            excel_components[comp_type] = {
+                "quantity": qty or 0,
+                "unit": unit or "each",
+                "size_spec": size_spec,
+                "location": location,
+                "notes": notes,
+                "source": "excel",
+                "confidence": 1.0
+            }
+
+        return {
+            "project_info": project_info,
+            "excel_components": excel_components
+        }
+    finally:
+        workbook.close()  # read-only workbooks keep the source open
+
+
+# ============================================================================
+# WRITE
+# ============================================================================
+
+def _cell(sheet, value, font: Optional[Font] = None, fill: Optional[PatternFill] = None) -> WriteOnlyCell:
+    cell = WriteOnlyCell(sheet, value=value)
+    if font is not None:
+        cell.font = font
+    if fill is not None:
+        cell.fill = fill
+    return cell
+
+
+def _money(value) -> str:
+    return f"${value:.2f}"
+
+
+def write_output_workbook(project_info: Dict, findings: List[Dict], estimate: Dict) -> bytes:
+    """Workbook with PROJECT_INFO, FINDINGS_OUTPUT and ESTIMATE_OUTPUT, streamed row by row"""
+    wb = openpyxl.Workbook(write_only=True)
+
+    # Sheet 1: Project Info
+    ws = wb.create_sheet("PROJECT_INFO")
+    ws.append(["Project Information"])
+    ws.append([])
+    ws.append([None, project_info.get("project_name")])
+    # ... populate all fields
+
+    # Sheet 2: Findings
+    ws = wb.create_sheet("FINDINGS_OUTPUT")
+    ws.append(["Code Compliance Findings"])
+    ws.append(["Severity", "Code", "Finding", "Recommendation"])
+    for finding in findings:
+        severity = finding.get("severity")
+        ws.append([
+            _cell(ws, severity, fill=SEVERITY_FILLS.get(severity)),  # Color code severity
+            finding.get("code"),
+            finding.get("description"),
+            finding.get("recommendation"),
+        ])
+
+    # Sheet 3: Estimate
+    ws = wb.create_sheet("ESTIMATE_OUTPUT")
+    ws.append(["Cost Estimate"])
+    ws.append(["Line Item", "Qty", "Unit Cost", "Total"])
+    for line_item in estimate.get("line_items", []):
+        ws.append([
+            line_item.get("component"),
+            line_item.get("quantity"),
+            _money(line_item.get("unit_cost")),
+            _money(line_item.get("line_total")),
+        ])
+
+    # Totals rows
+    ws.append(["SUBTOTAL", None, None, _cell(ws, _money(estimate.get("subtotal")), font=BOLD)])
+    ws.append(["Overhead & Profit (35%)", None, None, _money(estimate.get("overhead_profit"))])
+    ws.append(["Contingency (10%)", None, None, _money(estimate.get("contingency"))])
+    ws.append(["Permit Allowance", None, None, _money(estimate.get("permit_allowance"))])
+    ws.append(["GRAND TOTAL", None, None, _cell(ws, _money(estimate.get("grand_total")), font=BOLD_LARGE)])
+
+    excel_bytes = io.BytesIO()
+    wb.save(excel_bytes)
+    return excel_bytes.getvalue()
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+COMPONENT_TYPES = ("windows", "doors", "framing", "roofing", "drywall")
+
+
+def _synthetic_template(rows: int) -> bytes:
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("PROJECT_INFO")
+    ws.append(["Project Information"])
+    ws.append([])
+    for i, name in enumerate(PROJECT_INFO_FIELDS):
+        ws.append([name, f"value {i}"])
+    ws = wb.create_sheet("COMPONENTS_SCHEDULE")
+    ws.append(["Component", "Quantity", "Unit", "Size/Spec", "Location", "Notes"])
+    for i in range(rows):
+        ws.append([f"{COMPONENT_TYPES[i % 5]}_{i}", i % 40 + 1, "each", "36x60", f"Room {i % 30}", None])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def _synthetic_outputs(rows: int) -> Tuple[List[Dict], Dict]:
+    severities = ("RED", "ORANGE", "YELLOW", "GREEN")
+    findings = [
+        {"severity": severities[i % 4], "code": f"IRC R{300 + i % 100}", "description": f"Finding {i}",
+         "recommendation": "Correct per code"}
+        for i in range(rows)
+    ]
+    line_items = [
+        {"component": f"item_{i}", "quantity": i % 40 + 1, "unit_cost": 12.5, "line_total": 12.5 * (i % 40 + 1)}
+        for i in range(rows)
+    ]
+    subtotal = sum(li["line_total"] for li in line_items)
+    estimate = {"line_items": line_items, "subtotal": subtotal, "overhead_profit": subtotal * 0.35,
+                "contingency": subtotal * 0.135, "permit_allowance": 2500, "grand_total": subtotal * 1.485 + 2500}
+    return findings, estimate
+
+
+def _full_mode_read(data: bytes) -> int:
+    """Original approach, for comparison"""
+    wb = openpyxl.load_workbook(io.BytesIO(data))
+    return sum(1 for row in wb["COMPONENTS_SCHEDULE"].iter_rows(min_row=2, values_only=True) if row[0])
+
+
+def _full_mode_write(project_info: Dict, findings: List[Dict], estimate: Dict) -> bytes:
+    """Original approach (cell grid, a new style object per styled cell), for comparison"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "PROJECT_INFO"
+    ws["A1"] = "Project Information"
+    ws["B3"] = project_info.get("project_name")
+
+    ws = wb.create_sheet("FINDINGS_OUTPUT")
+    ws.append(["Code Compliance Findings"])
+    ws.append(["Severity", "Code", "Finding", "Recommendation"])
+    for row, finding in enumerate(findings, start=3):
+        ws.append([finding.get("severity"), finding.get("code"), finding.get("description"),
+                   finding.get("recommendation")])
+        color = {"RED": "FF0000", "ORANGE": "FFA500"}.get(finding.get("severity"))
+        if color:
+            ws[f"A{row}"].fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+    ws = wb.create_sheet("ESTIMATE_OUTPUT")
+    ws.append(["Cost Estimate"])
+    ws.append(["Line Item", "Qty", "Unit Cost", "Total"])
+    for line_item in estimate.get("line_items", []):
+        ws.append([line_item.get("component"), line_item.get("quantity"),
+                   _money(line_item.get("unit_cost")), _money(line_item.get("line_total"))])
+    ws.append(["GRAND TOTAL", None, None, _money(estimate.get("grand_total"))])
+    ws.cell(ws.max_row, 4).font = Font(bold=True, size=14)
+
+    excel_bytes = io.BytesIO()
+    wb.save(excel_bytes)
+    return excel_bytes.getvalue()
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def _peak_mb(fn, *args) -> float:
+    """Peak Python heap during fn, in a separate run so tracing doesn't skew the timings"""
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def _report(label: str, fn, args: tuple, rows: int):
+    result, elapsed = _timed(fn, *args)
+    peak = _peak_mb(fn, *args)
+    print(f"  {label:<19} {elapsed:7.2f}s  {rows / elapsed:>10,.0f} rows/sec  peak {peak:8.1f} MB")
+    return result
+
+
+def run_benchmark(rows: int, compare_full: bool = True):
+    data = _synthetic_template(rows)
+    print(f"COMPONENTS_SCHEDULE: {rows:,} rows ({len(data) / 1e6:.1f} MB)")
+
+    parsed = _report("read (streaming):", lambda: read_template(io.BytesIO(data)), (), rows)
+    assert len(parsed["excel_components"]) == rows
+    if compare_full:
+        _report("read (full mode):", _full_mode_read, (data,), rows)
+
+    findings, estimate = _synthetic_outputs(rows)
+    args = ({"project_name": "Benchmark"}, findings, estimate)
+    written = 2 * rows
+    print(f"FINDINGS_OUTPUT + ESTIMATE_OUTPUT: {written:,} rows")
+    _report("write (write-only):", write_output_workbook, args, written)
+    if compare_full:
+        _report("write (full mode):", _full_mode_write, args, written)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Excel ingest/output throughput")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--no-compare", action="store_true", help="Skip the full-mode read/write baselines")
+    args = parser.parse_args()
+    run_benchmark(args.rows, compare_full=not args.no_compare)
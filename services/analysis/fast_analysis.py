@@ -11,22 +11,51 @@
 ```python
 # fast_analysis.py - Main entry point for Excel-to-AI bridge
 
-from fastapi import FastAPI, UploadFile, BackgroundTasks, WebSocket
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, UploadFile, WebSocket, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 import asyncio
-import aiohttp
 from datetime import datetime, timezone
 from pydantic import BaseModel
 from typing import Dict, List, Optional
-import openpyxl
-from openpyxl.styles import PatternFill, Font
 import pypdf
-import io
 import json
+import logging
+import os
 from enum import Enum
 
+from stage_dag import DagExecutor, DiskStageCache, PipelineError, Stage, run_key
+from service_client import ServiceError, service_client
+from upload_spool import SpooledFile, UploadSpool, UploadTooLarge
+from progress_bus import ProgressEvent, progress_bus
+from excel_io import read_template, write_output_workbook
+from job_queue import PRIORITY_NORMAL, PRIORITY_RUSH, open_queue
+
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Eagle Eye Fast Analysis")
 
+# Analyses run in the job_queue worker pool, not in the web worker:
+#   python job_queue.py worker --handler analysis_jobs:AnalysisWorker
+# which calls run_full_analysis below (ANALYSIS_PIPELINE).
+job_queue = open_queue()
+
+@app.on_event("startup")
+async def start_service_client():
+    """One pooled keep-alive session for rules/pricing/reports calls"""
+    # Worker progress only reaches WebSocket/SSE clients over a redis:// PROGRESS_BUS_URL
+    progress_bus.require_shared("The analysis API")
+    await service_client.start()
+
+@app.on_event("shutdown")
+async def close_service_client():
+    await service_client.close()
+    await progress_bus.close()
+
+@app.get("/api/v1/service-stats")
+async def service_stats():
+    """Per-endpoint downstream latency and circuit breaker state"""
+    return service_client.stats()
+
 # ============================================================================
 # 1. DATA MODELS
 # ============================================================================
@@ -75,115 +104,111 @@ async def analyze_project(
     project_id: str,
     excel_file: UploadFile = None,
     pdf_files: List[UploadFile] = None,
-    background_tasks: BackgroundTasks = None
+    tenant_id: str = "default",
+    rush: bool = False
 ):
     """
     Main entry point: Accept Excel + PDFs, kick off analysis asynchronously.
-    Returns immediately with status, processes in background.
+    Returns immediately with status; the analysis is queued for the worker
+    pool (rush jobs first, per-tenant concurrency caps).
     """
     
     if not project_id:
         project_id = f"proj_{datetime.now(timezone.utc).timestamp()}"
     
-    # Read uploaded files into memory
-    excel_data = None
-    pdf_data = []
+    # Stream uploads to disk in chunks (hashed on the fly). Workers run in
+    # other processes, so nothing is kept in this process's memory.
+    spool = UploadSpool(memory_limit_bytes=0)
+    excel_spooled = None
+    pdf_spooled = []
     
-    if excel_file:
-        excel_bytes = await excel_file.read()
-        excel_data = openpyxl.load_workbook(io.BytesIO(excel_bytes))
-    
-    if pdf_files:
-        for pdf_file in pdf_files:
-            pdf_bytes = await pdf_file.read()
-            pdf_data.append(pdf_bytes)
-    
-    # Start analysis asynchronously
-    background_tasks.add_task(
-        run_full_analysis,
-        project_id=project_id,
-        excel_workbook=excel_data,
-        pdf_bytes_list=pdf_data
-    )
+    try:
+        if excel_file:
+            excel_spooled = await spool.add(excel_file)
+        
+        if pdf_files:
+            for pdf_file in pdf_files:
+                pdf_spooled.append(await spool.add(pdf_file))
+    except UploadTooLarge as e:
+        spool.cleanup()
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    # Queue the analysis; a worker process picks it up
+    try:
+        job_id = await asyncio.to_thread(
+            job_queue.enqueue,
+            tenant_id,
+            {
+                "project_id": project_id,
+                "excel_file": excel_spooled.as_dict() if excel_spooled else None,
+                "pdf_files": [f.as_dict() for f in pdf_spooled],
+            },
+            PRIORITY_RUSH if rush else PRIORITY_NORMAL
+        )
+    except BaseException:
+        spool.cleanup()
+        raise
+    await update_status(project_id, "queued", 0, "Waiting for an analysis worker...")
     
     return {
         "project_id": project_id,
-        "status": "processing",
+        "job_id": job_id,
+        "status": "queued",
         "message": "Analysis started. You'll receive email when complete.",
-        "estimated_minutes": 5
+        "estimated_minutes": 5,
+        "uploads": [
+            {"filename": f.filename, "sha256": f.sha256, "size_bytes": f.size_bytes}
+            for f in spool.files
+        ]
     }
 
 @app.websocket("/ws/status/{project_id}")
 async def websocket_status(websocket: WebSocket, project_id: str):
-    """Real-time status updates via WebSocket"""
+    """Real-time status updates via WebSocket, pushed as they are published"""
     await websocket.accept()
     
     try:
-        while True:
-            # Get latest status from cache/db
-            status = await get_project_status(project_id)
-            
-            await websocket.send_json({
-                "project_id": project_id,
-                "stage": status.get("stage"),
-                "progress_percent": status.get("progress"),
-                "message": status.get("message"),
-                "timestamp": datetime.now(timezone.utc).isoformat()
-            })
-            
-            if status.get("status") in ["complete", "error"]:
-                break
-            
-            await asyncio.sleep(2)  # Update every 2 seconds
+        # Current state first, then every event until complete/error
+        async for event in progress_bus.subscribe(project_id):
+            await websocket.send_json(event.as_dict())
+        await websocket.close(code=1000)
     
     except Exception as e:
         await websocket.close(code=1000)
 
+@app.get("/api/v1/status/{project_id}")
+async def project_status(project_id: str):
+    """Latest status snapshot"""
+    return await get_project_status(project_id)
+
+@app.get("/api/v1/status/{project_id}/events")
+async def status_events(project_id: str):
+    """Same updates as the WebSocket, as Server-Sent Events"""
+    
+    async def stream():
+        async for event in progress_bus.subscribe(project_id):
+            yield f"event: progress\ndata: {event.to_json()}\n\n"
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # ============================================================================
 # 3. STAGE 1: PARSE EXCEL & EXTRACT PROJECT INFO
 # ============================================================================
 
-async def parse_excel_template(workbook) -> Dict:
+async def parse_excel_template(source) -> Dict:
     """
     Extract project info and component data from Excel template.
-    Returns: {"project_info": {...}, "components": {...}}
+    Streams the workbook in read-only mode (see excel_io.read_template), so
+    large COMPONENTS_SCHEDULE sheets are never loaded as a full cell grid.
+    Returns: {"project_info": {...}, "excel_components": {...}}
     """
     
     try:
-        # Sheet 1: PROJECT_INFO
-        project_sheet = workbook["PROJECT_INFO"]
-        
-        project_info = {
-            "project_name": project_sheet["B3"].value,
-            "client_name": project_sheet["B4"].value,
-            "client_email": project_sheet["B5"].value,
-            "address": project_sheet["B6"].value,
-            "city_state_zip": project_sheet["B7"].value,
-            "jurisdiction": project_sheet["B8"].value,
-            "scope": project_sheet["B9"].value,
-            "special_conditions": project_sheet["B10"].value,
-        }
-        
-        # Sheet 2: COMPONENTS_SCHEDULE (user-provided quantities)
-        component_sheet = workbook["COMPONENTS_SCHEDULE"]
-        
-        excel_components = {}
-        for row in component_sheet.iter_rows(min_row=2, values_only=True):
-            if row[0]:  # Component type
-                excel_components[row[0]] = {
-                    "quantity": row[1] or 0,
-                    "unit": row[2] or "each",
-                    "size_spec": row[3],
-                    "location": row[4],
-                    "notes": row[5],
-                    "source": "excel",
-                    "confidence": 1.0
-                }
-        
-        return {
-            "project_info": project_info,
-            "excel_components": excel_components
-        }
+        return await asyncio.to_thread(read_template, source)
     
     except Exception as e:
         return {
@@ -196,10 +221,11 @@ async def parse_excel_template(workbook) -> Dict:
 # 4. STAGE 2: EXTRACT DATA FROM PDFs (Parallel Processing)
 # ============================================================================
 
-async def extract_from_pdfs_parallel(pdf_bytes_list: List[bytes]) -> Dict:
+async def extract_from_pdfs_parallel(pdf_files: List[SpooledFile], project_id: Optional[str] = None) -> Dict:
     """
     Process multiple PDFs in parallel using asyncio.
     Each PDF: PDF → Images → OCR → Table extraction → Component recognition
+    Publishes per-PDF progress when project_id is given.
     """
     
     all_extracted = {
@@ -209,10 +235,25 @@ async def extract_from_pdfs_parallel(pdf_bytes_list: List[bytes]) -> Dict:
         "confidence": {}
     }
     
+    stage, start_pct, _ = STAGE_PROGRESS["extract_pdfs"]
+    end_pct = STAGE_PROGRESS["merge"][1]
+    done = 0
+    
+    async def extract_and_report(pdf_file: SpooledFile) -> Dict:
+        nonlocal done
+        try:
+            return await extract_single_pdf(pdf_file)
+        finally:
+            done += 1
+            if project_id:
+                pct = start_pct + (end_pct - start_pct) * done // len(pdf_files)
+                await update_status(project_id, stage, pct,
+                                    f"Extracted {done}/{len(pdf_files)} PDFs ({pdf_file.filename})")
+    
     # Process all PDFs concurrently
     tasks = [
-        extract_single_pdf(pdf_bytes)
-        for pdf_bytes in pdf_bytes_list
+        extract_and_report(pdf_file)
+        for pdf_file in pdf_files
     ]
     
     results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -232,12 +273,12 @@ async def extract_from_pdfs_parallel(pdf_bytes_list: List[bytes]) -> Dict:
     
     return all_extracted
 
-async def extract_single_pdf(pdf_bytes: bytes) -> Dict:
-    """Extract components and specs from a single PDF"""
+async def extract_single_pdf(pdf_file: SpooledFile) -> Dict:
+    """Extract components and specs from a single (spooled) PDF"""
     
     try:
         # Step 1: Convert PDF to images
-        images = await pdf_to_images(pdf_bytes)
+        images = await pdf_to_images(pdf_file)
         
         extracted = {
             "components": {},
@@ -272,20 +313,22 @@ async def extract_single_pdf(pdf_bytes: bytes) -> Dict:
             "specs": {}
         }
 
-async def pdf_to_images(pdf_bytes: bytes) -> List:
+async def pdf_to_images(pdf_file: SpooledFile) -> List:
     """Convert PDF to list of images (one per page)"""
     
-    pdf_reader = pypdf.PdfReader(io.BytesIO(pdf_bytes))
     images = []
     
-    for page_num, page in enumerate(pdf_reader.pages):
-        # Use pdfplumber for better extraction
-        try:
-            # This is simplified - in reality use pdf2image or pdfplumber
-            image = await convert_pdf_page_to_image(page, page_num)
-            images.append(image)
-        except:
-            pass
+    # Read pages from the spooled file handle rather than a bytes copy
+    with pdf_file.open() as handle:
+        pdf_reader = pypdf.PdfReader(handle)
+        for page_num, page in enumerate(pdf_reader.pages):
+            # Use pdfplumber for better extraction
+            try:
+                # This is simplified - in reality use pdf2image or pdfplumber
+                image = await convert_pdf_page_to_image(page, page_num)
+                images.append(image)
+            except:
+                pass
     
     return images
 
@@ -409,64 +452,43 @@ async def run_compliance_analysis(
     
     return all_findings
 
+async def post_rules(path: str, payload: Dict) -> List[Dict]:
+    """
+    POST to the rules service through the shared client.
+    A failing rule pack is logged and contributes no findings rather than
+    failing the whole compliance stage.
+    """
+    try:
+        return await service_client.post_json(f"{RULES_SERVICE_URL}{path}", payload)
+    except ServiceError as e:
+        logger.warning("Rules check %s unavailable: %s", path, e)
+        return []
+
 async def check_irc_rules(components: Dict, factors: Dict) -> List[Dict]:
     """Call real rules service with components"""
     
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{RULES_SERVICE_URL}/check-irc",
-                json={
-                    "components": components,
-                    "year": 2018,
-                    "state": factors.get("state")
-                }
-            ) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-    except:
-        pass
-    
-    return []
+    return await post_rules("/check-irc", {
+        "components": components,
+        "year": 2018,
+        "state": factors.get("state")
+    })
 
 async def check_iecc_rules(components: Dict, factors: Dict) -> List[Dict]:
     """Call real rules service"""
     
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{RULES_SERVICE_URL}/check-iecc",
-                json={
-                    "components": components,
-                    "climate_zone": factors.get("climate_zone"),
-                    "year": 2015
-                }
-            ) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-    except:
-        pass
-    
-    return []
+    return await post_rules("/check-iecc", {
+        "components": components,
+        "climate_zone": factors.get("climate_zone"),
+        "year": 2015
+    })
 
 async def check_nec_rules(components: Dict, factors: Dict) -> List[Dict]:
     """Call real rules service"""
     
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{RULES_SERVICE_URL}/check-nec",
-                json={
-                    "components": components,
-                    "year": 2017
-                }
-            ) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-    except:
-        pass
-    
-    return []
+    return await post_rules("/check-nec", {
+        "components": components,
+        "year": 2017
+    })
 
 # ============================================================================
 # 7. STAGE 5: GENERATE COST ESTIMATE (Parallel)
@@ -479,8 +501,12 @@ async def generate_cost_estimate(
 ) -> Dict:
     """Generate detailed cost estimate"""
     
-    # Get pricing data (regional factors)
-    pricing = await get_regional_pricing(zip_code)
+    # Regional factors and every component's rates, fetched concurrently;
+    # the rates come back from one batched lookup instead of N serial awaits
+    pricing, rates = await asyncio.gather(
+        get_regional_pricing(zip_code),
+        get_unit_costs(list(components), zip_code)
+    )
     
     estimate = {
         "line_items": [],
@@ -498,15 +524,14 @@ async def generate_cost_estimate(
     for comp_type, comp_data in components.items():
         qty = comp_data.get("quantity", 0)
         
-        # Look up unit cost from pricing database
-        unit_cost = await get_unit_cost(comp_type, zip_code)
+        unit_cost = rates[comp_type]["unit_cost"]
         
         line_item = {
             "component": comp_type,
             "quantity": qty,
             "unit_cost": unit_cost,
             "line_total": qty * unit_cost,
-            "labor_hours": qty * get_labor_hours(comp_type),
+            "labor_hours": qty * rates[comp_type]["labor_hours"],
             "material_cost": qty * unit_cost
         }
         
@@ -570,156 +595,145 @@ def generate_populated_excel(
     findings: List,
     estimate: Dict
 ) -> bytes:
-    """Create Excel with auto-populated findings and estimate"""
-    
-    wb = openpyxl.Workbook()
-    
-    # Sheet 1: Project Info
-    ws = wb.active
-    ws.title = "PROJECT_INFO"
-    ws["A1"] = "Project Information"
-    ws["B3"] = project_info.get("project_name")
-    # ... populate all fields
-    
-    # Sheet 2: Findings
-    ws = wb.create_sheet("FINDINGS_OUTPUT")
-    ws["A1"] = "Code Compliance Findings"
-    ws["A2"] = "Severity"
-    ws["B2"] = "Code"
-    ws["C2"] = "Finding"
-    ws["D2"] = "Recommendation"
-    
-    row = 3
-    for finding in findings:
-        ws[f"A{row}"] = finding.get("severity")
-        ws[f"B{row}"] = finding.get("code")
-        ws[f"C{row}"] = finding.get("description")
-        ws[f"D{row}"] = finding.get("recommendation")
-        
-        # Color code severity
-        if finding.get("severity") == "RED":
-            ws[f"A{row}"].fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
-        elif finding.get("severity") == "ORANGE":
-            ws[f"A{row}"].fill = PatternFill(start_color="FFA500", end_color="FFA500", fill_type="solid")
-        
-        row += 1
-    
-    # Sheet 3: Estimate
-    ws = wb.create_sheet("ESTIMATE_OUTPUT")
-    ws["A1"] = "Cost Estimate"
-    ws["A2"] = "Line Item"
-    ws["B2"] = "Qty"
-    ws["C2"] = "Unit Cost"
-    ws["D2"] = "Total"
-    
-    row = 3
-    for line_item in estimate.get("line_items", []):
-        ws[f"A{row}"] = line_item.get("component")
-        ws[f"B{row}"] = line_item.get("quantity")
-        ws[f"C{row}"] = f"${line_item.get('unit_cost'):.2f}"
-        ws[f"D{row}"] = f"${line_item.get('line_total'):.2f}"
-        row += 1
-    
-    # Totals row
-    ws[f"A{row}"] = "SUBTOTAL"
-    ws[f"D{row}"] = f"${estimate.get('subtotal'):.2f}"
-    ws[f"D{row}"].font = Font(bold=True)
-    
-    row += 1
-    ws[f"A{row}"] = "Overhead & Profit (35%)"
-    ws[f"D{row}"] = f"${estimate.get('overhead_profit'):.2f}"
-    
-    row += 1
-    ws[f"A{row}"] = "Contingency (10%)"
-    ws[f"D{row}"] = f"${estimate.get('contingency'):.2f}"
-    
-    row += 1
-    ws[f"A{row}"] = "Permit Allowance"
-    ws[f"D{row}"] = f"${estimate.get('permit_allowance'):.2f}"
-    
-    row += 1
-    ws[f"A{row}"] = "GRAND TOTAL"
-    ws[f"D{row}"] = f"${estimate.get('grand_total'):.2f}"
-    ws[f"D{row}"].font = Font(bold=True, size=14)
-    
-    # Save to bytes
-    excel_bytes = io.BytesIO()
-    wb.save(excel_bytes)
-    return excel_bytes.getvalue()
+    """Create Excel with auto-populated findings and estimate (write-only, shared styles)"""
+    return write_output_workbook(project_info, findings, estimate)
 
 # ============================================================================
 # 9. MAIN ORCHESTRATION
 # ============================================================================
 
+# Stage intermediates live here so a failed run can resume from the last good stage.
+# The cache unpickles what it finds, so keep it in a private, service-owned directory.
+STAGE_CACHE = DiskStageCache(os.getenv(
+    "ANALYSIS_STAGE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "eagle-eye", "stages")
+))
+
+# Progress reported when each stage starts
+STAGE_PROGRESS = {
+    "parse_excel": ("stage_1_parse_excel", 10, "Parsing Excel template..."),
+    "extract_pdfs": ("stage_2_extract_pdfs", 25, "Extracting data from PDFs..."),
+    "merge": ("stage_3_merge", 35, "Merging Excel + AI data..."),
+    "compliance": ("stage_4_compliance", 50, "Checking code compliance..."),
+    "pricing": ("stage_5_pricing", 65, "Calculating costs..."),
+    "outputs": ("stage_6_outputs", 80, "Generating documents..."),
+}
+
+def build_analysis_dag(project_id: str) -> DagExecutor:
+    """
+    Declare each stage's inputs/outputs; the executor runs independent
+    stages concurrently:
+      parse_excel || extract_pdfs -> merge -> compliance || pricing -> outputs
+    """
+    
+    async def on_stage_start(stage: str):
+        await update_status(project_id, *STAGE_PROGRESS[stage])
+    
+    return DagExecutor(
+        [
+            Stage("parse_excel", parse_excel_stage,
+                  inputs=("excel_file",), outputs=("project_info", "excel_components")),
+            Stage("extract_pdfs", extract_from_pdfs_parallel,
+                  inputs=("pdf_files", "project_id"), outputs=("ai_extracted",)),
+            Stage("merge", merge_component_data,
+                  inputs=("excel_components", "ai_extracted"), outputs=("merged_components",)),
+            Stage("compliance", compliance_stage,
+                  inputs=("merged_components", "project_info"), outputs=("findings",)),
+            Stage("pricing", pricing_stage,
+                  inputs=("merged_components", "project_info"), outputs=("estimate",)),
+            Stage("outputs", outputs_stage,
+                  inputs=("project_id", "project_info", "merged_components", "findings", "estimate"),
+                  outputs=("outputs",)),
+        ],
+        cache=STAGE_CACHE,
+        on_stage_start=on_stage_start,
+    )
+
+async def parse_excel_stage(excel_file: Optional[SpooledFile]) -> Dict:
+    if excel_file:
+        with excel_file.open() as handle:
+            excel_parsed = await parse_excel_template(handle)
+    else:
+        excel_parsed = await parse_excel_template(None)
+    return {
+        "project_info": excel_parsed.get("project_info"),
+        "excel_components": excel_parsed.get("excel_components", {}),
+    }
+
+async def compliance_stage(merged_components: Dict, project_info: Dict) -> List[Dict]:
+    return await run_compliance_analysis(
+        merged_components,
+        project_info.get("jurisdiction"),
+        project_info.get("zip_code")
+    )
+
+async def pricing_stage(merged_components: Dict, project_info: Dict) -> Dict:
+    return await generate_cost_estimate(
+        merged_components,
+        project_info.get("zip_code"),
+        project_info.get("jurisdiction")
+    )
+
+async def outputs_stage(project_id, project_info, merged_components, findings, estimate) -> Dict:
+    return await generate_outputs(project_id, project_info, merged_components, findings, estimate)
+
 async def run_full_analysis(
     project_id: str,
-    excel_workbook,
-    pdf_bytes_list: List[bytes]
+    excel_file: Optional[SpooledFile],
+    pdf_files: List[SpooledFile],
+    rerun_from: Optional[str] = None,
+    spool: Optional[UploadSpool] = None,
+    final_attempt: bool = True
 ):
     """
     Complete analysis pipeline orchestration.
-    Runs Stages 1-6 in optimal sequence.
+    Runs Stages 1-6 as a DAG: independent stages run concurrently, per-stage
+    wall time is recorded, and a rerun with the same project and uploads
+    resumes from cached intermediates (or from `rerun_from`, e.g. "pricing").
+    The cache is keyed on the upload hashes, so revised uploads start fresh,
+    and it is cleared once the run succeeds.
+    Spooled uploads and cached intermediates are removed once the run
+    completes or fails for the last time; while retries remain they are kept
+    so the retry can resume.
+    When final_attempt is False a failure is re-raised (for the job queue to
+    retry, resuming from the cached stages) instead of being reported.
     """
     
+    executor = build_analysis_dag(project_id)
+    run_id = run_key(
+        project_id,
+        excel_file.sha256 if excel_file else None,
+        [f.sha256 for f in pdf_files]
+    )
+    
     try:
-        # STAGE 1: Parse Excel
-        await update_status(project_id, "stage_1_parse_excel", 10, "Parsing Excel template...")
-        
-        excel_parsed = await parse_excel_template(excel_workbook)
-        project_info = excel_parsed.get("project_info")
-        excel_components = excel_parsed.get("excel_components", {})
-        
-        # STAGE 2: Extract from PDFs (Parallel)
-        await update_status(project_id, "stage_2_extract_pdfs", 25, "Extracting data from PDFs...")
-        
-        ai_extracted = await extract_from_pdfs_parallel(pdf_bytes_list)
-        
-        # STAGE 3: Merge data
-        await update_status(project_id, "stage_3_merge", 35, "Merging Excel + AI data...")
-        
-        merged_components = merge_component_data(excel_components, ai_extracted)
-        
-        # STAGE 4: Run compliance analysis (Parallel)
-        await update_status(project_id, "stage_4_compliance", 50, "Checking code compliance...")
-        
-        findings = await run_compliance_analysis(
-            merged_components,
-            project_info.get("jurisdiction"),
-            project_info.get("zip_code")
-        )
-        
-        # STAGE 5: Generate estimate (Parallel)
-        await update_status(project_id, "stage_5_pricing", 65, "Calculating costs...")
-        
-        estimate = await generate_cost_estimate(
-            merged_components,
-            project_info.get("zip_code"),
-            project_info.get("jurisdiction")
+        results = await executor.run(
+            {
+                "project_id": project_id,
+                "excel_file": excel_file,
+                "pdf_files": pdf_files,
+            },
+            run_id=run_id,
+            rerun_from=rerun_from,
         )
         
-        # STAGE 6: Generate outputs
-        await update_status(project_id, "stage_6_outputs", 80, "Generating documents...")
-        
-        outputs = await generate_outputs(
-            project_id,
-            project_info,
-            merged_components,
-            findings,
-            estimate
-        )
+        project_info = results["project_info"]
+        estimate = results["estimate"]
         
         # Save results
         await save_analysis_results(
             project_id,
             {
                 "project_info": project_info,
-                "components": merged_components,
-                "findings": findings,
+                "components": results["merged_components"],
+                "findings": results["findings"],
                 "estimate": estimate,
-                "outputs": outputs,
+                "outputs": results["outputs"],
+                "stage_timings": [t.__dict__ for t in executor.timings],
                 "status": "complete"
             }
         )
+        executor.cache.clear(run_id)
         
         # STAGE 7: Notify user
         await update_status(project_id, "complete", 100, "Done! Check your email.")
@@ -730,8 +744,31 @@ async def run_full_analysis(
             project_info.get("project_name"),
             estimate.get("grand_total")
         )
+        
+        if spool:
+            spool.cleanup()
+    
+    except PipelineError as e:
+        # Intermediates from the stages that succeeded stay cached, so the
+        # queue's retry resumes at e.stage
+        if not final_attempt:
+            await update_status(project_id, "retrying", 0, f"Stage {e.stage} failed, retrying: {e.error}")
+            raise
+        # Nothing will resume this run: drop its uploads and intermediates
+        executor.cache.clear(run_id)
+        if spool:
+            spool.cleanup()
+        await update_status(project_id, "error", 0, f"Analysis failed at {e.stage}: {e.error}")
+        await send_error_email(project_id, str(e))
     
     except Exception as e:
+        if not final_attempt:
+            await update_status(project_id, "retrying", 0, f"Analysis failed, retrying: {str(e)}")
+            raise
+        # Nothing will resume this run: drop its uploads and intermediates
+        executor.cache.clear(run_id)
+        if spool:
+            spool.cleanup()
         await update_status(project_id, "error", 0, f"Analysis failed: {str(e)}")
         await send_error_email(project_id, str(e))
 
@@ -759,32 +796,72 @@ async def get_regional_pricing(zip_code: str) -> Dict:
         "material_factor": 1.05
     }
 
+UNIT_COSTS = {
+    "windows": 250,
+    "doors": 350,
+    "framing": 1.25,  # per board foot
+    "roofing": 4.50,  # per SF
+    "drywall": 0.95,  # per SF
+}
+
+LABOR_HOURS = {
+    "windows": 2.0,
+    "doors": 1.5,
+    "framing": 0.01,  # per BF
+    "roofing": 0.03,  # per SF
+}
+
+DEFAULT_UNIT_COST = 100
+DEFAULT_LABOR_HOURS = 1.0
+
+# zip_code -> (expires_at, {component_type: {"unit_cost", "labor_hours"}})
+UNIT_COST_CACHE: Dict[str, tuple] = {}
+UNIT_COST_TTL_S = 900
+
+async def get_unit_costs(component_types: List[str], zip_code: str) -> Dict[str, Dict[str, float]]:
+    """
+    Unit cost and labor hours per unit for many component types in one lookup.
+    Served from a per-ZIP cache; on a miss, every missing type is fetched
+    together. Unknown types get the defaults.
+    """
+    now = asyncio.get_running_loop().time()
+    expires_at, cached = UNIT_COST_CACHE.get(zip_code, (0, {}))
+    if expires_at <= now:
+        cached = {}
+    
+    missing = [t for t in set(component_types) if t not in cached]
+    if missing:
+        # In production, one round-trip for the whole batch:
+        #   SELECT component_type, unit_cost, labor_hours FROM unit_costs
+        #   WHERE zip_code = $1 AND component_type = ANY($2)
+        fetched = {
+            t: {
+                "unit_cost": UNIT_COSTS.get(t, DEFAULT_UNIT_COST),
+                "labor_hours": LABOR_HOURS.get(t, DEFAULT_LABOR_HOURS),
+            }
+            for t in missing
+        }
+        cached = {**cached, **fetched}
+        UNIT_COST_CACHE[zip_code] = (now + UNIT_COST_TTL_S if expires_at <= now else expires_at, cached)
+    
+    return {t: cached[t] for t in component_types}
+
 async def get_unit_cost(component_type: str, zip_code: str) -> float:
     """Get unit cost for component type and location"""
-    # In production: query pricing database
-    UNIT_COSTS = {
-        "windows": 250,
-        "doors": 350,
-        "framing": 1.25,  # per board foot
-        "roofing": 4.50,  # per SF
-        "drywall": 0.95,  # per SF
-    }
-    return UNIT_COSTS.get(component_type, 100)
+    return (await get_unit_costs([component_type], zip_code))[component_type]["unit_cost"]
 
 def get_labor_hours(component_type: str) -> float:
     """Get labor hours per unit"""
-    LABOR_HOURS = {
-        "windows": 2.0,
-        "doors": 1.5,
-        "framing": 0.01,  # per BF
-        "roofing": 0.03,  # per SF
-    }
-    return LABOR_HOURS.get(component_type, 1.0)
+    return LABOR_HOURS.get(component_type, DEFAULT_LABOR_HOURS)
 
 async def update_status(project_id: str, stage: str, progress: int, message: str):
-    """Update project status in cache/DB"""
-    # In production: save to Redis or DB
-    pass
+    """Publish a status change; WebSocket/SSE subscribers receive it immediately"""
+    await progress_bus.publish(ProgressEvent(project_id, stage, progress, message))
+
+async def get_project_status(project_id: str) -> Dict:
+    """Latest published status (for one-off polling clients)"""
+    event = await progress_bus.latest(project_id)
+    return event.as_dict() if event else {"project_id": project_id, "stage": None}
 
 async def save_analysis_results(project_id: str, results: Dict):
     """Save analysis results to database"""
@@ -810,11 +887,11 @@ if __name__ == "__main__":
 ## Time Breakdown: 5-10 Minutes Per Project
 
 ```
-Stage 1: Parse Excel           ~ 30 seconds
+Stage 1: Parse Excel           ~ 30 seconds (runs alongside Stage 2)
 Stage 2: Extract PDFs (parallel)  ~ 2-3 minutes
 Stage 3: Merge data             ~ 30 seconds
 Stage 4: Compliance checking (parallel) ~ 1-2 minutes
-Stage 5: Cost estimation        ~ 1 minute
+Stage 5: Cost estimation        ~ 1 minute (runs alongside Stage 4)
 Stage 6: Generate outputs       ~ 30 seconds
 Stage 7: Send email             ~ 30 seconds
 ─────────────────────────────────────────
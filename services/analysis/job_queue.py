@@ -0,0 +1,538 @@
+"""
+Eagle Eye Fast Analysis - Durable Job Queue
+Analysis runs are enqueued by the API and executed by a separate pool of
+worker processes, so the web worker only spools uploads and returns.
+
+- SQLiteJobQueue: single-host durable queue (file-backed, WAL)
+- RedisJobQueue: shared queue for multiple hosts
+- priorities: higher runs first (rush jobs), FIFO within a priority
+- per-tenant concurrency caps, enforced across all workers at claim time
+- retries with exponential backoff, then "dead"
+- visibility timeout: a claimed job whose lease is not extended (worker
+  crashed or hung) goes back to the queue
+
+Usage:
+    queue = open_queue()                        # JOB_QUEUE_URL
+    queue.enqueue("tenant-a", {"project_id": ...}, priority=PRIORITY_RUSH)
+
+    python job_queue.py worker --handler analysis_jobs:AnalysisWorker --processes 4
+    python job_queue.py stats
+
+A handler is a function(job), or a class instantiated once per worker process
+whose instances are called with each job. Optional hooks on the handler:
+preflight() (class-level, checked before the pool starts), on_dead(job) after
+a job's last attempt fails, and close() when the worker exits.
+"""
+import argparse
+import importlib
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUE_URL = os.getenv("JOB_QUEUE_URL", "sqlite:////tmp/eagle-eye/jobs.db")
+
+PRIORITY_NORMAL = 0
+PRIORITY_RUSH = 10
+
+
+@dataclass
+class Job:
+    id: str
+    tenant_id: str
+    payload: Dict[str, Any]
+    priority: int = PRIORITY_NORMAL
+    status: str = "queued"  # queued, running, done, dead
+    attempts: int = 0
+    max_attempts: int = 3
+    last_error: Optional[str] = None
+
+    @property
+    def is_final_attempt(self) -> bool:
+        return self.attempts >= self.max_attempts
+
+
+class SQLiteJobQueue:
+    """One connection per process; claims run in BEGIN IMMEDIATE transactions"""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                tenant_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                available_at REAL NOT NULL,
+                lease_expires_at REAL,
+                worker_id TEXT,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs(status, priority DESC, created_at);
+            CREATE INDEX IF NOT EXISTS idx_jobs_running ON jobs(status, tenant_id);
+        """)
+
+    def _job(self, row) -> Job:
+        return Job(
+            id=row["id"],
+            tenant_id=row["tenant_id"],
+            payload=json.loads(row["payload"]),
+            priority=row["priority"],
+            status=row["status"],
+            attempts=row["attempts"],
+            max_attempts=row["max_attempts"],
+            last_error=row["last_error"],
+        )
+
+    def enqueue(self, tenant_id: str, payload: Dict[str, Any], priority: int = PRIORITY_NORMAL,
+                max_attempts: int = 3) -> str:
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO jobs (id, tenant_id, payload, priority, max_attempts, available_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, tenant_id, json.dumps(payload), priority, max_attempts, now, now, now),
+            )
+        return job_id
+
+    def claim(self, worker_id: str, visibility_timeout_s: float, tenant_caps: Dict[str, int],
+              default_tenant_cap: int) -> Optional[Job]:
+        """Lease the highest-priority ready job whose tenant is under its cap"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._reap(now)
+                running = dict(self.conn.execute(
+                    "SELECT tenant_id, COUNT(*) FROM jobs WHERE status = 'running' GROUP BY tenant_id"
+                ).fetchall())
+                saturated = [t for t, n in running.items() if n >= tenant_caps.get(t, default_tenant_cap)]
+                placeholders = ",".join("?" * len(saturated))
+                row = self.conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' AND available_at <= ?"
+                    + (f" AND tenant_id NOT IN ({placeholders})" if saturated else "")
+                    + " ORDER BY priority DESC, created_at LIMIT 1",
+                    (now, *saturated),
+                ).fetchone()
+                if row is None:
+                    self.conn.execute("COMMIT")
+                    return None
+                self.conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker_id = ?,"
+                    " lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                    (worker_id, now + visibility_timeout_s, now, row["id"]),
+                )
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+        job = self._job(row)
+        job.status, job.attempts = "running", job.attempts + 1
+        return job
+
+    def _reap(self, now: float):
+        """Expired leases go back to the queue (or to dead if out of attempts)"""
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,"
+            " worker_id = NULL, lease_expires_at = NULL, last_error = 'visibility timeout', updated_at = ?"
+            " WHERE status = 'running' AND lease_expires_at < ?",
+            (now, now),
+        )
+
+    def extend(self, job_id: str, worker_id: str, visibility_timeout_s: float) -> bool:
+        """Heartbeat; False means the lease was lost and another worker may own the job"""
+        now = time.time()
+        with self.lock:
+            cur = self.conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ?"
+                " WHERE id = ? AND worker_id = ? AND status = 'running'",
+                (now + visibility_timeout_s, now, job_id, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def ack(self, job_id: str, worker_id: str):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'done', lease_expires_at = NULL, updated_at = ?"
+                " WHERE id = ? AND worker_id = ?",
+                (time.time(), job_id, worker_id),
+            )
+
+    def nack(self, job_id: str, worker_id: str, error: str, retry_delay_s: float):
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,"
+                " available_at = ?, worker_id = NULL, lease_expires_at = NULL, last_error = ?, updated_at = ?"
+                " WHERE id = ? AND worker_id = ?",
+                (now + retry_delay_s, error, now, job_id, worker_id),
+            )
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+# Ready jobs live in one sorted set per tenant (ready_prefix .. tenant), and
+# `tenants` ranks each tenant by its best queued job. A claim walks tenants,
+# not jobs, so a saturated tenant's backlog can't hide other tenants' work.
+_REDIS_READY = """
+local function push_ready(tenants, ready_prefix, key, id)
+    local tenant = redis.call('HGET', key, 'tenant_id')
+    local ready = ready_prefix .. tenant
+    redis.call('ZADD', ready, redis.call('HGET', key, 'rank'), id)
+    redis.call('ZADD', tenants, redis.call('ZRANGE', ready, 0, 0, 'WITHSCORES')[2], tenant)
+end
+"""
+
+# KEYS: tenants   ARGV: job_id, prefix, ready_prefix
+_REDIS_ENQUEUE = _REDIS_READY + """
+push_ready(KEYS[1], ARGV[3], ARGV[2] .. ARGV[1], ARGV[1])
+return 1
+"""
+
+# Claim atomically: promote due retries, reap expired leases, then take the
+# best ready job of the first tenant (by that job's rank) under its cap.
+# KEYS: tenants, delayed, running, tenant_running
+# ARGV: now, lease_until, worker_id, caps_json, default_cap, prefix, ready_prefix
+_REDIS_CLAIM = _REDIS_READY + """
+local tenants, delayed, running, tenant_running = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local now = tonumber(ARGV[1])
+local caps = cjson.decode(ARGV[4])
+local default_cap = tonumber(ARGV[5])
+local prefix = ARGV[6]
+local ready_prefix = ARGV[7]
+
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', delayed, '-inf', now)) do
+    redis.call('ZREM', delayed, id)
+    push_ready(tenants, ready_prefix, prefix .. id, id)
+end
+
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', running, '-inf', now)) do
+    local key = prefix .. id
+    redis.call('ZREM', running, id)
+    redis.call('HINCRBY', tenant_running, redis.call('HGET', key, 'tenant_id'), -1)
+    redis.call('HSET', key, 'last_error', 'visibility timeout', 'worker_id', '')
+    if tonumber(redis.call('HGET', key, 'attempts')) >= tonumber(redis.call('HGET', key, 'max_attempts')) then
+        redis.call('HSET', key, 'status', 'dead')
+    else
+        redis.call('HSET', key, 'status', 'queued')
+        push_ready(tenants, ready_prefix, key, id)
+    end
+end
+
+for _, tenant in ipairs(redis.call('ZRANGE', tenants, 0, -1)) do
+    local cap = caps[tenant] or default_cap
+    if tonumber(redis.call('HGET', tenant_running, tenant) or '0') < cap then
+        local ready = ready_prefix .. tenant
+        local id = redis.call('ZRANGE', ready, 0, 0)[1]
+        local key = prefix .. id
+        redis.call('ZREM', ready, id)
+        local head = redis.call('ZRANGE', ready, 0, 0, 'WITHSCORES')
+        if head[1] then
+            redis.call('ZADD', tenants, head[2], tenant)
+        else
+            redis.call('ZREM', tenants, tenant)
+        end
+        redis.call('ZADD', running, ARGV[2], id)
+        redis.call('HINCRBY', tenant_running, tenant, 1)
+        redis.call('HINCRBY', key, 'attempts', 1)
+        redis.call('HSET', key, 'status', 'running', 'worker_id', ARGV[3])
+        return id
+    end
+end
+return false
+"""
+
+
+class RedisJobQueue:
+    """Same interface as SQLiteJobQueue, backed by Redis sorted sets"""
+
+    def __init__(self, url: str, namespace: str = "eagle:jobs"):
+        import redis  # optional dependency
+
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.ns = namespace
+        self.keys = [f"{namespace}:tenants", f"{namespace}:delayed", f"{namespace}:running",
+                     f"{namespace}:tenant_running"]
+        self.ready_prefix = f"{namespace}:ready:"
+        self._enqueue = self.redis.register_script(_REDIS_ENQUEUE)
+        self._claim = self.redis.register_script(_REDIS_CLAIM)
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.ns}:job:{job_id}"
+
+    def _job(self, job_id: str, data: Dict[str, str]) -> Job:
+        return Job(
+            id=job_id,
+            tenant_id=data["tenant_id"],
+            payload=json.loads(data["payload"]),
+            priority=int(data["priority"]),
+            status=data["status"],
+            attempts=int(data["attempts"]),
+            max_attempts=int(data["max_attempts"]),
+            last_error=data.get("last_error") or None,
+        )
+
+    def enqueue(self, tenant_id: str, payload: Dict[str, Any], priority: int = PRIORITY_NORMAL,
+                max_attempts: int = 3) -> str:
+        job_id = str(uuid.uuid4())
+        # Lower score first: priority descending, then enqueue time
+        rank = -priority * 1e13 + time.time() * 1000
+        self.redis.hset(self._key(job_id), mapping={
+            "tenant_id": tenant_id, "payload": json.dumps(payload), "priority": priority,
+            "status": "queued", "attempts": 0, "max_attempts": max_attempts, "rank": rank,
+        })
+        self._enqueue(keys=self.keys[:1], args=[job_id, f"{self.ns}:job:", self.ready_prefix])
+        return job_id
+
+    def claim(self, worker_id: str, visibility_timeout_s: float, tenant_caps: Dict[str, int],
+              default_tenant_cap: int) -> Optional[Job]:
+        now = time.time()
+        job_id = self._claim(keys=self.keys, args=[
+            now, now + visibility_timeout_s, worker_id, json.dumps(tenant_caps), default_tenant_cap,
+            f"{self.ns}:job:", self.ready_prefix,
+        ])
+        if not job_id:
+            return None
+        return self._job(job_id, self.redis.hgetall(self._key(job_id)))
+
+    def extend(self, job_id: str, worker_id: str, visibility_timeout_s: float) -> bool:
+        if self.redis.hget(self._key(job_id), "worker_id") != worker_id:
+            return False
+        if self.redis.zscore(self.keys[2], job_id) is None:
+            return False
+        self.redis.zadd(self.keys[2], {job_id: time.time() + visibility_timeout_s}, xx=True)
+        return True
+
+    def _release(self, job_id: str, worker_id: str) -> Optional[Dict[str, str]]:
+        data = self.redis.hgetall(self._key(job_id))
+        if data.get("worker_id") != worker_id or not self.redis.zrem(self.keys[2], job_id):
+            return None
+        self.redis.hincrby(self.keys[3], data["tenant_id"], -1)
+        return data
+
+    def ack(self, job_id: str, worker_id: str):
+        if self._release(job_id, worker_id) is not None:
+            self.redis.hset(self._key(job_id), mapping={"status": "done", "worker_id": ""})
+
+    def nack(self, job_id: str, worker_id: str, error: str, retry_delay_s: float):
+        data = self._release(job_id, worker_id)
+        if data is None:
+            return
+        key = self._key(job_id)
+        if int(data["attempts"]) >= int(data["max_attempts"]):
+            self.redis.hset(key, mapping={"status": "dead", "worker_id": "", "last_error": error})
+        else:
+            self.redis.hset(key, mapping={"status": "queued", "worker_id": "", "last_error": error})
+            self.redis.zadd(self.keys[1], {job_id: time.time() + retry_delay_s})
+
+    def get(self, job_id: str) -> Optional[Job]:
+        data = self.redis.hgetall(self._key(job_id))
+        return self._job(job_id, data) if data else None
+
+    def stats(self) -> Dict[str, int]:
+        ready = sum(self.redis.zcard(f"{self.ready_prefix}{t}") for t in self.redis.zrange(self.keys[0], 0, -1))
+        return {
+            "queued": ready + self.redis.zcard(self.keys[1]),
+            "running": self.redis.zcard(self.keys[2]),
+        }
+
+
+def open_queue(url: Optional[str] = None):
+    """sqlite:///relative.db, sqlite:////abs/path.db or redis://host:6379/0"""
+    url = url or JOB_QUEUE_URL
+    if url.startswith(("redis://", "rediss://")):
+        return RedisJobQueue(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteJobQueue(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported job queue URL: {url}")
+
+
+def resolve(spec: str) -> Any:
+    """'module:attr' -> the attribute"""
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def load_handler(spec: str) -> Callable[[Job], Any]:
+    """'module:function' -> function(job); 'module:Class' -> a fresh Class() for this process"""
+    target = resolve(spec)
+    return target() if inspect.isclass(target) else target
+
+
+def _call_hook(handler, name: str, *args):
+    hook = getattr(handler, name, None)
+    if hook is None:
+        return
+    try:
+        hook(*args)
+    except Exception:
+        logger.exception("Handler %s hook failed", name)
+
+
+@dataclass
+class WorkerConfig:
+    queue_url: str
+    handler: str
+    visibility_timeout_s: float = 300.0
+    poll_interval_s: float = 1.0
+    tenant_caps: Optional[Dict[str, int]] = None
+    default_tenant_cap: int = 2
+    retry_base_s: float = 10.0
+    retry_max_s: float = 600.0
+
+
+def run_worker(config: WorkerConfig, stop):
+    """Claim/execute loop for one worker process"""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    queue = open_queue(config.queue_url)
+    handler = load_handler(config.handler)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the pool parent handles shutdown
+
+    try:
+        while not stop.is_set():
+            job = queue.claim(worker_id, config.visibility_timeout_s, config.tenant_caps or {},
+                              config.default_tenant_cap)
+            if job is None:
+                stop.wait(config.poll_interval_s)
+                continue
+
+            # Extend the lease while the handler runs; a dead worker stops heartbeating
+            done = threading.Event()
+
+            def heartbeat():
+                while not done.wait(config.visibility_timeout_s / 3):
+                    if not queue.extend(job.id, worker_id, config.visibility_timeout_s):
+                        logger.warning("Lost lease on job %s", job.id)
+                        return
+
+            beat = threading.Thread(target=heartbeat, daemon=True)
+            beat.start()
+            started = time.perf_counter()
+            try:
+                handler(job)
+            except Exception as e:
+                delay = min(config.retry_max_s, config.retry_base_s * 2 ** (job.attempts - 1))
+                logger.exception("Job %s attempt %d/%d failed", job.id, job.attempts, job.max_attempts)
+                queue.nack(job.id, worker_id, f"{type(e).__name__}: {e}", delay)
+                if job.is_final_attempt:
+                    _call_hook(handler, "on_dead", job)
+            else:
+                queue.ack(job.id, worker_id)
+                logger.info("Job %s done in %.1fs", job.id, time.perf_counter() - started)
+            finally:
+                done.set()
+                beat.join()
+    finally:
+        _call_hook(handler, "close")
+
+
+class WorkerPool:
+    """
+    N worker processes sharing one queue. Stops gracefully on SIGTERM/SIGINT:
+    running jobs finish, idle workers exit.
+    """
+
+    def __init__(self, config: WorkerConfig, processes: int = 2):
+        self.config = config
+        self.processes = processes
+        self.stop = multiprocessing.Event()
+        self.workers = []
+
+    def start(self):
+        for _ in range(self.processes):
+            proc = multiprocessing.Process(target=run_worker, args=(self.config, self.stop), daemon=False)
+            proc.start()
+            self.workers.append(proc)
+
+    def shutdown(self, *_):
+        self.stop.set()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.shutdown)
+        signal.signal(signal.SIGINT, self.shutdown)
+        self.start()
+        # Restart workers that crash until asked to stop
+        while not self.stop.is_set():
+            for i, proc in enumerate(self.workers):
+                if not proc.is_alive():
+                    logger.warning("Worker %s exited (%s); restarting", proc.pid, proc.exitcode)
+                    proc = multiprocessing.Process(target=run_worker, args=(self.config, self.stop))
+                    proc.start()
+                    self.workers[i] = proc
+            self.stop.wait(1.0)
+        for proc in self.workers:
+            proc.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eagle Eye analysis job queue")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    worker = sub.add_parser("worker", help="Run a worker process pool")
+    worker.add_argument("--handler", default="analysis_jobs:AnalysisWorker")
+    worker.add_argument("--queue-url", default=JOB_QUEUE_URL)
+    worker.add_argument("--processes", type=int, default=os.cpu_count() or 2)
+    worker.add_argument("--visibility-timeout", type=float, default=300.0)
+    worker.add_argument("--tenant-cap", type=int, default=2, help="Default concurrent jobs per tenant")
+    worker.add_argument("--tenant-caps", default="{}", help='Per-tenant overrides, e.g. {"acme": 4}')
+
+    stats = sub.add_parser("stats", help="Print job counts by status")
+    stats.add_argument("--queue-url", default=JOB_QUEUE_URL)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(message)s")
+
+    if args.command == "stats":
+        print(json.dumps(open_queue(args.queue_url).stats(), indent=2))
+        return
+
+    # Refuse to start a pool whose workers would all fail the same way
+    preflight = getattr(resolve(args.handler), "preflight", None)
+    if preflight is not None:
+        preflight()
+
+    WorkerPool(
+        WorkerConfig(
+            queue_url=args.queue_url,
+            handler=args.handler,
+            visibility_timeout_s=args.visibility_timeout,
+            tenant_caps=json.loads(args.tenant_caps),
+            default_tenant_cap=args.tenant_cap,
+        ),
+        processes=args.processes,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
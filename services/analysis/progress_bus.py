@@ -0,0 +1,210 @@
+"""
+Eagle Eye Fast Analysis - Progress Event Bus
+Push-based project status: the pipeline publishes, WebSocket/SSE handlers
+subscribe and receive each event as soon as it is published.
+
+Backends:
+- LocalBackend: in-process fan-out (tests, single-process dev)
+- RedisBackend: Redis pub/sub + a "latest" key, for multiple workers
+
+Analyses run in job_queue worker processes, so the web tier and the workers
+call require_shared() at startup and refuse to run on the in-process backend.
+
+The latest event per project is kept so a client that connects mid-run gets
+the current state immediately instead of waiting for the next transition.
+"""
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STAGES = {"complete", "error"}
+CHANNEL_PREFIX = "eagle:progress:"
+
+
+@dataclass
+class ProgressEvent:
+    project_id: str
+    stage: str
+    progress_percent: int
+    message: str
+    timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.stage in TERMINAL_STAGES
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.as_dict())
+
+    @classmethod
+    def from_json(cls, payload: str) -> "ProgressEvent":
+        return cls(**json.loads(payload))
+
+
+class LocalBackend:
+    """In-process pub/sub; each subscriber gets its own bounded queue"""
+
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._latest: Dict[str, str] = {}
+
+    async def publish(self, channel: str, payload: str):
+        self._latest[channel] = payload
+        for queue in list(self._subscribers.get(channel, ())):
+            if queue.full():
+                # Slow consumer: drop its oldest event rather than block the pipeline
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    async def latest(self, channel: str) -> Optional[str]:
+        return self._latest.get(channel)
+
+    async def listen(self, channel: str) -> AsyncIterator[str]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[channel].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self._subscribers[channel].discard(queue)
+            if not self._subscribers[channel]:
+                del self._subscribers[channel]
+
+    async def close(self):
+        pass
+
+
+class RedisBackend:
+    """Redis pub/sub so events cross web/worker process boundaries"""
+
+    def __init__(self, url: str, latest_ttl_s: int = 24 * 3600):
+        import redis.asyncio as redis  # optional dependency
+
+        self.redis = redis.from_url(url, decode_responses=True)
+        self.latest_ttl_s = latest_ttl_s
+
+    async def publish(self, channel: str, payload: str):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.set(f"{channel}:latest", payload, ex=self.latest_ttl_s)
+            pipe.publish(channel, payload)
+            await pipe.execute()
+
+    async def latest(self, channel: str) -> Optional[str]:
+        return await self.redis.get(f"{channel}:latest")
+
+    async def listen(self, channel: str) -> AsyncIterator[str]:
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
+
+    async def close(self):
+        await self.redis.close()
+
+
+class ProgressBus:
+    """
+    Example:
+        await progress_bus.publish(ProgressEvent(project_id, "stage_2_extract_pdfs", 25, "Extracting..."))
+
+        async for event in progress_bus.subscribe(project_id):
+            await websocket.send_json(event.as_dict())   # ends after complete/error
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or LocalBackend()
+
+    @property
+    def is_shared(self) -> bool:
+        """Whether events published here reach other processes"""
+        return not isinstance(self.backend, LocalBackend)
+
+    def require_shared(self, role: str):
+        """Analyses run in job_queue worker processes; an in-process bus would strand their events"""
+        if not self.is_shared:
+            raise RuntimeError(
+                f"{role} needs PROGRESS_BUS_URL=redis://...: with the in-process bus, progress "
+                "published by worker processes never reaches WebSocket/SSE clients"
+            )
+
+    @staticmethod
+    def channel(project_id: str) -> str:
+        return f"{CHANNEL_PREFIX}{project_id}"
+
+    async def publish(self, event: ProgressEvent):
+        try:
+            await self.backend.publish(self.channel(event.project_id), event.to_json())
+        except Exception as e:
+            # Progress is advisory; never fail an analysis because of it
+            logger.warning("Failed to publish progress for %s: %s", event.project_id, e)
+
+    async def latest(self, project_id: str) -> Optional[ProgressEvent]:
+        payload = await self.backend.latest(self.channel(project_id))
+        return ProgressEvent.from_json(payload) if payload else None
+
+    async def subscribe(self, project_id: str) -> AsyncIterator[ProgressEvent]:
+        """
+        Yield the current state (if any), then every new event, stopping after
+        a terminal event.
+        """
+        channel = self.channel(project_id)
+        listener = self.backend.listen(channel)
+        # Start listening before reading the snapshot so nothing published
+        # in between is missed
+        next_payload = asyncio.ensure_future(listener.__anext__())
+        await asyncio.sleep(0)
+        try:
+            last_timestamp = None
+            current = await self.latest(project_id)
+            if current:
+                last_timestamp = current.timestamp
+                yield current
+                if current.is_terminal:
+                    return
+
+            while True:
+                event = ProgressEvent.from_json(await next_payload)
+                next_payload = asyncio.ensure_future(listener.__anext__())
+                if last_timestamp and event.timestamp <= last_timestamp:
+                    continue  # already delivered as the snapshot
+                yield event
+                if event.is_terminal:
+                    return
+        finally:
+            next_payload.cancel()
+            try:
+                await next_payload
+            except (asyncio.CancelledError, StopAsyncIteration):
+                pass
+            await listener.aclose()
+
+    async def close(self):
+        await self.backend.close()
+
+
+def create_progress_bus(url: Optional[str] = None) -> ProgressBus:
+    """redis:// URLs use RedisBackend; anything else stays in-process"""
+    url = url if url is not None else os.getenv("PROGRESS_BUS_URL", "")
+    if url.startswith(("redis://", "rediss://")):
+        return ProgressBus(RedisBackend(url))
+    return ProgressBus(LocalBackend())
+
+
+# Process-wide bus; closed by the app shutdown hook
+progress_bus = create_progress_bus()
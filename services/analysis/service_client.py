@@ -0,0 +1,252 @@
+"""
+Eagle Eye Fast Analysis - Shared Service Client
+One pooled aiohttp session for calls to the rules / pricing / reports services
+
+- keep-alive connections with global and per-host limits
+- connect/total timeouts
+- bounded retries with full-jitter exponential backoff
+- a circuit breaker per downstream host
+- per-endpoint latency stats (count, errors, mean, p50, p95, max)
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+class ServiceError(Exception):
+    """A downstream call failed after retries (or was refused by the breaker)"""
+
+    def __init__(self, endpoint: str, message: str, status: Optional[int] = None):
+        super().__init__(f"{endpoint}: {message}")
+        self.endpoint = endpoint
+        self.status = status
+
+
+class CircuitOpenError(ServiceError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures;
+    open -> half-open after `reset_timeout_s`, letting one probe through;
+    half-open -> closed on success, open again on failure.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout_s:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """The probe finished (or was cancelled) without a verdict; let the next call probe"""
+        self._probe_in_flight = False
+
+
+class LatencyStats:
+    """Rolling latency window for one endpoint"""
+
+    def __init__(self, window: int = 512):
+        self.count = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.samples = deque(maxlen=window)
+
+    def record(self, elapsed_s: float, ok: bool):
+        self.count += 1
+        self.errors += 0 if ok else 1
+        self.total_s += elapsed_s
+        self.max_s = max(self.max_s, elapsed_s)
+        self.samples.append(elapsed_s)
+
+    def _percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": (self.total_s / self.count * 1000) if self.count else 0.0,
+            "p50_ms": self._percentile(50) * 1000,
+            "p95_ms": self._percentile(95) * 1000,
+            "max_ms": self.max_s * 1000,
+        }
+
+
+class ServiceClient:
+    """
+    Example:
+        client = ServiceClient()
+        await client.start()                    # app startup
+        findings = await client.post_json(f"{RULES_SERVICE_URL}/check-irc", {...})
+        client.stats()                          # {"rules:8001/check-irc": {...}}
+        await client.close()                    # app shutdown
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        total_timeout_s: float = 30.0,
+        connect_timeout_s: float = 3.0,
+        keepalive_timeout_s: float = 30.0,
+        max_retries: int = 2,
+        backoff_base_s: float = 0.2,
+        backoff_max_s: float = 2.0,
+        breaker_threshold: int = 5,
+        breaker_reset_s: float = 30.0
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout_s, connect=connect_timeout_s)
+        self.keepalive_timeout_s = keepalive_timeout_s
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_s = breaker_reset_s
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stats: Dict[str, LatencyStats] = {}
+
+    async def start(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout_s,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def __aenter__(self) -> "ServiceClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset_s)
+        return self._breakers[host]
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** attempt))
+
+    async def request_json(self, method: str, url: str, json: Any = None) -> Any:
+        """
+        Send a request and decode the JSON body.
+        Raises ServiceError (or CircuitOpenError) once retries are exhausted.
+        """
+        await self.start()
+        parts = urlsplit(url)
+        host = parts.netloc
+        endpoint = f"{host}{parts.path}"
+        breaker = self._breaker(host)
+        stats = self._stats.setdefault(endpoint, LatencyStats())
+
+        last_error = "unknown error"
+        last_status = None
+        for attempt in range(self.max_retries + 1):
+            probe = breaker.state == "half-open"
+            if not breaker.allow():
+                raise CircuitOpenError(endpoint, "circuit open")
+
+            started = time.perf_counter()
+            try:
+                async with self._session.request(method, url, json=json) as resp:
+                    if resp.status < 400:
+                        body = await resp.json()
+                        stats.record(time.perf_counter() - started, ok=True)
+                        breaker.record_success()
+                        return body
+                    last_status = resp.status
+                    last_error = f"HTTP {resp.status}"
+                    if resp.status not in RETRYABLE_STATUS:
+                        # Caller error: the service is healthy, don't trip the breaker
+                        stats.record(time.perf_counter() - started, ok=False)
+                        breaker.record_success()
+                        raise ServiceError(endpoint, last_error, resp.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_error = f"{type(e).__name__}: {e}"
+            finally:
+                # A cancelled probe never records a result; don't leave the breaker wedged half-open
+                if probe:
+                    breaker.release_probe()
+
+            stats.record(time.perf_counter() - started, ok=False)
+            breaker.record_failure()
+            if attempt < self.max_retries:
+                delay = self._backoff(attempt)
+                logger.warning("%s failed (%s), retry %d in %.2fs", endpoint, last_error, attempt + 1, delay)
+                await asyncio.sleep(delay)
+
+        raise ServiceError(endpoint, last_error, last_status)
+
+    async def post_json(self, url: str, payload: Any) -> Any:
+        return await self.request_json("POST", url, json=payload)
+
+    async def get_json(self, url: str) -> Any:
+        return await self.request_json("GET", url)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint latency plus the breaker state of its host"""
+        return {
+            endpoint: {**s.as_dict(), "breaker": self._breaker(endpoint.split("/", 1)[0]).state}
+            for endpoint, s in self._stats.items()
+        }
+
+
+# Process-wide client; started/closed by the app lifecycle hooks
+service_client = ServiceClient()
@@ -0,0 +1,287 @@
+"""
+Eagle Eye Fast Analysis - Stage DAG Executor
+Runs pipeline stages as soon as their inputs exist, so independent stages
+(e.g. compliance and pricing, which both only need merged_components)
+run concurrently instead of strictly in sequence.
+
+Each stage's outputs are written to a StageCache. If a stage fails, re-running
+with the same run_id reuses every cached intermediate and only executes the
+failed stage and whatever depends on it. Derive run_id from the run's inputs
+(see run_key) so a run with different inputs never sees another run's outputs,
+and clear() it once the run has succeeded.
+"""
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import shutil
+import stat
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline step.
+
+    fn is called with keyword arguments named after `inputs`. It returns a
+    dict keyed by `outputs`, or a bare value when there is exactly one output.
+    fn may be sync or async.
+    """
+    name: str
+    fn: Callable[..., Union[Any, Awaitable[Any]]]
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+
+
+@dataclass
+class StageTiming:
+    stage: str
+    status: str  # ok, cached, failed, skipped
+    wall_s: float = 0.0
+    error: Optional[str] = None
+
+
+class PipelineError(Exception):
+    """A stage failed; cached intermediates from other stages are kept for a rerun"""
+
+    def __init__(self, stage: str, error: BaseException, timings: List[StageTiming]):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+        self.timings = timings
+
+
+def run_key(*parts: Any) -> str:
+    """Filesystem-safe run_id from everything that determines a run's outputs"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class StageCache:
+    """In-memory stage output cache keyed by (run_id, stage)"""
+
+    def __init__(self):
+        self._data: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def get(self, run_id: str, stage: str) -> Optional[Dict[str, Any]]:
+        return self._data.get((run_id, stage))
+
+    def put(self, run_id: str, stage: str, outputs: Dict[str, Any]):
+        self._data[(run_id, stage)] = outputs
+
+    def delete(self, run_id: str, stage: str):
+        self._data.pop((run_id, stage), None)
+
+    def clear(self, run_id: str):
+        """Drop every stage of a finished run"""
+        for key in [k for k in self._data if k[0] == run_id]:
+            del self._data[key]
+
+
+class DiskStageCache(StageCache):
+    """
+    Pickle-per-stage cache so intermediates survive a worker restart.
+
+    Entries are unpickled, so root must be private to the service user: it is
+    created 0700 and refused if another user owns it or can write to it.
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+        self._checked = False
+
+    def _check_root(self):
+        if self._checked:
+            return
+        self.root.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = self.root.stat()
+        if st.st_uid != os.getuid() or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"Stage cache {self.root} must be owned by this user and not group/world-writable")
+        self._checked = True
+
+    def _path(self, run_id: str, stage: str) -> Path:
+        if not run_id or os.sep in run_id or run_id in (".", ".."):
+            raise ValueError(f"Invalid run_id: {run_id!r}")
+        self._check_root()
+        return self.root / run_id / f"{stage}.pkl"
+
+    def get(self, run_id: str, stage: str) -> Optional[Dict[str, Any]]:
+        path = self._path(run_id, stage)
+        if not path.exists():
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def put(self, run_id: str, stage: str, outputs: Dict[str, Any]):
+        path = self._path(run_id, stage)
+        path.parent.mkdir(mode=0o700, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(outputs, f)
+        tmp.replace(path)
+
+    def delete(self, run_id: str, stage: str):
+        self._path(run_id, stage).unlink(missing_ok=True)
+
+    def clear(self, run_id: str):
+        shutil.rmtree(self._path(run_id, "_").parent, ignore_errors=True)
+
+
+StageHook = Callable[[str, StageTiming], Awaitable[None]]
+
+
+class DagExecutor:
+    """
+    Example:
+        executor = DagExecutor([
+            Stage("merge", merge_component_data, ("excel_components", "ai_extracted"), ("merged_components",)),
+            Stage("compliance", check, ("merged_components",), ("findings",)),
+            Stage("pricing", price, ("merged_components",), ("estimate",)),
+        ], cache=DiskStageCache("/var/lib/eagle-eye/stages"))
+        run_id = run_key(project_id, upload_hashes)
+        results = await executor.run({"excel_components": ..., "ai_extracted": ...}, run_id=run_id)
+        executor.timings  # per-stage wall time
+        executor.cache.clear(run_id)
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        cache: Optional[StageCache] = None,
+        on_stage_start: Optional[Callable[[str], Awaitable[None]]] = None,
+        on_stage_end: Optional[StageHook] = None
+    ):
+        self.stages: Dict[str, Stage] = {}
+        self.producer: Dict[str, str] = {}
+        for stage in stages:
+            self.stages[stage.name] = stage
+            for output in stage.outputs:
+                if output in self.producer:
+                    raise ValueError(f"Output '{output}' produced by both {self.producer[output]} and {stage.name}")
+                self.producer[output] = stage.name
+        self.cache = cache or StageCache()
+        self.on_stage_start = on_stage_start
+        self.on_stage_end = on_stage_end
+        self.timings: List[StageTiming] = []
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Stage cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for inp in self.stages[name].inputs:
+                if inp in self.producer:
+                    visit(self.producer[inp], path + [name])
+            state[name] = "done"
+
+        for name in self.stages:
+            visit(name, [])
+
+    def descendants(self, name: str) -> List[str]:
+        """Stages that (transitively) consume outputs of `name`, including itself"""
+        found = [name]
+        frontier = [name]
+        while frontier:
+            outputs = set(self.stages[frontier.pop()].outputs)
+            for stage in self.stages.values():
+                if stage.name not in found and outputs.intersection(stage.inputs):
+                    found.append(stage.name)
+                    frontier.append(stage.name)
+        return found
+
+    def invalidate(self, run_id: str, from_stage: str):
+        """Drop cached outputs of a stage and everything downstream of it"""
+        for name in self.descendants(from_stage):
+            self.cache.delete(run_id, name)
+
+    async def _run_stage(self, stage: Stage, values: Dict[str, Any]) -> Dict[str, Any]:
+        kwargs = {name: values[name] for name in stage.inputs}
+        result = stage.fn(**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        if len(stage.outputs) == 1 and not (isinstance(result, dict) and set(result) == set(stage.outputs)):
+            return {stage.outputs[0]: result}
+        missing = set(stage.outputs) - set(result or {})
+        if missing:
+            raise ValueError(f"Stage '{stage.name}' did not return outputs: {', '.join(sorted(missing))}")
+        return {name: result[name] for name in stage.outputs}
+
+    async def run(self, initial: Dict[str, Any], run_id: str, rerun_from: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Execute the DAG and return every produced value (including `initial`).
+
+        Stages with cached outputs for run_id are not executed again. Pass
+        rerun_from to force a stage and its dependents to run even if cached.
+        Raises PipelineError after in-flight stages settle if any stage fails.
+        """
+        if rerun_from:
+            self.invalidate(run_id, rerun_from)
+
+        values = dict(initial)
+        self.timings = []
+        pending = dict(self.stages)
+        running: Dict[asyncio.Task, Tuple[Stage, float]] = {}
+        failure: Optional[Tuple[str, BaseException]] = None
+
+        def ready(stage: Stage) -> bool:
+            return all(name in values for name in stage.inputs)
+
+        while pending or running:
+            # Schedule everything ready; cache hits can unlock more, so repeat
+            progressed = failure is None
+            while progressed:
+                progressed = False
+                for name, stage in list(pending.items()):
+                    if not ready(stage):
+                        continue
+                    del pending[name]
+                    progressed = True
+                    cached = self.cache.get(run_id, name)
+                    if cached is not None:
+                        values.update(cached)
+                        self.timings.append(StageTiming(name, "cached"))
+                        continue
+                    if self.on_stage_start:
+                        await self.on_stage_start(name)
+                    task = asyncio.create_task(self._run_stage(stage, values))
+                    running[task] = (stage, time.perf_counter())
+
+            if not running:
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                stage, started = running.pop(task)
+                timing = StageTiming(stage.name, "ok", time.perf_counter() - started)
+                try:
+                    outputs = task.result()
+                except Exception as e:
+                    timing.status, timing.error = "failed", str(e)
+                    if failure is None:
+                        failure = (stage.name, e)
+                else:
+                    values.update(outputs)
+                    self.cache.put(run_id, stage.name, outputs)
+                self.timings.append(timing)
+                if self.on_stage_end:
+                    await self.on_stage_end(stage.name, timing)
+
+        for name in pending:
+            self.timings.append(StageTiming(name, "skipped"))
+
+        if failure:
+            raise PipelineError(failure[0], failure[1], self.timings)
+        if pending:
+            missing = {i for s in pending.values() for i in s.inputs if i not in values}
+            raise ValueError(f"Stages {sorted(pending)} never became ready; missing inputs: {sorted(missing)}")
+        return values
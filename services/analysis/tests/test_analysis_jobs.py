@@ -0,0 +1,121 @@
+import asyncio
+import sys
+import threading
+
+import pytest
+
+import analysis_jobs
+import job_queue
+import progress_bus
+from analysis_jobs import AnalysisWorker
+from job_queue import WorkerConfig, run_worker
+from upload_spool import UploadSpool
+
+MODULE = sys.modules[__name__].__name__
+STOP = threading.Event()
+RUNS = []
+
+
+class RecordingBackend:
+    """Stands in for the shared (redis) backend"""
+
+    def __init__(self):
+        self.published = []
+        self.closed = False
+
+    async def publish(self, channel, payload):
+        self.published.append(payload)
+
+    async def latest(self, channel):
+        return None
+
+    async def close(self):
+        self.closed = True
+
+
+class RecordingWorker(AnalysisWorker):
+    def __init__(self):
+        super().__init__(pipeline=self.run)
+
+    async def run(self, project_id, excel_file, pdf_files, spool=None, final_attempt=True):
+        RUNS.append((project_id, [f.open().read() for f in pdf_files], final_attempt, asyncio.get_running_loop()))
+        STOP.set()
+        if project_id == "broken":
+            raise RuntimeError("pipeline crashed before cleaning up")
+        spool.cleanup()
+
+
+class FakeUpload:
+    filename = "plans.pdf"
+    content_type = "application/pdf"
+
+    def __init__(self, data):
+        self.data = data
+
+    async def read(self, n):
+        data, self.data = self.data, b""
+        return data
+
+
+@pytest.fixture
+def bus(monkeypatch):
+    backend = RecordingBackend()
+    monkeypatch.setattr(progress_bus.progress_bus, "backend", backend)
+    monkeypatch.setattr(job_queue.signal, "signal", lambda *args: None)
+    STOP.clear()
+    RUNS.clear()
+    return backend
+
+
+def enqueue(tmp_path, project_id, max_attempts=3):
+    spool = UploadSpool(spool_dir=tmp_path / "uploads", memory_limit_bytes=0)
+    spooled = asyncio.run(spool.add(FakeUpload(b"%PDF-1.4")))
+    queue = job_queue.SQLiteJobQueue(str(tmp_path / "jobs.db"))
+    queue.enqueue("acme", {"project_id": project_id, "excel_file": None, "pdf_files": [spooled.as_dict()]},
+                  max_attempts=max_attempts)
+    return spooled.path
+
+
+def config(tmp_path):
+    return WorkerConfig(queue_url=f"sqlite:///{tmp_path / 'jobs.db'}", handler=f"{MODULE}:RecordingWorker",
+                        poll_interval_s=0.01)
+
+
+def test_default_handler_is_importable():
+    assert job_queue.resolve("analysis_jobs:AnalysisWorker") is AnalysisWorker
+    assert analysis_jobs.ANALYSIS_PIPELINE.endswith(":run_full_analysis")
+
+
+def test_workers_refuse_the_in_process_bus():
+    with pytest.raises(RuntimeError, match="PROGRESS_BUS_URL"):
+        AnalysisWorker(pipeline=lambda *args, **kwargs: None)
+
+
+def test_worker_runs_a_queued_job(tmp_path, bus):
+    upload = enqueue(tmp_path, "p1")
+    run_worker(config(tmp_path), STOP)
+
+    (project_id, pdfs, final_attempt, _), = RUNS
+    assert (project_id, pdfs, final_attempt) == ("p1", [b"%PDF-1.4"], False)
+    assert not upload.exists()
+    assert job_queue.SQLiteJobQueue(str(tmp_path / "jobs.db")).stats() == {"done": 1}
+    assert bus.closed
+
+
+def test_worker_reuses_one_event_loop(tmp_path, bus):
+    enqueue(tmp_path, "p1")
+    enqueue(tmp_path, "p2")
+    worker = RecordingWorker()
+    queue = job_queue.SQLiteJobQueue(str(tmp_path / "jobs.db"))
+    for _ in range(2):
+        worker(queue.claim("w1", 60, {}, 2))
+    worker.close()
+    assert RUNS[0][3] is RUNS[1][3] is worker.loop and worker.loop.is_closed()
+
+
+def test_dead_jobs_release_their_uploads(tmp_path, bus):
+    upload = enqueue(tmp_path, "broken", max_attempts=1)
+    run_worker(config(tmp_path), STOP)
+    assert RUNS[0][2] is True
+    assert not upload.exists()
+    assert job_queue.SQLiteJobQueue(str(tmp_path / "jobs.db")).stats() == {"dead": 1}
@@ -0,0 +1,34 @@
+from job_queue import PRIORITY_RUSH, SQLiteJobQueue
+
+
+def make_queue(tmp_path):
+    return SQLiteJobQueue(str(tmp_path / "jobs.db"))
+
+
+def test_rush_jobs_are_claimed_first(tmp_path):
+    queue = make_queue(tmp_path)
+    normal = queue.enqueue("acme", {"n": 1})
+    rush = queue.enqueue("acme", {"n": 2}, priority=PRIORITY_RUSH)
+    assert queue.claim("w1", 60, {}, 5).id == rush
+    assert queue.claim("w1", 60, {}, 5).id == normal
+
+
+def test_saturated_tenants_do_not_block_others(tmp_path):
+    queue = make_queue(tmp_path)
+    for i in range(5):
+        queue.enqueue("big", {"n": i})
+    small = queue.enqueue("small", {"n": 0})
+    claimed = [queue.claim("w1", 60, {"big": 1}, 2) for _ in range(3)]
+    assert [j.tenant_id for j in claimed[:2]] == ["big", "small"] and claimed[1].id == small
+    assert claimed[2] is None
+
+
+def test_failed_jobs_retry_then_die(tmp_path):
+    queue = make_queue(tmp_path)
+    job_id = queue.enqueue("acme", {}, max_attempts=2)
+    for attempt in (1, 2):
+        job = queue.claim("w1", 60, {}, 2)
+        assert job.attempts == attempt and job.is_final_attempt == (attempt == 2)
+        queue.nack(job.id, "w1", "boom", 0)
+    assert queue.get(job_id).status == "dead"
+    assert queue.claim("w1", 60, {}, 2) is None
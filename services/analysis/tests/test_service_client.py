@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from service_client import CircuitBreaker, CircuitOpenError, ServiceClient
+
+
+def test_breaker_opens_then_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "half-open"
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_cancelled_probe_releases_the_breaker():
+    class HangingSession:
+        closed = False
+
+        def request(self, *args, **kwargs):
+            return self
+
+        async def __aenter__(self):
+            await asyncio.sleep(3600)
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def scenario():
+        client = ServiceClient(breaker_threshold=1, breaker_reset_s=0)
+        client._session = HangingSession()
+        breaker = client._breaker("rules:8001")
+        breaker.record_failure()
+
+        probe = asyncio.create_task(client.post_json("http://rules:8001/check-irc", {}))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await client.post_json("http://rules:8001/check-irc", {})
+
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert breaker.allow()
+
+    asyncio.run(scenario())
@@ -0,0 +1,104 @@
+import asyncio
+import os
+
+import pytest
+
+from stage_dag import DagExecutor, DiskStageCache, PipelineError, Stage, StageCache, run_key
+
+
+def build(calls, cache=None, fail=()):
+    def step(name, fn):
+        def run(**kwargs):
+            calls.append(name)
+            if name in fail:
+                raise RuntimeError(f"{name} broke")
+            return fn(**kwargs)
+        return run
+
+    return DagExecutor([
+        Stage("double", step("double", lambda x: x * 2), ("x",), ("doubled",)),
+        Stage("square", step("square", lambda x: x * x), ("x",), ("squared",)),
+        Stage("total", step("total", lambda doubled, squared: doubled + squared), ("doubled", "squared"), ("total",)),
+    ], cache=cache)
+
+
+def test_runs_every_stage_and_returns_all_values():
+    calls = []
+    results = asyncio.run(build(calls).run({"x": 3}, run_id="r1"))
+    assert results == {"x": 3, "doubled": 6, "squared": 9, "total": 15}
+    assert sorted(calls) == ["double", "square", "total"]
+
+
+def test_independent_stages_run_concurrently():
+    order = []
+
+    async def slow(name, value):
+        order.append(f"{name}-start")
+        await asyncio.sleep(0.01)
+        order.append(f"{name}-end")
+        return value
+
+    executor = DagExecutor([
+        Stage("a", lambda x: slow("a", x), ("x",), ("a",)),
+        Stage("b", lambda x: slow("b", x), ("x",), ("b",)),
+    ])
+    asyncio.run(executor.run({"x": 1}, run_id="r"))
+    assert order[:2] == ["a-start", "b-start"]
+
+
+def test_failed_run_resumes_from_cached_stages():
+    cache = StageCache()
+    calls = []
+    with pytest.raises(PipelineError) as err:
+        asyncio.run(build(calls, cache, fail=("total",)).run({"x": 3}, run_id="r1"))
+    assert err.value.stage == "total"
+
+    calls.clear()
+    results = asyncio.run(build(calls, cache).run({"x": 3}, run_id="r1"))
+    assert calls == ["total"] and results["total"] == 15
+
+
+def test_rerun_from_invalidates_downstream_stages():
+    cache = StageCache()
+    asyncio.run(build([], cache).run({"x": 3}, run_id="r1"))
+    calls = []
+    asyncio.run(build(calls, cache).run({"x": 3}, run_id="r1", rerun_from="square"))
+    assert sorted(calls) == ["square", "total"]
+
+
+def test_cycles_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        DagExecutor([
+            Stage("a", lambda b: b, ("b",), ("a",)),
+            Stage("b", lambda a: a, ("a",), ("b",)),
+        ])
+
+
+def test_run_key_changes_with_inputs():
+    assert run_key("p1", ["abc"]) == run_key("p1", ["abc"])
+    assert run_key("p1", ["abc"]) != run_key("p1", ["abd"])
+
+
+def test_disk_cache_round_trips_and_clears(tmp_path):
+    cache = DiskStageCache(tmp_path / "stages")
+    run_id = run_key("p1", ["abc"])
+    asyncio.run(build([], cache).run({"x": 3}, run_id=run_id))
+    assert cache.get(run_id, "total") == {"total": 15}
+    assert oct((tmp_path / "stages").stat().st_mode & 0o777) == oct(0o700)
+
+    cache.clear(run_id)
+    assert cache.get(run_id, "total") is None
+    assert not (tmp_path / "stages" / run_id).exists()
+
+
+def test_disk_cache_refuses_shared_directories(tmp_path):
+    root = tmp_path / "shared"
+    root.mkdir()
+    os.chmod(root, 0o777)
+    with pytest.raises(PermissionError):
+        DiskStageCache(root).get("r1", "total")
+
+
+def test_disk_cache_rejects_path_like_run_ids(tmp_path):
+    with pytest.raises(ValueError):
+        DiskStageCache(tmp_path).get("../elsewhere", "total")
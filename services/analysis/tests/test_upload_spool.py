@@ -0,0 +1,57 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+
+from upload_spool import SpooledFile, UploadSpool, UploadTooLarge, remove_stale_uploads
+
+
+class FakeUpload:
+    def __init__(self, data: bytes, filename: str = "plans.pdf"):
+        self.filename = filename
+        self.content_type = "application/pdf"
+        self._stream = io.BytesIO(data)
+
+    async def read(self, n: int) -> bytes:
+        return self._stream.read(n)
+
+
+def test_small_uploads_stay_in_memory(tmp_path):
+    spool = UploadSpool(spool_dir=tmp_path, memory_limit_bytes=1024, chunk_size=4)
+    spooled = asyncio.run(spool.add(FakeUpload(b"hello")))
+    assert spooled.in_memory and spooled.open().read() == b"hello"
+    assert spooled.sha256 == hashlib.sha256(b"hello").hexdigest()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_large_uploads_spill_to_disk_and_round_trip(tmp_path):
+    data = bytes(range(256)) * 40
+    spool = UploadSpool(spool_dir=tmp_path, memory_limit_bytes=0, chunk_size=1000)
+    spooled = asyncio.run(spool.add(FakeUpload(data)))
+    assert not spooled.in_memory and spooled.size_bytes == len(data)
+    with spooled.view() as view:
+        assert bytes(view) == data
+
+    shared = SpooledFile.from_dict(spooled.as_dict())
+    assert shared.open().read() == data
+
+    spool.cleanup()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_oversized_request_leaves_no_partial_file(tmp_path):
+    spool = UploadSpool(spool_dir=tmp_path, memory_limit_bytes=0, max_request_bytes=10, chunk_size=4)
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(spool.add(FakeUpload(b"x" * 20)))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_remove_stale_uploads_keeps_recent_files(tmp_path):
+    old, new = tmp_path / "old.pdf", tmp_path / "new.pdf"
+    old.write_bytes(b"x")
+    new.write_bytes(b"x")
+    os.utime(old, (0, 0))
+    assert remove_stale_uploads(tmp_path, max_age_s=3600) == 1
+    assert not old.exists() and new.exists()
@@ -0,0 +1,191 @@
+"""
+Eagle Eye Fast Analysis - Upload Spooling
+Streams uploaded files in chunks instead of `await file.read()`-ing them whole.
+
+Each file is SHA-256 hashed as it arrives. Small files stay in memory while
+the request is under its memory ceiling; once the ceiling would be exceeded
+the file spills to a temp file on disk. Later stages get a file handle
+(open()) or a memory-mapped view (view()), never a second in-memory copy.
+"""
+import asyncio
+import hashlib
+import io
+import mmap
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+SPOOL_DIR = os.getenv("ANALYSIS_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "eagle-eye", "uploads"))
+SPOOL_MAX_AGE_S = float(os.getenv("ANALYSIS_SPOOL_MAX_AGE_H", "24")) * 3600
+REQUEST_MEMORY_LIMIT_BYTES = int(os.getenv("ANALYSIS_REQUEST_MEMORY_LIMIT_MB", "32")) * 1024 * 1024
+MAX_REQUEST_BYTES = int(os.getenv("ANALYSIS_MAX_REQUEST_MB", "2048")) * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+@dataclass
+class SpooledFile:
+    filename: str
+    content_type: Optional[str]
+    sha256: str
+    size_bytes: int
+    path: Optional[Path] = None
+    data: Optional[bytes] = None
+
+    @property
+    def in_memory(self) -> bool:
+        return self.path is None
+
+    def open(self) -> BinaryIO:
+        """Fresh read handle positioned at the start of the file"""
+        if self.in_memory:
+            return io.BytesIO(self.data)
+        return open(self.path, "rb")
+
+    @contextmanager
+    def view(self) -> Iterator[memoryview]:
+        """Zero-copy read-only view (memory-mapped when spilled to disk)"""
+        if self.in_memory:
+            yield memoryview(self.data)
+            return
+        if self.size_bytes == 0:
+            yield memoryview(b"")
+            return
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+    def cleanup(self):
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+    def as_dict(self) -> Dict:
+        """JSON-safe reference for handing a spilled file to another process"""
+        if self.in_memory:
+            raise ValueError(f"{self.filename} is held in memory; spool with memory_limit_bytes=0 to share it")
+        return {
+            "filename": self.filename,
+            "content_type": self.content_type,
+            "sha256": self.sha256,
+            "size_bytes": self.size_bytes,
+            "path": str(self.path),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SpooledFile":
+        return cls(**{**data, "path": Path(data["path"])})
+
+
+class UploadSpool:
+    """
+    Collects the uploads of one request.
+
+    Example:
+        spool = UploadSpool()
+        for upload in pdf_files:
+            await spool.add(upload)        # raises UploadTooLarge past the cap
+        ...
+        spool.cleanup()                    # once the analysis no longer needs them
+    """
+
+    def __init__(
+        self,
+        spool_dir: str = SPOOL_DIR,
+        memory_limit_bytes: int = REQUEST_MEMORY_LIMIT_BYTES,
+        max_request_bytes: int = MAX_REQUEST_BYTES,
+        chunk_size: int = CHUNK_SIZE
+    ):
+        self.spool_dir = Path(spool_dir)
+        self.memory_limit_bytes = memory_limit_bytes
+        self.max_request_bytes = max_request_bytes
+        self.chunk_size = chunk_size
+        self.files: List[SpooledFile] = []
+        self.memory_bytes = 0
+        self.total_bytes = 0
+
+    async def add(self, upload) -> SpooledFile:
+        """Stream a FastAPI UploadFile (anything with async read(n)) into the spool"""
+        hasher = hashlib.sha256()
+        buffer = bytearray()
+        out = None
+        path = None
+        size = 0
+
+        try:
+            while True:
+                chunk = await upload.read(self.chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                self.total_bytes += len(chunk)
+                if self.total_bytes > self.max_request_bytes:
+                    raise UploadTooLarge(
+                        f"Request exceeds {self.max_request_bytes // (1024 * 1024)} MB upload limit"
+                    )
+                hasher.update(chunk)
+
+                if out is None and self.memory_bytes + len(buffer) + len(chunk) <= self.memory_limit_bytes:
+                    buffer.extend(chunk)
+                    continue
+
+                if out is None:
+                    # Over the ceiling: spill what we have and stream the rest to disk
+                    self.spool_dir.mkdir(parents=True, exist_ok=True)
+                    fd, name = tempfile.mkstemp(dir=self.spool_dir, suffix=Path(upload.filename or "").suffix)
+                    os.close(fd)
+                    path = Path(name)
+                    out = await asyncio.to_thread(open, path, "wb")
+                    await asyncio.to_thread(out.write, bytes(buffer))
+                    buffer = bytearray()
+                # Blocking file I/O runs off the event loop
+                await asyncio.to_thread(out.write, chunk)
+        except BaseException:
+            if out is not None:
+                out.close()
+                path.unlink(missing_ok=True)
+            raise
+
+        if out is not None:
+            await asyncio.to_thread(out.close)
+            spooled = SpooledFile(upload.filename or "upload", upload.content_type, hasher.hexdigest(), size, path=path)
+        else:
+            self.memory_bytes += len(buffer)
+            spooled = SpooledFile(upload.filename or "upload", upload.content_type, hasher.hexdigest(), size,
+                                  data=bytes(buffer))
+
+        self.files.append(spooled)
+        return spooled
+
+    def cleanup(self):
+        for spooled in self.files:
+            spooled.cleanup()
+        self.files = []
+        self.memory_bytes = 0
+
+
+def remove_stale_uploads(spool_dir: str = SPOOL_DIR, max_age_s: float = SPOOL_MAX_AGE_S) -> int:
+    """
+    Delete spooled files older than max_age_s (longer than any job can live).
+    Catches uploads whose job never cleaned up: a worker that crashed on the
+    last attempt, or a web worker that died between spooling and enqueueing.
+    """
+    cutoff = time.time() - max_age_s
+    removed = 0
+    for path in Path(spool_dir).glob("*"):
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
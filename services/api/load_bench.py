@@ -0,0 +1,113 @@
+"""
+Eagle Eye API - Load Benchmark
+Drives the database-backed endpoints of a running API with concurrent
+clients and reports requests/sec and latency percentiles per endpoint.
+
+Project ids are discovered through GET /projects, so the database needs a
+few projects (with findings and an estimate) first.
+
+Usage:
+    uvicorn main:app --workers 4 &
+    python load_bench.py --url http://localhost:8000 --concurrency 64 --duration 20
+    python load_bench.py --writes        # include POST /projects/{id}/findings
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+
+import httpx
+
+
+@dataclass
+class EndpointStats:
+    name: str
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+
+    def row(self, elapsed_s: float) -> str:
+        count = len(self.latencies_ms)
+        if not count:
+            return f"{self.name:<28} {'-':>9} {'-':>8} {'-':>8} {'-':>8} {self.errors:>7}"
+        ordered = sorted(self.latencies_ms)
+        p50 = statistics.median(ordered)
+        p95 = ordered[min(count - 1, int(count * 0.95))]
+        p99 = ordered[min(count - 1, int(count * 0.99))]
+        return (f"{self.name:<28} {count / elapsed_s:>9.1f} {p50:>8.1f} {p95:>8.1f} "
+                f"{p99:>8.1f} {self.errors:>7}")
+
+
+def sample_finding() -> Dict:
+    return {
+        "finding_code": "RR-999",
+        "severity": random.choice(["Red", "Orange", "Yellow"]),
+        "discipline": random.choice(["Structural", "Envelope", "MEP"]),
+        "location": "A1.04 / Detail 3",
+        "code_citation": "IRC 2018 R602.10",
+        "consequence": "Load benchmark",
+        "fix": "None - benchmark row",
+        "evidence_refs": ["A1.04"],
+    }
+
+
+def build_requests(project_ids: List[str], writes: bool) -> Dict[str, Callable]:
+    pick = lambda: random.choice(project_ids)
+    requests = {
+        "GET /projects": lambda c: c.get("/projects", params={"limit": 50}),
+        "GET /findings": lambda c: c.get(f"/projects/{pick()}/findings"),
+        "GET /findings?severity=Red": lambda c: c.get(f"/projects/{pick()}/findings",
+                                                     params={"severity": "Red"}),
+        "GET /estimate": lambda c: c.get(f"/projects/{pick()}/estimate"),
+    }
+    if writes:
+        requests["POST /findings"] = lambda c: c.post(f"/projects/{pick()}/findings", json=sample_finding())
+    return requests
+
+
+async def drive(client: httpx.AsyncClient, send: Callable, stats: EndpointStats, deadline: float):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await send(client)
+            # 404 is a valid answer (e.g. a project without an estimate)
+            if response.status_code >= 500 or response.status_code in (400, 422):
+                stats.errors += 1
+                continue
+        except httpx.HTTPError:
+            stats.errors += 1
+            continue
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+
+async def run(url: str, concurrency: int, duration: float, writes: bool):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        response = await client.get("/projects", params={"limit": 200})
+        response.raise_for_status()
+        project_ids = [p["id"] for p in response.json()]
+        if not project_ids:
+            raise SystemExit("No projects in the database - seed some before benchmarking")
+
+        print(f"{len(project_ids)} projects, {concurrency} concurrent clients, {duration:.0f}s per endpoint\n")
+        print(f"{'endpoint':<28} {'req/sec':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+
+        # One endpoint at a time, so each number is that endpoint's own throughput
+        for name, send in build_requests(project_ids, writes).items():
+            stats = EndpointStats(name)
+            started = time.perf_counter()
+            deadline = started + duration
+            await asyncio.gather(*(drive(client, send, stats, deadline) for _ in range(concurrency)))
+            print(stats.row(time.perf_counter() - started))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Requests/sec per database-backed endpoint")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per endpoint")
+    parser.add_argument("--writes", action="store_true", help="Also benchmark finding inserts")
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.duration, args.writes))
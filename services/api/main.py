@@ -1,9 +1,11 @@
 """
 Eagle Eye API - Main FastAPI application
 """
-from fastapi import FastAPI, UploadFile, Depends, HTTPException, File as FastAPIFile
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, Depends, HTTPException, Response, File as FastAPIFile
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional, Dict, Any
 from uuid import UUID, uuid4
 from datetime import datetime
@@ -15,10 +17,22 @@ import sys
 sys.path.append("../../packages/shared")
 from models import Project, Finding, Estimate, LineItem, File as FileModel
 
+from db import InvalidCursor, Repository, close_db, get_db, init_db
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the database pool on startup, drain it on shutdown"""
+    await init_db()
+    yield
+    await close_db()
+
+
 app = FastAPI(
     title="Eagle Eye API",
     description="Construction Plan Review & Pricing System",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -30,10 +44,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Database and S3 connections would be initialized here
-# from db import get_db, init_db
+# S3 connection would be initialized here
 # from storage import S3Client
 
+# Keyset pagination: the next page's cursor is returned in this header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# SQLSTATE of a foreign key violation (a finding for a missing project)
+FOREIGN_KEY_VIOLATION = "23503"
+
 # Pydantic models for API
 class ProjectCreate(BaseModel):
     account_id: Optional[UUID] = None
@@ -76,10 +95,21 @@ async def get_project(project_id: UUID):
 
 
 @app.get("/projects", response_model=List[Project])
-async def list_projects(account_id: Optional[UUID] = None, skip: int = 0, limit: int = 100):
-    """List all projects"""
-    # In production: query from database with filters
-    return []
+async def list_projects(
+    response: Response,
+    account_id: Optional[UUID] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    repo: Repository = Depends(get_db)
+):
+    """List projects, newest first (pass X-Next-Cursor back as ?cursor= for the next page)"""
+    try:
+        projects, next_cursor = await repo.list_projects(account_id=account_id, limit=limit, cursor=cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return projects
 
 
 # File uploads
@@ -134,22 +164,35 @@ async def run_pipeline(project_id: UUID, request: RunPipelineRequest):
 @app.get("/projects/{project_id}/findings", response_model=List[Finding])
 async def get_findings(
     project_id: UUID,
+    response: Response,
     severity: Optional[str] = None,
-    discipline: Optional[str] = None
+    discipline: Optional[str] = None,
+    limit: int = 500,
+    cursor: Optional[str] = None,
+    repo: Repository = Depends(get_db)
 ):
     """Get code compliance findings for a project"""
-    # In production: query from database with filters
-    return []
+    try:
+        findings, next_cursor = await repo.list_findings(
+            project_id, severity=severity, discipline=discipline, limit=limit, cursor=cursor
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return findings
 
 
 @app.post("/projects/{project_id}/findings", response_model=Finding)
-async def create_finding(project_id: UUID, finding: Finding):
+async def create_finding(project_id: UUID, finding: Finding, repo: Repository = Depends(get_db)):
     """Create a new finding"""
-    # In production: insert into database
-    finding.id = uuid4()
-    finding.project_id = project_id
-    finding.created_at = datetime.utcnow()
-    return finding
+    try:
+        return await repo.create_finding(project_id, finding)
+    except IntegrityError as e:
+        # Only a missing project is the caller's 404; other constraint failures are real errors
+        if getattr(e.orig, "sqlstate", None) != FOREIGN_KEY_VIOLATION:
+            raise
+        raise HTTPException(status_code=404, detail="Project not found")
 
 
 @app.patch("/projects/{project_id}/findings/{finding_id}")
@@ -161,10 +204,12 @@ async def update_finding(project_id: UUID, finding_id: UUID, updates: Dict[str,
 
 # Estimates
 @app.get("/projects/{project_id}/estimate", response_model=Estimate)
-async def get_estimate(project_id: UUID, version: Optional[int] = None):
-    """Get the pricing estimate for a project"""
-    # In production: query from database
-    raise HTTPException(status_code=404, detail="Estimate not found")
+async def get_estimate(project_id: UUID, version: Optional[int] = None, repo: Repository = Depends(get_db)):
+    """Get the pricing estimate for a project (latest version unless one is given)"""
+    estimate = await repo.get_estimate(project_id, version)
+    if estimate is None:
+        raise HTTPException(status_code=404, detail="Estimate not found")
+    return estimate
 
 
 @app.post("/projects/{project_id}/estimate", response_model=Estimate)
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# Modules import each other flat (from db import ...); models live in packages/shared
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SERVICE_DIR.parents[1] / "packages" / "shared"))
+sys.path.insert(0, str(SERVICE_DIR))
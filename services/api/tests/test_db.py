@@ -0,0 +1,159 @@
+import base64
+import itertools
+import re
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from db import (
+    InvalidCursor, _page, decode_cursor, encode_cursor, estimate_from_row,
+    list_findings_sql, list_projects_sql, project_from_row,
+)
+from models import Jurisdiction
+
+CREATED = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def sql(stmt):
+    return re.sub(r"\s+", " ", stmt.text).strip()
+
+
+def rows(count):
+    return [SimpleNamespace(id=uuid.uuid4(), created_at=CREATED + timedelta(seconds=i)) for i in range(count)]
+
+
+@pytest.mark.parametrize("created_at", [CREATED, CREATED.replace(tzinfo=None), datetime(2024, 1, 1)])
+def test_cursor_round_trips(created_at):
+    row_id = uuid.uuid4()
+    cursor = encode_cursor(created_at, row_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, row_id)
+
+
+def b64(raw):
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    b64(b"2024-05-01T12:30:15"),                     # no id
+    b64(b"yesterday|" + str(uuid.uuid4()).encode()),
+    b64(CREATED.isoformat().encode() + b"|not-a-uuid"),
+    b64(b"\xff\xfe|\xff"),                            # not UTF-8
+])
+def test_bad_cursors_are_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def test_invalid_cursor_is_a_value_error():
+    assert issubclass(InvalidCursor, ValueError)
+
+
+def test_short_page_has_no_cursor():
+    fetched = rows(3)
+    assert _page(fetched, 3) == (fetched, None)
+    assert _page([], 3) == ([], None)
+
+
+def test_extra_row_is_dropped_and_becomes_the_cursor_of_the_last_kept_row():
+    fetched = rows(4)
+    page, cursor = _page(fetched, 3)
+    assert page == fetched[:3]
+    assert decode_cursor(cursor) == (fetched[2].created_at, fetched[2].id)
+
+
+@pytest.mark.parametrize("by_account, after", list(itertools.product([False, True], repeat=2)))
+def test_list_projects_sql_per_filter_combination(by_account, after):
+    text = sql(list_projects_sql(by_account, after))
+    where = []
+    if by_account:
+        where.append("p.account_id = :account_id")
+    if after:
+        where.append("(p.created_at, p.id) < (:after_created_at, :after_id)")
+    if where:
+        assert "WHERE " + " AND ".join(where) + " ORDER BY" in text
+    else:
+        assert "WHERE" not in text
+    assert text.endswith("ORDER BY p.created_at DESC, p.id DESC LIMIT :limit")
+    assert "LEFT JOIN addresses a ON a.id = p.address_id" in text
+    assert "LEFT JOIN jurisdictions j ON j.id = p.jurisdiction_id" in text
+
+
+@pytest.mark.parametrize("by_severity, by_discipline, after", list(itertools.product([False, True], repeat=3)))
+def test_list_findings_sql_per_filter_combination(by_severity, by_discipline, after):
+    text = sql(list_findings_sql(by_severity, by_discipline, after))
+    where = ["project_id = :project_id"]
+    if by_severity:
+        where.append("severity = :severity")
+    if by_discipline:
+        where.append("discipline = :discipline")
+    if after:
+        where.append("(created_at, id) > (:after_created_at, :after_id)")
+    assert "WHERE " + " AND ".join(where) + " ORDER BY" in text
+    assert text.endswith("ORDER BY created_at, id LIMIT :limit")
+    assert "IS NULL" not in text
+
+
+def test_statements_are_built_once_per_combination():
+    assert list_projects_sql(True, False) is list_projects_sql(True, False)
+    assert list_findings_sql(True, False, True) is list_findings_sql(True, False, True)
+    texts = {list_findings_sql(*flags).text for flags in itertools.product([False, True], repeat=3)}
+    assert len(texts) == 8
+
+
+def project_row(**overrides):
+    row = dict(
+        id=uuid.uuid4(), account_id=uuid.uuid4(), name="Smith residence", scope="Renovation",
+        spec_tier="Premium", status="active", metadata={"source": "upload"},
+        created_at=CREATED, updated_at=CREATED + timedelta(hours=1),
+        address_street="12 Peachtree St", address_city="Atlanta", address_state="GA",
+        address_zip="30303", address_county="Fulton",
+        jurisdiction_state="GA", jurisdiction_county="Fulton",
+        jurisdiction_municipality="Atlanta", jurisdiction_code_set="IRC2018_IECC2015_NEC2017_GA",
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+def test_project_from_row_maps_address_and_jurisdiction():
+    row = project_row()
+    project = project_from_row(row)
+    assert (project.id, project.account_id, project.name) == (row.id, row.account_id, row.name)
+    assert (project.scope, project.spec_tier, project.status) == ("Renovation", "Premium", "active")
+    assert project.metadata == {"source": "upload"}
+    assert (project.created_at, project.updated_at) == (row.created_at, row.updated_at)
+    assert project.address_json == {
+        "line1": "12 Peachtree St", "city": "Atlanta", "state": "GA", "zip_code": "30303", "county": "Fulton",
+    }
+    assert project.jurisdiction == Jurisdiction(
+        state="GA", county="Fulton", municipality="Atlanta", code_set="IRC2018_IECC2015_NEC2017_GA",
+    )
+
+
+def test_project_from_row_without_joined_rows():
+    nulls = {name: None for name in vars(project_row()) if name.startswith(("address_", "jurisdiction_"))}
+    project = project_from_row(project_row(status=None, **nulls))
+    assert project.address_json is None
+    assert project.jurisdiction is None
+    assert project.status == "draft"
+
+
+def test_estimate_from_row():
+    row = SimpleNamespace(
+        id=uuid.uuid4(), project_id=uuid.uuid4(),
+        base={"Framing": [{"wbs": "06-100", "assembly": "Stud wall", "line_item": "2x4 studs", "uom": "LF",
+                            "qty": 10, "unit_cost": 2.5, "ext_cost": 25.0}]},
+        alternates=None, allowances={"Inspections/Testing": 500.0},
+        summary=None, version=3, created_at=CREATED, created_by="estimator@example.com",
+    )
+    estimate = estimate_from_row(row)
+    assert (estimate.id, estimate.project_id, estimate.version) == (row.id, row.project_id, 3)
+    assert estimate.base["Framing"][0].assembly == "Stud wall"
+    assert estimate.alternates == {}
+    assert estimate.allowances == {"Inspections/Testing": 500.0}
+    assert estimate.summary is None
+    assert (estimate.created_at, estimate.created_by) == (CREATED, "estimator@example.com")
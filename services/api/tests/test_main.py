@@ -0,0 +1,83 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
+
+import main
+from db import InvalidCursor, get_db
+
+FINDING = {
+    "finding_code": "RR-101",
+    "severity": "Red",
+    "discipline": "Structural",
+    "location": "S-201",
+    "code_citation": "IRC 2018 R602.10",
+    "consequence": "Failed framing inspection",
+    "fix": "Add braced wall panel",
+}
+
+
+def integrity_error(sqlstate):
+    return IntegrityError("INSERT INTO findings ...", {}, SimpleNamespace(sqlstate=sqlstate))
+
+
+class FakeRepository:
+    def __init__(self, error=None):
+        self.error = error
+
+    async def create_finding(self, project_id, finding):
+        if self.error is not None:
+            raise self.error
+        now = datetime(2024, 5, 1, tzinfo=timezone.utc)
+        return finding.model_copy(update={
+            "id": uuid.uuid4(), "project_id": project_id, "created_at": now, "updated_at": now,
+        })
+
+    async def list_projects(self, account_id=None, limit=100, cursor=None):
+        raise InvalidCursor(f"invalid cursor: {cursor!r}")
+
+    async def list_findings(self, project_id, severity=None, discipline=None, limit=500, cursor=None):
+        raise InvalidCursor(f"invalid cursor: {cursor!r}")
+
+
+@pytest.fixture
+def client_for():
+    # No `with`: the lifespan (and its Postgres pool) never starts
+    def build(repo):
+        main.app.dependency_overrides[get_db] = lambda: repo
+        return TestClient(main.app, raise_server_exceptions=False)
+    yield build
+    main.app.dependency_overrides.clear()
+
+
+def test_create_finding_returns_the_stored_row(client_for):
+    project_id = uuid.uuid4()
+    response = client_for(FakeRepository()).post(f"/projects/{project_id}/findings", json=FINDING)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["project_id"] == str(project_id)
+    assert body["finding_code"] == "RR-101" and body["id"]
+
+
+def test_finding_for_a_missing_project_is_404(client_for):
+    repo = FakeRepository(integrity_error(main.FOREIGN_KEY_VIOLATION))
+    response = client_for(repo).post(f"/projects/{uuid.uuid4()}/findings", json=FINDING)
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Project not found"}
+
+
+@pytest.mark.parametrize("sqlstate", ["23514", "23505", None])
+def test_other_integrity_errors_are_not_404(client_for, sqlstate):
+    repo = FakeRepository(integrity_error(sqlstate))
+    response = client_for(repo).post(f"/projects/{uuid.uuid4()}/findings", json=FINDING)
+    assert response.status_code == 500
+
+
+@pytest.mark.parametrize("path", ["/projects", f"/projects/{uuid.uuid4()}/findings"])
+def test_bad_cursor_is_400(client_for, path):
+    response = client_for(FakeRepository()).get(path, params={"cursor": "garbage"})
+    assert response.status_code == 400
+    assert "invalid cursor" in response.json()["detail"]
@@ -10,6 +10,8 @@ from pathlib import Path
 sys.path.append("../../packages/shared")
 from models import LineItem, Estimate, EstimateSummary
 
+from money import to_cents, to_cents_array, from_cents, pct_of, round_cents
+
 
 def load_tradebase_catalog(csv_path: str = "../../infra/seeds/tradebase/catalog.csv") -> pd.DataFrame:
     """Load the TradeBase pricing catalog"""
@@ -145,7 +147,7 @@ def calculate_line_items(
         
         # Apply regional factors
         adjusted_cost = base_unit_cost * factors.get("labor_idx", 1.0) * factors.get("material_idx", 1.0)
-        ext_cost = round(quantity * adjusted_cost, 2)
+        ext_cost = round_cents(quantity * adjusted_cost)
         
         line_items.append(LineItem(
             wbs=qty.get("wbs", "01.01"),
@@ -155,7 +157,7 @@ def calculate_line_items(
             qty=quantity,
             qty_confidence=qty.get("confidence", "Medium"),
             needs_rfi=qty.get("confidence") == "Low",
-            unit_cost=round(adjusted_cost, 2),
+            unit_cost=round_cents(adjusted_cost),
             ext_cost=ext_cost,
             trade=trade
         ))
@@ -163,6 +165,72 @@ def calculate_line_items(
     return line_items
 
 
+def price_quantities_vectorized(
+    quantities: List[Dict[str, Any]],
+    catalog: pd.DataFrame,
+    factors: Dict[str, float],
+    spec_tier: str = "Standard"
+) -> pd.DataFrame:
+    """
+    Vectorized equivalent of calculate_line_items.
+    Joins quantities against spec tier bundles and the catalog in one pass
+    and returns a DataFrame with LineItem columns, one row per quantity.
+    """
+    columns = ["wbs", "assembly", "line_item", "uom", "qty", "qty_confidence",
+               "needs_rfi", "unit_cost", "ext_cost", "notes", "alt_group", "trade"]
+    if not quantities:
+        return pd.DataFrame(columns=columns)
+    
+    df = pd.DataFrame(quantities)
+    defaults = {"trade": "General", "item": "Unknown", "category": None, "uom": "EA",
+                "quantity": 0, "wbs": "01.01", "assembly": None, "confidence": "Medium",
+                "notes": None, "alt_group": None}
+    for col, default in defaults.items():
+        if col not in df:
+            df[col] = default
+    df["trade"] = df["trade"].fillna("General")
+    df["item"] = df["item"].fillna("Unknown")
+    df["uom"] = df["uom"].fillna("EA")
+    df["quantity"] = df["quantity"].fillna(0)
+    df["wbs"] = df["wbs"].fillna("01.01")
+    df["assembly"] = df["assembly"].fillna(df["trade"])
+    
+    spec = pd.DataFrame([
+        {"category": category, "spec_item": d["item"], "spec_cost": d["unit_cost"], "spec_uom": d["uom"]}
+        for category, d in get_spec_tier_pricing(spec_tier).items()
+    ])
+    cat = catalog.drop_duplicates(["Trade", "Item"])[["Trade", "Item", "Unit Cost"]].rename(
+        columns={"Trade": "trade", "Item": "item", "Unit Cost": "catalog_cost"}
+    )
+    
+    df = df.merge(spec, on="category", how="left").merge(cat, on=["trade", "item"], how="left")
+    is_spec = df["spec_cost"].notna()
+    
+    base_unit_cost = df["spec_cost"].where(is_spec, df["catalog_cost"].fillna(100.00)).astype(float)
+    adjusted_cost = base_unit_cost * factors.get("labor_idx", 1.0) * factors.get("material_idx", 1.0)
+    
+    return pd.DataFrame({
+        "wbs": df["wbs"],
+        "assembly": df["assembly"],
+        "line_item": df["spec_item"].where(is_spec, df["item"]),
+        "uom": df["spec_uom"].where(is_spec, df["uom"]),
+        "qty": df["quantity"].astype(float),
+        "qty_confidence": df["confidence"].fillna("Medium"),
+        "needs_rfi": df["confidence"] == "Low",
+        "unit_cost": to_cents_array(adjusted_cost) / 100,
+        "ext_cost": to_cents_array(df["quantity"] * adjusted_cost) / 100,
+        # Free text carried through unchanged (missing -> None, not NaN)
+        "notes": df["notes"].astype(object).where(df["notes"].notna(), None),
+        "alt_group": df["alt_group"].astype(object).where(df["alt_group"].notna(), None),
+        "trade": df["trade"],
+    }, columns=columns)
+
+
+def frame_to_line_items(frame: pd.DataFrame) -> List[LineItem]:
+    """Convert a priced DataFrame back to LineItem models"""
+    return [LineItem(**row) for row in frame.to_dict("records")]
+
+
 def calculate_summary(
     line_items: List[LineItem],
     overhead_pct: float = 10.0,
@@ -170,25 +238,37 @@ def calculate_summary(
     contingency_pct: float = 5.0
 ) -> EstimateSummary:
     """Calculate estimate summary with O&P and contingency"""
-    subtotal = sum(item.ext_cost for item in line_items)
-    
-    overhead_amt = round(subtotal * (overhead_pct / 100), 2)
-    profit_amt = round(subtotal * (profit_pct / 100), 2)
-    total = subtotal + overhead_amt + profit_amt
+    subtotal_cents = sum(to_cents(item.ext_cost) for item in line_items)
+    return summarize_cents(subtotal_cents, overhead_pct, profit_pct, contingency_pct)
+
+
+def summarize_cents(
+    subtotal_cents: int,
+    overhead_pct: float = 10.0,
+    profit_pct: float = 10.0,
+    contingency_pct: float = 5.0
+) -> EstimateSummary:
+    """
+    Apply O&P and contingency in integer cents.
+    Every amount is rounded once, so total and grand_total carry no float drift.
+    """
+    overhead_cents = pct_of(subtotal_cents, overhead_pct)
+    profit_cents = pct_of(subtotal_cents, profit_pct)
+    total_cents = subtotal_cents + overhead_cents + profit_cents
     
-    contingency_amt = round(total * (contingency_pct / 100), 2)
-    grand_total = total + contingency_amt
+    contingency_cents = pct_of(total_cents, contingency_pct)
+    grand_total_cents = total_cents + contingency_cents
     
     return EstimateSummary(
-        subtotal=subtotal,
+        subtotal=from_cents(subtotal_cents),
         overhead_pct=overhead_pct,
         profit_pct=profit_pct,
-        overhead_amt=overhead_amt,
-        profit_amt=profit_amt,
-        total=total,
+        overhead_amt=from_cents(overhead_cents),
+        profit_amt=from_cents(profit_cents),
+        total=from_cents(total_cents),
         contingency_pct=contingency_pct,
-        contingency_amt=contingency_amt,
-        grand_total=grand_total
+        contingency_amt=from_cents(contingency_cents),
+        grand_total=from_cents(grand_total_cents)
     )
 
 
@@ -205,36 +285,35 @@ def create_estimate(
     """
     Create a complete estimate from quantities with regional and spec tier adjustments
     """
+    from line_item_store import LineItemStore  # imports this module
+    
     # Load catalog and factors
     catalog = load_tradebase_catalog()
     factors = load_regional_factors(region, cbsa_code, zip_code)
     
-    # Calculate line items with spec tier pricing
-    line_items = calculate_line_items(quantities, catalog, factors, spec_tier)
-    
-    # Group by trade
+    # Price into the columnar store; LineItem models are only built for the response
+    store = LineItemStore.from_quantities(quantities, catalog, factors, spec_tier)
+    return store.to_estimate(project_id, overhead_pct, profit_pct)
+
+
+def group_by_trade(line_items: List[LineItem]) -> Dict[str, List[LineItem]]:
+    """Group line items by trade, preserving input order within each trade"""
     base_items = {}
     for item in line_items:
         trade = item.trade or "General"
         if trade not in base_items:
             base_items[trade] = []
         base_items[trade].append(item)
-    
-    # Calculate summary
-    summary = calculate_summary(line_items, overhead_pct, profit_pct)
-    
-    return Estimate(
-        project_id=project_id,
-        base=base_items,
-        alternates={},
-        allowances={
-            "Permits": round(summary.subtotal * 0.02, 2),
-            "Testing & Inspections": 2500.00,
-            "Misc Materials": 1500.00
-        },
-        summary=summary,
-        version=1
-    )
+    return base_items
+
+
+def calculate_allowances(subtotal: float) -> Dict[str, float]:
+    """Standard allowances; permits scale with the subtotal"""
+    return {
+        "Permits": round(subtotal * 0.02, 2),
+        "Testing & Inspections": 2500.00,
+        "Misc Materials": 1500.00
+    }
 
 
 if __name__ == "__main__":
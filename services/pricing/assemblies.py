@@ -0,0 +1,337 @@
+"""
+Eagle Eye Pricing Engine - Assembly Explosion
+Expands Frappe Assembly records (apps/eagle_eye_estimator) into priced component lines
+
+Assembly Item qty_formula is the component quantity per ONE unit of the parent
+assembly. It may reference project parameters (wall_height, stud_spacing, ...)
+but not the parent quantity, so every assembly reduces to a fixed per-unit
+vector of leaf quantities. That vector and the resulting unit cost are
+memoized, and a whole takeoff is one cached walk of the assembly DAG.
+"""
+import ast
+import math
+import numbers
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+sys.path.append("../../packages/shared")
+from models import LineItem
+
+from app import load_tradebase_catalog, load_regional_factors, get_spec_tier_pricing
+from money import round_cents
+
+# Names a formula may call in addition to project parameters
+FORMULA_FUNCTIONS = {
+    "ceil": math.ceil,
+    "floor": math.floor,
+    "sqrt": math.sqrt,
+    "min": min,
+    "max": max,
+    "abs": abs,
+    "round": round,
+}
+
+# x ** n is allowed only for a literal n in [-MAX_EXPONENT, MAX_EXPONENT] and
+# without a nested power, so a formula can never build an enormous number
+MAX_EXPONENT = 10
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load, ast.Call,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd,
+)
+
+
+@dataclass(frozen=True)
+class CompiledFormula:
+    source: str
+    code: Any
+    names: Tuple[str, ...]
+
+    def evaluate(self, params: Dict[str, float]) -> float:
+        missing = [n for n in self.names if n not in params]
+        if missing:
+            raise ValueError(f"Formula '{self.source}' needs parameters: {', '.join(missing)}")
+        values = {n: params[n] for n in self.names}
+        if not all(_is_number(v) for v in values.values()):
+            raise ValueError(f"Formula '{self.source}' parameters must be numbers")
+        try:
+            return float(eval(self.code, {"__builtins__": {}, **FORMULA_FUNCTIONS}, values))
+        except (ArithmeticError, ValueError) as e:
+            # ZeroDivisionError, OverflowError (ceil(inf), 1e308 ** 2), sqrt of a negative
+            raise ValueError(f"Formula '{self.source}' could not be evaluated: {e}") from e
+
+
+_formula_cache: Dict[str, CompiledFormula] = {}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _check_power(node: ast.BinOp, source: str):
+    exponent = node.right
+    if isinstance(exponent, ast.UnaryOp) and isinstance(exponent.op, (ast.USub, ast.UAdd)):
+        exponent = exponent.operand
+    if not (isinstance(exponent, ast.Constant) and _is_number(exponent.value) and abs(exponent.value) <= MAX_EXPONENT):
+        raise ValueError(f"Exponent in formula '{source}' must be a number between -{MAX_EXPONENT} and {MAX_EXPONENT}")
+    if any(isinstance(n, ast.BinOp) and isinstance(n.op, ast.Pow) for n in ast.walk(node.left)):
+        raise ValueError(f"Nested powers are not allowed in formula '{source}'")
+
+
+def compile_formula(source: Optional[str]) -> CompiledFormula:
+    """
+    Parse and compile a quantity formula once; identical formula text is shared.
+    Only arithmetic, int/float literals, parameter names and FORMULA_FUNCTIONS are allowed;
+    powers are limited to small literal exponents (MAX_EXPONENT).
+    """
+    source = (source or "").strip() or "1"
+    cached = _formula_cache.get(source)
+    if cached:
+        return cached
+
+    tree = ast.parse(source, mode="eval")
+    names = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax in formula '{source}': {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not _is_number(node.value):
+            # A string or bytes literal would make 'x' * 9999999999 a 10 GB allocation
+            raise ValueError(f"Only numeric literals are allowed in formula '{source}'")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in FORMULA_FUNCTIONS):
+            raise ValueError(f"Unsupported function in formula '{source}'")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            _check_power(node, source)
+        if isinstance(node, ast.Name) and node.id not in FORMULA_FUNCTIONS:
+            names.add(node.id)
+
+    compiled = CompiledFormula(source, compile(tree, f"<formula {source}>", "eval"), tuple(sorted(names)))
+    _formula_cache[source] = compiled
+    return compiled
+
+
+@dataclass
+class AssemblyComponent:
+    item: str
+    description: str
+    qty_formula: CompiledFormula
+    wastage_pct: float = 0.0
+
+
+@dataclass
+class Assembly:
+    code: str
+    name: str
+    trade: str = "General"
+    unit: str = "EA"
+    formula: Optional[CompiledFormula] = None
+    items: List[AssemblyComponent] = field(default_factory=list)
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> "Assembly":
+        """Build from a Frappe Assembly doc (as_dict() or JSON export)"""
+        return cls(
+            code=record["code"],
+            name=record.get("name_en") or record["code"],
+            trade=record.get("trade") or "General",
+            unit=record.get("unit") or "EA",
+            formula=compile_formula(record["formula"]) if record.get("formula") else None,
+            items=[
+                AssemblyComponent(
+                    item=row["item"],
+                    description=row.get("description") or row["item"],
+                    qty_formula=compile_formula(row.get("qty_formula")),
+                    wastage_pct=float(row.get("wastage_pct") or 0),
+                )
+                for row in record.get("items", [])
+            ],
+        )
+
+
+# (item, description, trade) identifies a leaf component line
+LeafKey = Tuple[str, str, str]
+
+
+class AssemblyEngine:
+    """
+    Explodes assemblies into priced component lines.
+
+    Leaf pricing follows calculate_line_items: spec tier category first,
+    then the item rate table, then the TradeBase catalog by (trade,
+    description), then the $100 placeholder; regional labor and material
+    indices are applied on top.
+
+    Example:
+        engine = AssemblyEngine([frappe_doc.as_dict() for frappe_doc in docs])
+        lines = engine.explode_takeoff(
+            [{"assembly": "B2010-EXT-WALL", "qty": 2400}, ...],
+            params={"wall_height": 9, "stud_spacing": 16},
+            region="Atlanta_GA", tier="Premium",
+        )
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], rates: Dict[str, Dict[str, Any]] = None):
+        self.assemblies: Dict[str, Assembly] = {}
+        for record in records:
+            assembly = Assembly.from_record(record)
+            self.assemblies[assembly.code] = assembly
+        self.rates = rates or {}
+        self._order = self._topological_order()
+
+        self._leaf_memo: Dict[Tuple[str, tuple], Dict[LeafKey, float]] = {}
+        self._unit_cost_memo: Dict[Tuple[str, str, str, tuple], float] = {}
+        self._leaf_cost_memo: Dict[Tuple[LeafKey, str, str], Tuple[float, str]] = {}
+        self._catalog = None
+
+    def _children(self, assembly: Assembly) -> List[str]:
+        # The catalog importer mirrors every priced item as a one-line
+        # assembly whose only item is itself; that self-reference is a leaf.
+        return [
+            c.item for c in assembly.items
+            if c.item in self.assemblies and c.item != assembly.code
+        ]
+
+    def _topological_order(self) -> List[str]:
+        """Children before parents; raises ValueError on a cycle"""
+        order, state = [], {}
+
+        def visit(code, path):
+            if state.get(code) == "done":
+                return
+            if state.get(code) == "visiting":
+                raise ValueError(f"Assembly cycle: {' -> '.join(path + [code])}")
+            state[code] = "visiting"
+            for child in self._children(self.assemblies[code]):
+                visit(child, path + [code])
+            state[code] = "done"
+            order.append(code)
+
+        for code in self.assemblies:
+            visit(code, [])
+        return order
+
+    def leaf_quantities(self, code: str, params: Dict[str, float] = None) -> Dict[LeafKey, float]:
+        """Leaf component quantities (with wastage) per one unit of an assembly"""
+        params = params or {}
+        key = (code, tuple(sorted(params.items())))
+        memo = self._leaf_memo.get(key)
+        if memo is not None:
+            return memo
+
+        assembly = self.assemblies[code]
+        leaves: Dict[LeafKey, float] = {}
+        for component in assembly.items:
+            qty = component.qty_formula.evaluate(params) * (1 + component.wastage_pct / 100)
+            if component.item in self.assemblies and component.item != code:
+                for leaf, sub_qty in self.leaf_quantities(component.item, params).items():
+                    leaves[leaf] = leaves.get(leaf, 0.0) + qty * sub_qty
+            else:
+                leaf = (component.item, component.description, assembly.trade)
+                leaves[leaf] = leaves.get(leaf, 0.0) + qty
+
+        self._leaf_memo[key] = leaves
+        return leaves
+
+    def leaf_unit_cost(self, leaf: LeafKey, region: str, tier: str) -> Tuple[float, str]:
+        """Regionally adjusted (unit_cost, uom) for a leaf component"""
+        key = (leaf, region, tier)
+        memo = self._leaf_cost_memo.get(key)
+        if memo is not None:
+            return memo
+
+        item, description, trade = leaf
+        spec_pricing = get_spec_tier_pricing(tier)
+        if item in spec_pricing:
+            base_cost, uom = spec_pricing[item]["unit_cost"], spec_pricing[item]["uom"]
+        elif item in self.rates:
+            base_cost, uom = self.rates[item]["unit_cost"], self.rates[item].get("uom", "EA")
+        else:
+            if self._catalog is None:
+                self._catalog = load_tradebase_catalog()
+            match = self._catalog[(self._catalog["Trade"] == trade) & (self._catalog["Item"] == description)]
+            if not match.empty:
+                base_cost, uom = float(match.iloc[0]["Unit Cost"]), match.iloc[0]["UoM"]
+            else:
+                base_cost, uom = 100.00, "EA"
+
+        factors = load_regional_factors(region)
+        adjusted = base_cost * factors.get("labor_idx", 1.0) * factors.get("material_idx", 1.0)
+        self._leaf_cost_memo[key] = (adjusted, uom)
+        return adjusted, uom
+
+    def unit_cost(self, code: str, region: str = "Atlanta_GA", tier: str = "Standard",
+                  params: Dict[str, float] = None) -> float:
+        """Cost of one unit of an assembly, memoized per (assembly, region, tier, params)"""
+        params = params or {}
+        key = (code, region, tier, tuple(sorted(params.items())))
+        memo = self._unit_cost_memo.get(key)
+        if memo is None:
+            memo = sum(
+                qty * self.leaf_unit_cost(leaf, region, tier)[0]
+                for leaf, qty in self.leaf_quantities(code, params).items()
+            )
+            self._unit_cost_memo[key] = memo
+        return memo
+
+    def explode(self, code: str, qty: float = None, params: Dict[str, float] = None,
+                region: str = "Atlanta_GA", tier: str = "Standard") -> List[LineItem]:
+        """
+        Component lines for one assembly. When qty is omitted the assembly's
+        own Quantity Formula is evaluated against params.
+        """
+        params = params or {}
+        assembly = self.assemblies[code]
+        if qty is None:
+            if assembly.formula is None:
+                raise ValueError(f"Assembly {code} has no quantity formula; pass qty")
+            qty = assembly.formula.evaluate(params)
+
+        lines = []
+        for leaf, per_unit in self.leaf_quantities(code, params).items():
+            item, description, trade = leaf
+            unit_cost, uom = self.leaf_unit_cost(leaf, region, tier)
+            line_qty = round(per_unit * qty, 4)
+            lines.append(LineItem(
+                wbs=assembly.code,
+                assembly=assembly.name,
+                line_item=description,
+                uom=uom,
+                qty=line_qty,
+                unit_cost=round_cents(unit_cost),
+                ext_cost=round_cents(line_qty * unit_cost),
+                trade=trade,
+            ))
+        return lines
+
+    def explode_takeoff(self, takeoff: List[Dict[str, Any]], params: Dict[str, float] = None,
+                        region: str = "Atlanta_GA", tier: str = "Standard") -> List[LineItem]:
+        """Explode a list of {"assembly": code, "qty": optional} entries"""
+        lines = []
+        for entry in takeoff:
+            lines.extend(self.explode(entry["assembly"], entry.get("qty"), params, region, tier))
+        return lines
+
+
+if __name__ == "__main__":
+    # Example: exterior wall built from a framing sub-assembly
+    records = [
+        {"code": "B2010-STUD", "name_en": "2x6 Stud Wall Framing", "trade": "Framing", "unit": "SF",
+         "items": [
+             {"item": "STUD-2X6", "description": "2x6 Stud", "qty_formula": "12 / stud_spacing", "wastage_pct": 10},
+             {"item": "PLATE-2X6", "description": "2x6 Plate", "qty_formula": "3 / wall_height", "wastage_pct": 5},
+         ]},
+        {"code": "B2010-EXT-WALL", "name_en": "Exterior Wall", "trade": "Framing", "unit": "SF",
+         "formula": "perimeter * wall_height",
+         "items": [
+             {"item": "B2010-STUD", "qty_formula": "1"},
+             {"item": "SHEATHING", "description": "OSB Sheathing", "qty_formula": "1 / 32", "wastage_pct": 8},
+         ]},
+    ]
+    engine = AssemblyEngine(records, rates={"STUD-2X6": {"unit_cost": 6.25, "uom": "EA"},
+                                            "PLATE-2X6": {"unit_cost": 0.85, "uom": "LF"},
+                                            "SHEATHING": {"unit_cost": 18.50, "uom": "EA"}})
+    params = {"perimeter": 220, "wall_height": 9, "stud_spacing": 16}
+
+    for line in engine.explode("B2010-EXT-WALL", params=params):
+        print(f"  {line.line_item:<20} {line.qty:>10,.2f} {line.uom:<3} @ ${line.unit_cost:,.2f} = ${line.ext_cost:,.2f}")
+    print(f"Unit cost: ${engine.unit_cost('B2010-EXT-WALL', params=params):,.2f}/SF")
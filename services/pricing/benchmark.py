@@ -0,0 +1,156 @@
+"""
+Eagle Eye Pricing Engine - Benchmark Suite
+Times each pricing stage on synthetic estimates from 100 to 100k lines
+
+Usage:
+    python benchmark.py                                  # default sizes
+    python benchmark.py --sizes 100 1000 --repeat 5
+    python benchmark.py --output bench.json --compare bench_prev_release.json
+"""
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Callable
+
+from app import (
+    load_tradebase_catalog,
+    load_regional_factors,
+    get_spec_tier_pricing,
+    calculate_line_items,
+    calculate_summary,
+    create_estimate,
+    price_quantities_vectorized,
+)
+from line_item_store import LineItemStore
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+SPEC_TIERS = ["Standard", "Premium", "Luxury"]
+
+
+def generate_quantities(n_lines: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Synthetic takeoff: ~60% catalog lines (including misses that fall back to
+    the placeholder price) and ~40% spec tier finish categories.
+    """
+    rng = random.Random(seed)
+    catalog = load_tradebase_catalog()
+    catalog_rows = list(zip(catalog["Trade"], catalog["Item"], catalog["UoM"]))
+    catalog_rows.append(("Sitework", "Grading", "SF"))  # not in catalog
+    categories = sorted({c for tier in SPEC_TIERS for c in get_spec_tier_pricing(tier)})
+
+    quantities = []
+    for i in range(n_lines):
+        if rng.random() < 0.6:
+            trade, item, uom = rng.choice(catalog_rows)
+            category = None
+        else:
+            category = rng.choice(categories)
+            trade, item, uom = "Finishes", category, "EA"
+        quantities.append({
+            "wbs": f"{rng.randint(1, 16):02d}.{rng.randint(1, 20):02d}",
+            "trade": trade,
+            "item": item,
+            "category": category,
+            "uom": uom,
+            "quantity": round(rng.uniform(1, 5000), 2),
+            "assembly": trade,
+            "confidence": rng.choice(["High", "Medium", "Medium", "Low"]),
+        })
+    return quantities
+
+
+def _time_stage(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Best-of-N wall time, then one extra run under tracemalloc for peak memory"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"best_s": min(timings), "mean_s": sum(timings) / len(timings), "peak_mem_mb": peak / 1e6}
+
+
+def run_benchmarks(sizes: List[int], repeat: int = 3, spec_tier: str = "Premium") -> Dict[str, Any]:
+    catalog = load_tradebase_catalog()
+    factors = load_regional_factors(zip_code="30301")
+    project_id = uuid.uuid4()
+    results = []
+
+    for n in sizes:
+        quantities = generate_quantities(n)
+        line_items = calculate_line_items(quantities, catalog, factors, spec_tier)
+        # Large sizes are dominated by the scalar path; keep total runtime sane
+        stage_repeat = repeat if n <= 10_000 else 1
+
+        stages = {
+            "calculate_line_items": lambda: calculate_line_items(quantities, catalog, factors, spec_tier),
+            "calculate_summary": lambda: calculate_summary(line_items),
+            "create_estimate": lambda: create_estimate(project_id, quantities, zip_code="30301", spec_tier=spec_tier),
+            "price_quantities_vectorized": lambda: price_quantities_vectorized(quantities, catalog, factors, spec_tier),
+            "line_item_store": lambda: LineItemStore.from_quantities(quantities, catalog, factors, spec_tier).summary(),
+        }
+
+        for stage, fn in stages.items():
+            stats = _time_stage(fn, stage_repeat)
+            stats.update({
+                "stage": stage,
+                "lines": n,
+                "lines_per_sec": n / stats["best_s"] if stats["best_s"] else None,
+            })
+            results.append(stats)
+            print(f"  {stage:<28} {n:>7,} lines  {stats['best_s']*1000:>10.1f} ms  "
+                  f"{stats['lines_per_sec']:>12,.0f} lines/s  {stats['peak_mem_mb']:>8.1f} MB peak")
+
+    return {
+        "suite": "pricing",
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec_tier": spec_tier,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]):
+    """Print lines/sec change per (stage, size) against a previous results file"""
+    previous = {(r["stage"], r["lines"]): r for r in baseline.get("results", [])}
+    print("\nChange vs baseline (lines/sec):")
+    for r in current["results"]:
+        prev = previous.get((r["stage"], r["lines"]))
+        if not prev or not prev.get("lines_per_sec"):
+            continue
+        change = (r["lines_per_sec"] / prev["lines_per_sec"] - 1) * 100
+        print(f"  {r['stage']:<28} {r['lines']:>7,} lines  {change:+7.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pricing engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--spec-tier", default="Premium", choices=SPEC_TIERS)
+    parser.add_argument("--output", default="pricing_benchmark.json")
+    parser.add_argument("--compare", help="Previous results file to diff against")
+    args = parser.parse_args()
+
+    print("Eagle Eye Pricing Benchmark")
+    print("=" * 50)
+    report = run_benchmarks(args.sizes, args.repeat, args.spec_tier)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
@@ -14,8 +14,10 @@ QUICK START:
     upgraded_cost = developer_base.add_upgrade(solar)
 """
 
+import copy
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 from enum import Enum
 
 
@@ -78,6 +80,46 @@ WATER_USE_PER_SQFT = {
 }
 
 
+# Inputs that invalidate a cached summary when reassigned
+SUMMARY_INPUTS = ("building_type", "sqft", "zip_code", "pricing_tier", "upgrades")
+
+# Per-instance bookkeeping that a copy starts without
+_INSTANCE_STATE = ("_summary", "_listeners", "_batch_depth")
+
+
+class _TrackedList(list):
+    """List that calls on_change after every mutation (used for upgrades)"""
+
+    def __init__(self, items, on_change: Callable[[], None]):
+        super().__init__(items)
+        self._on_change = on_change
+
+
+def _notifying(name: str):
+    list_method = getattr(list, name)
+
+    def method(self, *args, **kwargs):
+        result = list_method(self, *args, **kwargs)
+        self._on_change()
+        return result
+
+    method.__name__ = name
+    return method
+
+
+for _name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse",
+              "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(_TrackedList, _name, _notifying(_name))
+del _name
+
+
+def _copy_summary(summary: Dict) -> Dict:
+    """Callers get their own copy, so mutating it can't corrupt the cache"""
+    result = {section: dict(values) for section, values in summary.items()}
+    result["upgrades"]["upgrades_list"] = list(result["upgrades"]["upgrades_list"])
+    return result
+
+
 @dataclass
 class DeveloperBase:
     """
@@ -95,6 +137,16 @@ class DeveloperBase:
         base.calculate_baseline()
         print(f"Base cost: ${base.baseline_cost:,.0f}")
         print(f"Annual energy: {base.baseline_energy_kwh:,.0f} kWh")
+    
+    get_summary() is cached and only recomputed after sqft, zip_code,
+    building_type, pricing_tier or the upgrades list change. UI layers can
+    subscribe() to receive each recomputed summary instead of polling:
+    
+        unsubscribe = base.subscribe(lambda summary: render(summary))
+        base.sqft = 5200          # recomputes once, pushes to subscribers
+        with base.batch_updates():
+            base.zip_code = "30303"
+            base.add_upgrade(solar)   # one push for both changes
     """
     
     building_type: str           # residential, commercial, etc.
@@ -117,13 +169,80 @@ class DeveloperBase:
         if self.upgrades is None:
             self.upgrades = []
     
+    def __setattr__(self, name, value):
+        if name == "upgrades" and value is not None:
+            if value is self.__dict__.get("upgrades"):
+                return  # `upgrades += [...]` rebinds the same list; the mutation already notified
+            if not (isinstance(value, _TrackedList) and value._on_change == self._invalidate):
+                # Plain lists and other instances' tracked lists get our own tracked copy
+                value = _TrackedList(value, self._invalidate)
+        object.__setattr__(self, name, value)
+        if name in SUMMARY_INPUTS:
+            if name == "zip_code":
+                self.__dict__["_regional_factor"] = None
+            self._invalidate()
+    
+    def __copy__(self) -> "DeveloperBase":
+        """Shallow copy with its own tracked upgrades list, no subscribers and no cached summary"""
+        new = object.__new__(type(self))
+        state = {k: v for k, v in self.__dict__.items() if k not in _INSTANCE_STATE}
+        new.__dict__.update(state)
+        if state.get("upgrades") is not None:
+            new.__dict__["upgrades"] = _TrackedList(state["upgrades"], new._invalidate)
+        return new
+    
+    def __deepcopy__(self, memo) -> "DeveloperBase":
+        new = object.__new__(type(self))
+        memo[id(self)] = new
+        for key, value in self.__dict__.items():
+            if key in _INSTANCE_STATE:
+                continue
+            if key == "upgrades" and value is not None:
+                value = _TrackedList(copy.deepcopy(list(value), memo), new._invalidate)
+            else:
+                value = copy.deepcopy(value, memo)
+            new.__dict__[key] = value
+        return new
+    
+    def _invalidate(self):
+        """Mark the cached summary dirty; push a fresh one if anyone is subscribed"""
+        state = self.__dict__
+        state["_summary"] = None
+        if state.get("_listeners") and not state.get("_batch_depth"):
+            self.get_summary()
+    
+    def subscribe(self, callback: Callable[[Dict], None]) -> Callable[[], None]:
+        """
+        Call `callback(summary)` whenever a change produces a new summary.
+        Returns a function that removes the subscription.
+        """
+        listeners = self.__dict__.setdefault("_listeners", [])
+        listeners.append(callback)
+        return lambda: listeners.remove(callback) if callback in listeners else None
+    
+    @contextmanager
+    def batch_updates(self):
+        """Defer recompute/notification until several changes are applied"""
+        state = self.__dict__
+        state["_batch_depth"] = state.get("_batch_depth", 0) + 1
+        try:
+            yield self
+        finally:
+            state["_batch_depth"] -= 1
+            if state["_batch_depth"] == 0 and state.get("_summary") is None and state.get("_listeners"):
+                self.get_summary()
+    
     @property
     def regional_factor(self) -> Dict:
-        """Get regional pricing factor for ZIP code"""
-        return REGIONAL_FACTORS.get(
-            self.zip_code,
-            {"labor": 1.0, "material": 1.0, "permit": 500}
-        )
+        """Get regional pricing factor for ZIP code (cached until zip_code changes)"""
+        factor = self.__dict__.get("_regional_factor")
+        if factor is None:
+            factor = REGIONAL_FACTORS.get(
+                self.zip_code,
+                {"labor": 1.0, "material": 1.0, "permit": 500}
+            )
+            self.__dict__["_regional_factor"] = factor
+        return factor
     
     @property
     def cost_per_sqft(self) -> float:
@@ -236,19 +355,33 @@ class DeveloperBase:
         """
         Get comprehensive summary of this project.
         
+        The result is cached; it is rebuilt only after an input in
+        SUMMARY_INPUTS changes, and each rebuild is pushed to subscribers.
+        Every caller and subscriber receives its own copy.
+        
         Returns:
             Dict with all key metrics
         """
         
-        # Calculate if not done
-        if self.baseline_cost == 0:
-            self.calculate_baseline()
-        if self.baseline_energy_kwh == 0:
-            self.calculate_baseline_energy()
-        if self.baseline_water_gal == 0:
-            self.calculate_baseline_water()
+        summary = self.__dict__.get("_summary")
+        if summary is not None:
+            return _copy_summary(summary)
+        
+        # Inputs changed (or first call): recompute baselines
+        self.calculate_baseline()
+        self.calculate_baseline_energy()
+        self.calculate_baseline_water()
         
-        return {
+        # One pass over the upgrades for cost, savings and names
+        upgrades_cost = 0
+        annual_savings = 0
+        names = []
+        for upgrade in self.upgrades:
+            upgrades_cost += upgrade.get("cost", 0)
+            annual_savings += upgrade.get("annual_savings", 0)
+            names.append(upgrade.get("name", "Unknown"))
+        
+        summary = {
             "project_info": {
                 "building_type": self.building_type,
                 "square_footage": self.sqft,
@@ -267,17 +400,22 @@ class DeveloperBase:
             },
             
             "upgrades": {
-                "count": len(self.upgrades),
-                "total_cost": sum(u.get("cost", 0) for u in self.upgrades),
-                "upgrades_list": [u.get("name", "Unknown") for u in self.upgrades],
+                "count": len(names),
+                "total_cost": upgrades_cost,
+                "upgrades_list": names,
             },
             
             "project_total": {
-                "cost": self.calculate_total_cost(),
-                "annual_savings": self.calculate_total_annual_savings(),
-                "payback_years": self.calculate_payback_period(),
+                "cost": self.baseline_cost + upgrades_cost,
+                "annual_savings": annual_savings,
+                "payback_years": upgrades_cost / annual_savings if annual_savings > 0 else float('inf'),
             },
         }
+        
+        self.__dict__["_summary"] = summary
+        for callback in list(self.__dict__.get("_listeners", [])):
+            callback(_copy_summary(summary))
+        return _copy_summary(summary)
     
     def calculate_payback_period(self) -> float:
         """Calculate simple payback period in years"""
@@ -0,0 +1,168 @@
+"""
+Eagle Eye - Developer Base Portfolio
+Services: pricing/developer_portfolio.py
+
+Columnar, vectorized version of DeveloperBase for screening land portfolios.
+Every row is computed with the same operations in the same order as the
+scalar class, so results match DeveloperBase exactly.
+
+QUICK START:
+    portfolio = DeveloperBasePortfolio(
+        building_type=["residential", "office"],
+        sqft=[5000, 42000],
+        zip_code=["30601", "30303"],
+        tier=["STANDARD", "PREMIUM"],
+    )
+    df = portfolio.evaluate()
+"""
+
+from typing import Dict, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from developer_base import (
+    PricingTier,
+    REGIONAL_FACTORS,
+    BASELINE_COST_BY_TYPE,
+    ENERGY_USE_PER_SQFT,
+    WATER_USE_PER_SQFT,
+    CO2_FACTOR,
+)
+
+# Same fallbacks DeveloperBase uses for unknown keys
+DEFAULT_REGION = {"city": "Unknown", "state": "XX", "labor": 1.0, "material": 1.0, "permit": 500}
+DEFAULT_COST_PER_SQFT = 100
+DEFAULT_ENERGY_PER_SQFT = 12
+DEFAULT_WATER_PER_SQFT = 10
+
+
+def _lookup(keys: np.ndarray, table: Dict, default, dtype=np.float64) -> np.ndarray:
+    """Map each key through a dict, doing one Python lookup per distinct key"""
+    uniques, inverse = np.unique(keys, return_inverse=True)
+    values = np.array([table.get(k, default) for k in uniques], dtype=dtype)
+    return values[inverse]
+
+
+def _tier_multiplier(tier: Union[PricingTier, str]) -> float:
+    if isinstance(tier, PricingTier):
+        return tier.value
+    return PricingTier[str(tier).upper()].value
+
+
+class DeveloperBasePortfolio:
+    """
+    Many DeveloperBase projects as parallel arrays.
+
+    Args:
+        building_type: building type per row (residential, office, ...)
+        sqft: square footage per row
+        zip_code: ZIP per row (regional factors)
+        tier: PricingTier or tier name per row, or a single value for all rows
+    """
+
+    def __init__(
+        self,
+        building_type: Sequence[str],
+        sqft: Sequence[int],
+        zip_code: Sequence[str],
+        tier: Union[Sequence, PricingTier, str] = PricingTier.STANDARD
+    ):
+        self.building_type = np.asarray(building_type, dtype=object)
+        self.sqft = np.asarray(sqft)
+        self.zip_code = np.asarray([str(z) for z in zip_code], dtype=object)
+
+        n = len(self.building_type)
+        if isinstance(tier, (PricingTier, str)):
+            tier = [tier] * n
+        tiers = list(tier)
+        self.tier_name = np.array(
+            [t.name if isinstance(t, PricingTier) else str(t).upper() for t in tiers], dtype=object
+        )
+        self.tier_multiplier = _lookup(
+            self.tier_name, {name: _tier_multiplier(name) for name in set(self.tier_name)}, 1.0
+        )
+
+        if not (len(self.sqft) == len(self.zip_code) == len(self.tier_name) == n):
+            raise ValueError("building_type, sqft, zip_code and tier must have the same length")
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DeveloperBasePortfolio":
+        """Build from a DataFrame with building_type, sqft, zip_code and optional tier columns"""
+        return cls(
+            df["building_type"].to_numpy(),
+            df["sqft"].to_numpy(),
+            df["zip_code"].to_numpy(),
+            df["tier"].to_numpy() if "tier" in df else PricingTier.STANDARD,
+        )
+
+    def __len__(self) -> int:
+        return len(self.building_type)
+
+    def evaluate(self) -> pd.DataFrame:
+        """
+        Baseline cost, energy, water and CO2 for every row.
+        Mirrors calculate_baseline, calculate_baseline_energy and
+        calculate_baseline_water (column names follow get_summary).
+        """
+        zips = self.zip_code
+        labor = _lookup(zips, {z: f["labor"] for z, f in REGIONAL_FACTORS.items()}, DEFAULT_REGION["labor"])
+        permit = _lookup(zips, {z: f.get("permit", 500) for z, f in REGIONAL_FACTORS.items()}, DEFAULT_REGION["permit"])
+        city = _lookup(zips, {z: f.get("city", "Unknown") for z, f in REGIONAL_FACTORS.items()}, DEFAULT_REGION["city"], object)
+        state = _lookup(zips, {z: f.get("state", "XX") for z, f in REGIONAL_FACTORS.items()}, DEFAULT_REGION["state"], object)
+
+        types = self.building_type
+        cost_per_sqft = _lookup(types, BASELINE_COST_BY_TYPE, DEFAULT_COST_PER_SQFT) * self.tier_multiplier
+        energy_per_sqft = _lookup(types, ENERGY_USE_PER_SQFT, DEFAULT_ENERGY_PER_SQFT)
+        water_per_sqft = _lookup(types, WATER_USE_PER_SQFT, DEFAULT_WATER_PER_SQFT)
+
+        sqft = self.sqft.astype(np.float64)
+        baseline_cost = sqft * cost_per_sqft * labor + permit
+        energy_kwh = sqft * energy_per_sqft
+        co2_tons = energy_kwh * CO2_FACTOR / 2000
+        water_gal = sqft * water_per_sqft
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            baseline_cost_per_sqft = baseline_cost / sqft
+
+        return pd.DataFrame({
+            "building_type": types,
+            "square_footage": self.sqft,
+            "location": zips,
+            "city": city,
+            "state": state,
+            "pricing_tier": self.tier_name,
+            "cost_per_sqft": cost_per_sqft,
+            "baseline_cost": baseline_cost,
+            "baseline_cost_per_sqft": baseline_cost_per_sqft,
+            "annual_energy_kwh": energy_kwh,
+            "annual_water_gallons": water_gal,
+            "annual_co2_tons": co2_tons,
+        })
+
+
+if __name__ == "__main__":
+    import time
+
+    from developer_base import DeveloperBase
+
+    rng = np.random.default_rng(7)
+    n = 5000
+    types = rng.choice(list(BASELINE_COST_BY_TYPE) + ["warehouse"], n)
+    sqft = rng.integers(1200, 250_000, n)
+    zips = rng.choice(list(REGIONAL_FACTORS) + ["99999"], n)
+    tiers = rng.choice([t.name for t in PricingTier], n)
+
+    start = time.perf_counter()
+    df = DeveloperBasePortfolio(types, sqft, zips, tiers).evaluate()
+    elapsed = time.perf_counter() - start
+    print(f"Evaluated {n:,} parcels in {elapsed*1000:.1f} ms")
+
+    # Spot-check against the scalar class
+    for i in range(0, n, 500):
+        base = DeveloperBase(types[i], int(sqft[i]), zips[i], PricingTier[tiers[i]])
+        assert base.calculate_baseline() == df.at[i, "baseline_cost"]
+        assert base.calculate_baseline_energy() == df.at[i, "annual_energy_kwh"]
+        assert base.baseline_co2_tons == df.at[i, "annual_co2_tons"]
+        assert base.calculate_baseline_water() == df.at[i, "annual_water_gallons"]
+    print(f"Total baseline cost: ${df['baseline_cost'].sum():,.0f}")
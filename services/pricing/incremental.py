@@ -0,0 +1,202 @@
+"""
+Eagle Eye Pricing Engine - Incremental Estimates
+Maintained per-trade subtotals so line-item edits cost O(changed items)
+"""
+import sys
+from typing import Dict, List, Optional
+
+sys.path.append("../../packages/shared")
+from models import LineItem, LineItemDiff, Estimate, EstimateDelta
+
+from app import summarize_cents, calculate_allowances
+from money import to_cents, from_cents, round_cents
+
+
+class IncrementalEstimate:
+    """
+    An estimate whose trade subtotals and summary are kept up to date as
+    line items change, instead of being rebuilt by create_estimate.
+
+    Every line gets a stable integer line_id (its position in the original
+    estimate, then increasing for added lines). Diffs reference line_ids.
+
+    Example:
+        live = IncrementalEstimate.from_estimate(create_estimate(pid, quantities))
+        delta = live.apply([LineItemDiff(line_id=42, qty=180)])
+        delta.summary.grand_total, delta.version
+    """
+
+    def __init__(
+        self,
+        line_items: List[LineItem],
+        project_id=None,
+        version: int = 1,
+        overhead_pct: float = 10.0,
+        profit_pct: float = 10.0,
+        contingency_pct: float = 5.0
+    ):
+        self.project_id = project_id
+        self.version = version
+        self.overhead_pct = overhead_pct
+        self.profit_pct = profit_pct
+        self.contingency_pct = contingency_pct
+
+        self._items: Dict[int, LineItem] = {}
+        self._trade_lines: Dict[str, Dict[int, None]] = {}  # ordered set per trade
+        self._trade_cents: Dict[str, int] = {}
+        self._subtotal_cents = 0
+        self._next_id = 0
+
+        for item in line_items:
+            self._insert(self._next_id, item)
+            self._next_id += 1
+
+        self.summary = summarize_cents(
+            self._subtotal_cents, overhead_pct, profit_pct, contingency_pct
+        )
+
+    @classmethod
+    def from_estimate(cls, estimate: Estimate) -> "IncrementalEstimate":
+        """Wrap an existing estimate, keeping its O&P percentages and version"""
+        line_items = [item for items in estimate.base.values() for item in items]
+        summary = estimate.summary
+        return cls(
+            line_items,
+            project_id=estimate.project_id,
+            version=estimate.version,
+            overhead_pct=summary.overhead_pct if summary else 10.0,
+            profit_pct=summary.profit_pct if summary else 10.0,
+            contingency_pct=summary.contingency_pct if summary else 5.0
+        )
+
+    @property
+    def line_ids(self) -> List[int]:
+        return list(self._items)
+
+    def get(self, line_id: int) -> Optional[LineItem]:
+        return self._items.get(line_id)
+
+    def trade_subtotal(self, trade: str) -> float:
+        return from_cents(self._trade_cents.get(trade, 0))
+
+    def _insert(self, line_id: int, item: LineItem):
+        trade = item.trade or "General"
+        cents = to_cents(item.ext_cost)
+        self._items[line_id] = item
+        self._trade_lines.setdefault(trade, {})[line_id] = None
+        self._trade_cents[trade] = self._trade_cents.get(trade, 0) + cents
+        self._subtotal_cents += cents
+
+    def _remove(self, line_id: int) -> str:
+        item = self._items.pop(line_id)
+        trade = item.trade or "General"
+        cents = to_cents(item.ext_cost)
+        del self._trade_lines[trade][line_id]
+        self._trade_cents[trade] -= cents
+        self._subtotal_cents -= cents
+        if not self._trade_lines[trade]:
+            del self._trade_lines[trade]
+            del self._trade_cents[trade]
+        return trade
+
+    def _replace(self, line_id: int, item: LineItem) -> List[str]:
+        """Swap a line in place (it keeps its position); returns the trades touched"""
+        old = self._items[line_id]
+        old_trade, trade = old.trade or "General", item.trade or "General"
+        if trade != old_trade:
+            # Moving to another trade appends it there
+            self._remove(line_id)
+            self._insert(line_id, item)
+            return [old_trade, trade]
+        cents = to_cents(item.ext_cost) - to_cents(old.ext_cost)
+        self._items[line_id] = item
+        self._trade_cents[trade] += cents
+        self._subtotal_cents += cents
+        return [trade]
+
+    def apply(self, diffs: List[LineItemDiff]) -> EstimateDelta:
+        """
+        Apply line-item diffs and return the versioned delta.
+
+        Unknown line_ids and unsupported ops raise ValueError before any
+        diff is applied, so a rejected batch leaves the estimate unchanged.
+        """
+        gone = set()
+        for diff in diffs:
+            if diff.op == "add":
+                if diff.item is None:
+                    raise ValueError("add diff requires item")
+            elif diff.op in ("update", "remove"):
+                if diff.line_id not in self._items or diff.line_id in gone:
+                    raise ValueError(f"Unknown line_id: {diff.line_id}")
+                if diff.op == "remove":
+                    gone.add(diff.line_id)
+            else:
+                raise ValueError(f"Unsupported diff op: {diff.op}")
+
+        updated: Dict[int, LineItem] = {}
+        removed: List[int] = []
+        touched_trades = set()
+
+        for diff in diffs:
+            if diff.op == "add":
+                line_id = self._next_id
+                self._next_id += 1
+                self._insert(line_id, diff.item)
+                touched_trades.add(diff.item.trade or "General")
+                updated[line_id] = diff.item
+                continue
+
+            line_id = diff.line_id
+            if diff.op == "remove":
+                touched_trades.add(self._remove(line_id))
+                updated.pop(line_id, None)
+                removed.append(line_id)
+                continue
+
+            current = self._items[line_id]
+            if diff.item is not None:
+                new_item = diff.item
+            else:
+                qty = current.qty if diff.qty is None else diff.qty
+                unit_cost = current.unit_cost if diff.unit_cost is None else diff.unit_cost
+                new_item = current.model_copy(update={
+                    "qty": qty,
+                    "unit_cost": round_cents(unit_cost),
+                    "ext_cost": round_cents(qty * unit_cost)
+                })
+
+            touched_trades.update(self._replace(line_id, new_item))
+            updated[line_id] = new_item
+
+        base_version = self.version
+        self.version += 1
+        self.summary = summarize_cents(
+            self._subtotal_cents, self.overhead_pct, self.profit_pct, self.contingency_pct
+        )
+
+        return EstimateDelta(
+            project_id=self.project_id,
+            base_version=base_version,
+            version=self.version,
+            updated=updated,
+            removed=removed,
+            trade_subtotals={trade: self.trade_subtotal(trade) for trade in touched_trades},
+            allowances=calculate_allowances(self.summary.subtotal),
+            summary=self.summary
+        )
+
+    def to_estimate(self) -> Estimate:
+        """Materialize the full Estimate (O(all items); use for saves, not edits)"""
+        base = {
+            trade: [self._items[line_id] for line_id in line_ids]
+            for trade, line_ids in self._trade_lines.items()
+        }
+        return Estimate(
+            project_id=self.project_id,
+            base=base,
+            alternates={},
+            allowances=calculate_allowances(self.summary.subtotal),
+            summary=self.summary,
+            version=self.version
+        )
@@ -0,0 +1,195 @@
+"""
+Eagle Eye Pricing Engine - Columnar Line Item Store
+Array-backed line items for the pricing hot path: int64 cents for money,
+categorical codes for text columns. Pydantic LineItem objects are only
+built at the API boundary via to_line_items() / to_estimate().
+"""
+import sys
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+sys.path.append("../../packages/shared")
+from models import LineItem, Estimate, EstimateSummary
+
+from app import price_quantities_vectorized, summarize_cents, calculate_allowances
+from money import from_cents
+
+# Text columns stored as (codes, categories) pairs
+CATEGORICAL_COLUMNS = ("wbs", "assembly", "line_item", "uom", "trade", "qty_confidence")
+# Free-text columns stored as object arrays (mostly None)
+TEXT_COLUMNS = ("notes", "alt_group")
+# Every LineItem field, in model order, so records match model_dump()
+_LINE_ITEM_DEFAULTS = {name: field.default for name, field in LineItem.model_fields.items()}
+
+
+class LineItemStore:
+    """
+    Columnar line items.
+
+    Each categorical column is an int32 code array indexing into a small
+    array of distinct values; unit and extended costs are int64 cents.
+
+    Example:
+        store = LineItemStore.from_quantities(quantities, catalog, factors, "Premium")
+        summary = store.summary()                  # exact cent arithmetic
+        estimate = store.to_estimate(project_id)   # LineItem models only for the API response
+        base = store.base_records()                # JSON line items without any models
+    """
+
+    def __init__(
+        self,
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, np.ndarray],
+        qty: np.ndarray,
+        unit_cost_cents: np.ndarray,
+        ext_cost_cents: np.ndarray,
+        needs_rfi: np.ndarray,
+        text: Optional[Dict[str, np.ndarray]] = None
+    ):
+        self.codes = codes
+        self.categories = categories
+        self.qty = qty
+        self.unit_cost_cents = unit_cost_cents
+        self.ext_cost_cents = ext_cost_cents
+        self.needs_rfi = needs_rfi
+        empty = np.full(len(qty), None, dtype=object)
+        self.text = {col: (text or {}).get(col, empty) for col in TEXT_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.qty)
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "LineItemStore":
+        """Build from a price_quantities_vectorized DataFrame"""
+        codes = {}
+        categories = {}
+        for col in CATEGORICAL_COLUMNS:
+            cat = pd.Categorical(frame[col])
+            codes[col] = cat.codes.astype(np.int32)
+            categories[col] = np.asarray(cat.categories, dtype=object)
+
+        # Frame money is already cent-rounded; rint removes float representation error
+        return cls(
+            codes=codes,
+            categories=categories,
+            qty=frame["qty"].to_numpy(dtype=np.float64),
+            unit_cost_cents=np.rint(frame["unit_cost"].to_numpy(dtype=np.float64) * 100).astype(np.int64),
+            ext_cost_cents=np.rint(frame["ext_cost"].to_numpy(dtype=np.float64) * 100).astype(np.int64),
+            needs_rfi=frame["needs_rfi"].to_numpy(dtype=bool),
+            text={col: frame[col].to_numpy(dtype=object) for col in TEXT_COLUMNS if col in frame},
+        )
+
+    @classmethod
+    def from_quantities(
+        cls,
+        quantities: List[Dict[str, Any]],
+        catalog: pd.DataFrame,
+        factors: Dict[str, float],
+        spec_tier: str = "Standard"
+    ) -> "LineItemStore":
+        return cls.from_frame(price_quantities_vectorized(quantities, catalog, factors, spec_tier))
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the store's arrays"""
+        total = self.qty.nbytes + self.unit_cost_cents.nbytes + self.ext_cost_cents.nbytes + self.needs_rfi.nbytes
+        for col in CATEGORICAL_COLUMNS:
+            total += self.codes[col].nbytes
+            total += sum(sys.getsizeof(v) for v in self.categories[col])
+        return total
+
+    def column(self, name: str) -> np.ndarray:
+        """Decoded values of a categorical column"""
+        return self.categories[name][self.codes[name]]
+
+    @property
+    def subtotal_cents(self) -> int:
+        return int(self.ext_cost_cents.sum())
+
+    def trade_subtotals_cents(self) -> Dict[str, int]:
+        """Extended cost per trade, in cents"""
+        trades = self.categories["trade"]
+        sums = np.zeros(len(trades), dtype=np.int64)
+        np.add.at(sums, self.codes["trade"], self.ext_cost_cents)
+        return {trades[i]: int(sums[i]) for i in range(len(trades))}
+
+    def summary(
+        self,
+        overhead_pct: float = 10.0,
+        profit_pct: float = 10.0,
+        contingency_pct: float = 5.0
+    ) -> EstimateSummary:
+        return summarize_cents(self.subtotal_cents, overhead_pct, profit_pct, contingency_pct)
+
+    def to_records(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Rows as plain dicts with every LineItem field, equal to
+        LineItem.model_dump(mode="json") but without building the models.
+        """
+        if rows is None:
+            rows = np.arange(len(self))
+        decoded = {col: self.column(col)[rows] for col in CATEGORICAL_COLUMNS}
+        text = {col: self.text[col][rows] for col in TEXT_COLUMNS}
+        qty = self.qty[rows]
+        unit_cost = self.unit_cost_cents[rows]
+        ext_cost = self.ext_cost_cents[rows]
+        needs_rfi = self.needs_rfi[rows]
+
+        return [
+            dict(
+                _LINE_ITEM_DEFAULTS,
+                wbs=decoded["wbs"][i],
+                assembly=decoded["assembly"][i],
+                line_item=decoded["line_item"][i],
+                uom=decoded["uom"][i],
+                qty=float(qty[i]),
+                qty_confidence=decoded["qty_confidence"][i],
+                needs_rfi=bool(needs_rfi[i]),
+                unit_cost=from_cents(int(unit_cost[i])),
+                ext_cost=from_cents(int(ext_cost[i])),
+                notes=text["notes"][i],
+                alt_group=text["alt_group"][i],
+                trade=decoded["trade"][i]
+            )
+            for i in range(len(rows))
+        ]
+
+    def to_line_items(self, rows: Optional[np.ndarray] = None) -> List[LineItem]:
+        """Materialize pydantic LineItems (all rows, or the given row indices)"""
+        return [LineItem(**record) for record in self.to_records(rows)]
+
+    def trade_rows(self) -> Dict[str, np.ndarray]:
+        """Row indices per trade, trades in first-seen order"""
+        trade_codes = self.codes["trade"]
+        _, first_seen = np.unique(trade_codes, return_index=True)
+        return {
+            self.categories["trade"][code]: np.flatnonzero(trade_codes == code)
+            for code in trade_codes[np.sort(first_seen)]
+        }
+
+    def base_records(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Estimate `base` as stored (trade -> JSON line items), without LineItem models"""
+        return {trade: self.to_records(rows) for trade, rows in self.trade_rows().items()}
+
+    def to_estimate(
+        self,
+        project_id=None,
+        overhead_pct: float = 10.0,
+        profit_pct: float = 10.0,
+        contingency_pct: float = 5.0,
+        version: int = 1
+    ) -> Estimate:
+        """Materialize the API Estimate, grouped by trade in first-seen order"""
+        base = {trade: self.to_line_items(rows) for trade, rows in self.trade_rows().items()}
+
+        summary = self.summary(overhead_pct, profit_pct, contingency_pct)
+        return Estimate(
+            project_id=project_id,
+            base=base,
+            alternates={},
+            allowances=calculate_allowances(summary.subtotal),
+            summary=summary,
+            version=version
+        )
@@ -0,0 +1,45 @@
+"""
+Eagle Eye Pricing Engine - Fixed-point money helpers
+All aggregation happens in integer cents; floats only appear at the edges.
+
+Every dollar amount is rounded to the cent half-up (away from zero) by
+to_cents / to_cents_array, so the row-by-row and vectorized pricing paths
+agree to the cent. The scaled value is first rounded to 6 places so float
+representation error (2.675 * 100 == 267.49999999999997) cannot flip a half.
+"""
+import math
+
+import numpy as np
+
+
+def to_cents(amount: float) -> int:
+    """Dollars to integer cents, rounded half-up"""
+    scaled = round(abs(amount) * 100, 6)
+    return int(math.copysign(math.floor(scaled + 0.5), amount))
+
+
+def to_cents_array(amounts: np.ndarray) -> np.ndarray:
+    """to_cents for a float array, as int64"""
+    amounts = np.asarray(amounts, dtype=np.float64)
+    scaled = np.round(np.abs(amounts) * 100, 6)
+    return (np.sign(amounts) * np.floor(scaled + 0.5)).astype(np.int64)
+
+
+def round_cents(amount: float) -> float:
+    """Dollars rounded half-up to the cent"""
+    return from_cents(to_cents(amount))
+
+
+def from_cents(cents: int) -> float:
+    """Integer cents to dollars"""
+    return cents / 100
+
+
+def pct_of(cents: int, pct: float) -> int:
+    """
+    Percentage of a cent amount, rounded half-up to the cent.
+    pct is resolved to hundredths of a percent (10.25% -> 1025 basis points).
+    """
+    basis_points = int(round(pct * 100))
+    sign = -1 if cents < 0 else 1
+    return sign * ((abs(cents) * basis_points + 5000) // 10000)
@@ -0,0 +1,43 @@
+import pytest
+
+from assemblies import compile_formula
+
+
+def test_arithmetic_and_parameters():
+    formula = compile_formula("ceil(wall_length * 12 / stud_spacing) + 1")
+    assert formula.names == ("stud_spacing", "wall_length")
+    assert formula.evaluate({"wall_length": 10, "stud_spacing": 16}) == 9.0
+
+
+def test_small_literal_powers_are_allowed():
+    assert compile_formula("side ** 2").evaluate({"side": 3}) == 9.0
+    assert compile_formula("2 ** -1").evaluate({}) == 0.5
+
+
+@pytest.mark.parametrize("source", [
+    "10**10**10",        # exponent is itself a power
+    "2 ** 11",           # literal too large
+    "2 ** n",            # exponent from a parameter
+    "(2 ** 10) ** 10",   # nested power in the base
+    "__import__('os')",
+    "x.y",
+    "'x' * 9999999999",  # string literal: huge allocation at evaluate time
+    "b'x' * 10",
+    "True + 1",
+    "None",
+])
+def test_unsafe_formulas_are_rejected(source):
+    with pytest.raises(ValueError):
+        compile_formula(source)
+
+
+@pytest.mark.parametrize("source, params", [
+    ("1 / n", {"n": 0}),
+    ("ceil(1e308 * 10)", {}),
+    ("1e308 ** 2", {}),
+    ("sqrt(n)", {"n": -1}),
+    ("n * 9999999999", {"n": "x"}),
+])
+def test_evaluation_errors_are_value_errors(source, params):
+    with pytest.raises(ValueError):
+        compile_formula(source).evaluate(params)
@@ -0,0 +1,66 @@
+import copy
+
+from developer_base import DeveloperBase, UPGRADE_CATALOG
+
+SOLAR = UPGRADE_CATALOG["SOLAR_ELECTRIC"][0]
+
+
+def test_summary_is_cached_until_an_input_changes():
+    base = DeveloperBase("residential", 5000, "30601")
+    first = base.get_summary()
+    assert base.__dict__["_summary"] is not None
+    base.sqft = 6000
+    assert base.__dict__["_summary"] is None
+    assert base.get_summary()["project_info"]["square_footage"] == 6000 != first["project_info"]["square_footage"]
+
+
+def test_mutating_a_returned_summary_does_not_touch_the_cache():
+    base = DeveloperBase("residential", 5000, "30601")
+    summary = base.get_summary()
+    summary["upgrades"]["count"] = 99
+    summary["upgrades"]["upgrades_list"].append("bogus")
+    assert base.get_summary()["upgrades"] == {"count": 0, "total_cost": 0, "upgrades_list": []}
+
+
+def test_subscribers_get_one_push_per_change():
+    base = DeveloperBase("residential", 5000, "30601")
+    pushed = []
+    unsubscribe = base.subscribe(pushed.append)
+
+    base.upgrades += [SOLAR]
+    assert len(pushed) == 1 and pushed[-1]["upgrades"]["count"] == 1
+
+    with base.batch_updates():
+        base.zip_code = "30303"
+        base.add_upgrade(SOLAR)
+    assert len(pushed) == 2 and pushed[-1]["project_info"]["city"] == "Atlanta"
+
+    unsubscribe()
+    base.sqft = 100
+    assert len(pushed) == 2
+
+
+def test_copies_track_their_own_upgrades_and_listeners():
+    for clone in (copy.copy, copy.deepcopy):
+        base = DeveloperBase("residential", 5000, "30601")
+        pushed = []
+        base.subscribe(pushed.append)
+        base.get_summary()
+        pushed.clear()
+
+        other = clone(base)
+        other.add_upgrade(SOLAR)
+
+        assert len(other.upgrades) == 1 and other.get_summary()["upgrades"]["count"] == 1
+        assert len(base.upgrades) == 0 and base.get_summary()["upgrades"]["count"] == 0
+        assert pushed == []
+
+
+def test_assigning_another_instances_list_does_not_alias_it():
+    a = DeveloperBase("residential", 5000, "30601")
+    b = DeveloperBase("residential", 5000, "30601")
+    a.add_upgrade(SOLAR)
+    b.upgrades = a.upgrades
+    b.get_summary()
+    a.add_upgrade(SOLAR)
+    assert b.get_summary()["upgrades"]["count"] == 1
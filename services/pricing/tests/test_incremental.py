@@ -0,0 +1,72 @@
+import pytest
+
+from app import calculate_line_items, calculate_summary, create_estimate, load_regional_factors, load_tradebase_catalog
+from incremental import IncrementalEstimate
+from uuid import uuid4
+from models import LineItem, LineItemDiff
+
+QUANTITIES = [
+    {"trade": "Concrete", "item": "Foundation", "uom": "LF", "quantity": 200},
+    {"trade": "Framing", "item": "Wall Framing", "uom": "SF", "quantity": 2400},
+    {"trade": "Drywall", "item": "Drywall Install", "uom": "SF", "quantity": 5200},
+    {"trade": "Electrical", "item": "Rough-in", "uom": "EA", "quantity": 1},
+]
+
+
+def full_summary(live: IncrementalEstimate):
+    items = [item for items in live.to_estimate().base.values() for item in items]
+    return calculate_summary(items, live.overhead_pct, live.profit_pct, live.contingency_pct)
+
+
+def test_initial_summary_matches_create_estimate():
+    estimate = create_estimate(uuid4(), QUANTITIES)
+    live = IncrementalEstimate.from_estimate(estimate)
+    assert live.summary == estimate.summary
+    assert live.trade_subtotal("Framing") == sum(i.ext_cost for i in estimate.base["Framing"])
+
+
+def test_apply_matches_full_recompute():
+    live = IncrementalEstimate.from_estimate(create_estimate(uuid4(), QUANTITIES))
+    added = LineItem(wbs="09.01", assembly="Paint", line_item="Interior Paint", uom="SF",
+                     qty=5200, unit_cost=1.35, ext_cost=7020.0, trade="Painting")
+    delta = live.apply([
+        LineItemDiff(line_id=1, qty=2600),
+        LineItemDiff(op="remove", line_id=3),
+        LineItemDiff(op="add", item=added),
+    ])
+
+    assert delta.base_version == 1 and delta.version == 2
+    assert delta.removed == [3]
+    assert set(delta.updated) == {1, 4}
+    assert set(delta.trade_subtotals) == {"Framing", "Electrical", "Painting"}
+    assert delta.summary == full_summary(live)
+    assert live.get(1).ext_cost == round(2600 * live.get(1).unit_cost, 2)
+
+
+def test_rejected_batch_leaves_estimate_unchanged():
+    live = IncrementalEstimate.from_estimate(create_estimate(uuid4(), QUANTITIES))
+    before = live.summary
+    with pytest.raises(ValueError):
+        live.apply([LineItemDiff(line_id=0, qty=1), LineItemDiff(line_id=99, qty=1)])
+    with pytest.raises(ValueError):
+        live.apply([LineItemDiff(op="remove", line_id=2), LineItemDiff(op="remove", line_id=2)])
+    assert live.summary == before
+    assert live.version == 1
+    assert live.get(0).qty == 200
+
+
+def test_updates_keep_line_and_trade_order():
+    live = IncrementalEstimate.from_estimate(create_estimate(uuid4(), QUANTITIES + [
+        {"trade": "Framing", "item": "Roof Framing", "uom": "SF", "quantity": 1800},
+    ]))
+    before = {trade: [i.line_item for i in items] for trade, items in live.to_estimate().base.items()}
+
+    live.apply([LineItemDiff(line_id=1, qty=2600)])                      # first of two Framing lines
+    live.apply([LineItemDiff(line_id=3, unit_cost=900.0)])               # Electrical's only line
+    live.apply([LineItemDiff(line_id=0, item=live.get(0).model_copy(update={"notes": "Per S1.01"}))])
+
+    after = live.to_estimate().base
+    assert {trade: [i.line_item for i in items] for trade, items in after.items()} == before
+    assert list(after) == list(before)
+    assert live.line_ids == [0, 1, 2, 3, 4]
+    assert live.summary == full_summary(live)
@@ -0,0 +1,111 @@
+import random
+
+from app import (
+    calculate_line_items, calculate_summary, create_estimate, group_by_trade, load_regional_factors,
+    load_tradebase_catalog, price_quantities_vectorized, frame_to_line_items,
+)
+from line_item_store import LineItemStore
+import numpy as np
+
+from money import pct_of, to_cents, to_cents_array
+from uuid import uuid4
+
+
+def sample_quantities(n=500, seed=7):
+    rng = random.Random(seed)
+    catalog = load_tradebase_catalog()
+    rows = list(catalog[["Trade", "Item"]].itertuples(index=False))
+    quantities = []
+    for i in range(n):
+        trade, item = rows[i % len(rows)]
+        quantities.append({
+            "wbs": f"{i % 20:02d}.01",
+            "trade": trade,
+            "item": item,
+            "category": "Windows" if i % 7 == 0 else None,
+            "quantity": round(rng.uniform(1, 5000), 2),
+            "confidence": "Low" if i % 11 == 0 else "Medium",
+        })
+    return quantities
+
+
+def test_vectorized_pricing_matches_row_by_row():
+    catalog, factors = load_tradebase_catalog(), load_regional_factors(zip_code="30301")
+    quantities = sample_quantities()
+    expected = calculate_line_items(quantities, catalog, factors, "Premium")
+    actual = frame_to_line_items(price_quantities_vectorized(quantities, catalog, factors, "Premium"))
+
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        assert (a.line_item, a.uom, a.trade, a.needs_rfi) == (e.line_item, e.uom, e.trade, e.needs_rfi)
+        assert (a.unit_cost, a.ext_cost) == (e.unit_cost, e.ext_cost)
+
+
+def test_money_rounds_half_up_in_both_paths():
+    assert [to_cents(v) for v in (2.675, 0.125, -0.125, 1.005, 0.0)] == [268, 13, -13, 101, 0]
+    rng = random.Random(3)
+    values = np.array([round(rng.uniform(-1000, 1000), 3) for _ in range(1000)] + [2.675, 0.125, -0.125])
+    assert to_cents_array(values).tolist() == [to_cents(v) for v in values]
+
+    # 0.00125 x $100.00 placeholder = 12.5 cents: Python round() and pandas .round(2) both give 12
+    quantities = [{"trade": "General", "item": "Not in catalog", "quantity": 0.00125}]
+    factors = {"labor_idx": 1.0, "material_idx": 1.0}
+    catalog = load_tradebase_catalog()
+    row = calculate_line_items(quantities, catalog, factors)[0]
+    vectorized = frame_to_line_items(price_quantities_vectorized(quantities, catalog, factors))[0]
+    assert row.ext_cost == vectorized.ext_cost == 0.13
+
+
+def test_store_summary_is_exact_cents():
+    catalog, factors = load_tradebase_catalog(), load_regional_factors()
+    store = LineItemStore.from_quantities(sample_quantities(), catalog, factors, "Standard")
+    items = store.to_line_items()
+
+    assert store.summary() == calculate_summary(items)
+    assert store.subtotal_cents == sum(to_cents(i.ext_cost) for i in items)
+    assert sum(store.trade_subtotals_cents().values()) == store.subtotal_cents
+
+
+def test_to_estimate_groups_by_trade_in_first_seen_order():
+    catalog, factors = load_tradebase_catalog(), load_regional_factors()
+    quantities = sample_quantities(n=12)
+    store = LineItemStore.from_quantities(quantities, catalog, factors)
+    estimate = store.to_estimate(project_id=uuid4())
+
+    assert list(estimate.base) == list(dict.fromkeys(q["trade"] for q in quantities))
+    assert sum(len(v) for v in estimate.base.values()) == 12
+    summary = estimate.summary
+    assert to_cents(summary.grand_total) == to_cents(summary.total) + to_cents(summary.contingency_amt)
+
+
+def test_pct_of_rounds_half_up():
+    assert pct_of(1005, 10.0) == 101  # 100.5 -> 101
+    assert pct_of(-1005, 10.0) == -101
+    assert pct_of(12345, 10.25) == 1265
+
+
+def test_records_match_line_item_dumps():
+    catalog, factors = load_tradebase_catalog(), load_regional_factors()
+    quantities = sample_quantities(n=30)
+    quantities[3]["notes"], quantities[5]["alt_group"] = "Per A2.01", "ALT-2"
+    store = LineItemStore.from_quantities(quantities, catalog, factors)
+
+    assert store.to_records() == [item.model_dump(mode="json") for item in store.to_line_items()]
+    assert (store.to_records()[3]["notes"], store.to_records()[5]["alt_group"]) == ("Per A2.01", "ALT-2")
+    assert store.to_records()[4]["notes"] is None
+
+
+def test_create_estimate_goes_through_the_store_and_matches_row_pricing():
+    quantities = sample_quantities(n=200)
+    estimate = create_estimate(uuid4(), quantities, spec_tier="Premium")
+
+    catalog, factors = load_tradebase_catalog(), load_regional_factors()
+    items = calculate_line_items(quantities, catalog, factors, "Premium")
+    expected = {t: [i.model_dump() for i in rows] for t, rows in group_by_trade(items).items()}
+    assert {t: [i.model_dump() for i in rows] for t, rows in estimate.base.items()} == expected
+    assert estimate.summary == calculate_summary(items)
+
+
+def test_create_estimate_with_no_quantities():
+    estimate = create_estimate(uuid4(), [])
+    assert estimate.base == {} and estimate.summary.grand_total == 0.0
@@ -0,0 +1,109 @@
+import json
+
+import reprice
+from app import calculate_allowances
+from reprice import RepriceJob, carry_allowances, estimate_to_quantities, reprice_row
+
+BASE = {
+    "Framing": [{"wbs": "06.01", "assembly": "Walls", "line_item": "Wall Framing", "uom": "SF", "qty": 2400,
+                 "unit_cost": 8.67, "ext_cost": 20808.0, "trade": "Framing", "notes": "Per A2.01",
+                 "alt_group": "ALT-2"}],
+    "Concrete": [{"wbs": "03.01", "assembly": "Foundation", "line_item": "Foundation", "uom": "LF", "qty": 200,
+                  "unit_cost": 45.9, "ext_cost": 9180.0, "trade": "Concrete"}],
+}
+
+
+def stored_row(project_id="p1", version=3, **overrides):
+    row = {
+        "project_id": project_id, "base": BASE, "version": version, "created_by": "estimator",
+        "alternates": {"ALT-1": [{"line_item": "Standing seam roof", "ext_cost": 12000}]},
+        "allowances": {"Permits": 1.0, "Owner Appliances": 8500.0},
+        "summary": {"grand_total": 35000.0, "overhead_pct": 12.0, "profit_pct": 8.0, "contingency_pct": 5.0},
+        "spec_tier": "Standard", "zip_code": None, "cbsa_code": None,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_reprice_row_carries_alternates_allowances_and_notes():
+    priced = reprice_row(stored_row())
+
+    assert priced["new_version"] == 4
+    assert priced["alternates"] == stored_row()["alternates"]
+    assert priced["allowances"]["Owner Appliances"] == 8500.0
+    assert priced["allowances"]["Permits"] == calculate_allowances(priced["summary"]["subtotal"])["Permits"]
+    framing = priced["base"]["Framing"][0]
+    assert (framing["notes"], framing["alt_group"]) == ("Per A2.01", "ALT-2")
+    assert priced["summary"]["overhead_pct"] == 12.0
+
+
+def test_carry_allowances_defaults_when_source_has_none():
+    assert carry_allowances(None, 10000.0) == calculate_allowances(10000.0)
+
+
+def test_estimate_to_quantities_round_trip_fields():
+    quantities = estimate_to_quantities(BASE)
+    assert [q["item"] for q in quantities] == ["Wall Framing", "Foundation"]
+    assert quantities[0]["notes"] == "Per A2.01" and quantities[1]["alt_group"] is None
+
+
+class InlinePool:
+    def map(self, fn, items, chunksize=1):
+        return map(fn, items)
+
+
+class FakeStore(RepriceJob):
+    """RepriceJob with the database replaced: `taken` versions belong to someone else"""
+
+    def __init__(self, taken, latest):
+        super().__init__(database_url="sqlite://", workers=1)
+        self.taken = taken  # project_id -> versions saved concurrently
+        self.latest = latest
+        self.written = []
+
+    def write_versions(self, priced, created_by):
+        ok = {p["project_id"] for p in priced if p["new_version"] not in self.taken.get(p["project_id"], ())}
+        self.written += [(p["project_id"], p["new_version"]) for p in priced if p["project_id"] in ok]
+        return ok
+
+    def load_latest(self, project_ids):
+        return [self.latest[pid] for pid in project_ids]
+
+
+def test_concurrent_save_is_retried_on_top_of_new_version():
+    job = FakeStore(taken={"p1": {4}}, latest={"p1": stored_row(version=4)})
+    written, conflicted = job.price_and_write(InlinePool(), [stored_row(), stored_row("p2")], "reprice:run")
+
+    assert conflicted == []
+    assert sorted(job.written) == [("p1", 5), ("p2", 4)]
+    assert {p["project_id"]: p["old_version"] for p in written} == {"p1": 4, "p2": 3}
+
+
+def test_project_still_changing_after_retries_is_reported():
+    job = FakeStore(taken={"p1": set(range(4, 20))}, latest={})
+    job.load_latest = lambda ids: [stored_row(version=3)]
+    written, conflicted = job.price_and_write(InlinePool(), [stored_row()], "reprice:run")
+
+    assert written == [] and conflicted == ["p1"]
+
+
+def test_checkpoint_appends_only_the_batch(tmp_path):
+    job = RepriceJob(database_url="sqlite://", workers=1, checkpoint_path=str(tmp_path / "cp.json"))
+    delta = reprice.ProjectDelta("p1", 3, 4, 2, 100.0, 110.0)
+    job._save_checkpoint({"run_id": "r", "after": "p1", "conflicts": []}, [delta])
+    job._save_checkpoint({"run_id": "r", "after": "p2", "conflicts": []}, [delta])
+    with open(job.deltas_path, "a") as f:
+        f.write('{"project_id": "torn')
+
+    assert len(job.deltas_path.read_text().splitlines()) == 3
+    assert [d.project_id for d in job._load_deltas()] == ["p1", "p1"]
+    assert json.loads(job.checkpoint_path.read_text())["after"] == "p2"
+
+
+def test_reprice_row_base_matches_line_item_pricing():
+    from app import frame_to_line_items, group_by_trade, load_regional_factors, load_tradebase_catalog, price_quantities_vectorized
+
+    quantities = estimate_to_quantities(BASE)
+    items = frame_to_line_items(price_quantities_vectorized(quantities, load_tradebase_catalog(), load_regional_factors()))
+    expected = {t: [i.model_dump(mode="json") for i in rows] for t, rows in group_by_trade(items).items()}
+    assert reprice_row(stored_row())["base"] == expected
@@ -0,0 +1,163 @@
+"""
+Eagle Eye - Upgrade Bundle Optimizer
+Services: pricing/upgrade_optimizer.py
+
+Picks the best combination of UPGRADE_CATALOG entries for a budget and/or a
+target payback, and returns the Pareto frontier of cost vs annual savings.
+
+Each catalog group (SOLAR_ELECTRIC, HVAC_EFFICIENCY, ...) is a
+choose-at-most-one set, so this is a multiple-choice knapsack. It is solved
+group by group, keeping only non-dominated (cost, savings) partial bundles
+and discarding any that exceed the budget, so work grows with the frontier
+size rather than 2^n.
+
+QUICK START:
+    result = optimize_upgrades(budget=30000, target_payback=10)
+    for upgrade in result.best.upgrades:
+        developer_base.add_upgrade(upgrade)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from developer_base import UPGRADE_CATALOG
+
+# Incentive fields subtracted from cost when include_incentives=True
+INCENTIVE_KEYS = ("federal_itc", "federal_credit")
+
+
+@dataclass
+class UpgradeBundle:
+    """One combination of upgrades and its economics"""
+    upgrades: List[Dict] = field(default_factory=list)
+    cost: float = 0.0
+    annual_savings: float = 0.0
+    npv: float = 0.0
+
+    @property
+    def ids(self) -> List[str]:
+        return [u.get("id", u.get("name", "Unknown")) for u in self.upgrades]
+
+    @property
+    def payback_years(self) -> float:
+        """Simple payback, same formula as DeveloperBase.calculate_payback_period"""
+        if self.annual_savings <= 0:
+            return float('inf')
+        return self.cost / self.annual_savings
+
+
+@dataclass
+class OptimizerResult:
+    best: Optional[UpgradeBundle]
+    frontier: List[UpgradeBundle]
+
+
+def annuity_factor(discount_rate: float, years: int) -> float:
+    """Present value of $1/year for `years` years"""
+    if discount_rate == 0:
+        return float(years)
+    return (1 - (1 + discount_rate) ** -years) / discount_rate
+
+
+def upgrade_cost(upgrade: Dict, include_incentives: bool = True) -> float:
+    cost = upgrade.get("cost", 0)
+    if include_incentives:
+        cost -= sum(upgrade.get(key, 0) for key in INCENTIVE_KEYS)
+    return cost
+
+
+def _pareto(states: List[Tuple[float, float, tuple]], resolution: float) -> List[Tuple[float, float, tuple]]:
+    """
+    Keep states not dominated in (lower cost, higher savings).
+    Costs within `resolution` dollars of each other share a bucket, which caps
+    the frontier size for very large catalogs.
+    """
+    states.sort(key=lambda s: (round(s[0] / resolution), -s[1]))
+    frontier = []
+    best_savings = float('-inf')
+    for state in states:
+        if state[1] > best_savings:
+            frontier.append(state)
+            best_savings = state[1]
+    return frontier
+
+
+def optimize_upgrades(
+    catalog: Dict[str, List[Dict]] = None,
+    budget: float = None,
+    target_payback: float = None,
+    discount_rate: float = 0.06,
+    horizon_years: int = 25,
+    include_incentives: bool = True,
+    resolution: float = 1.0
+) -> OptimizerResult:
+    """
+    Find the highest-NPV upgrade bundle.
+
+    Args:
+        catalog: {group: [upgrade, ...]}; at most one upgrade per group
+        budget: maximum bundle cost (None = unlimited)
+        target_payback: maximum simple payback in years (None = any)
+        discount_rate, horizon_years: NPV of annual savings
+        include_incentives: subtract federal_itc / federal_credit from cost
+        resolution: cost bucket size in dollars for frontier pruning
+
+    Returns:
+        OptimizerResult with the best feasible bundle (None if no non-empty
+        bundle meets the constraints) and the cost/savings Pareto frontier
+        within budget, sorted by cost.
+    """
+    catalog = UPGRADE_CATALOG if catalog is None else catalog
+    limit = float('inf') if budget is None else budget
+    factor = annuity_factor(discount_rate, horizon_years)
+
+    # (cost, savings, chosen) where chosen is a linked tuple (parent, upgrade)
+    states: List[Tuple[float, float, tuple]] = [(0.0, 0.0, ())]
+
+    for options in catalog.values():
+        priced = [(upgrade_cost(u, include_incentives), u.get("annual_savings", 0), u) for u in options]
+        candidates = list(states)
+        for cost, savings, chosen in states:
+            for option_cost, option_savings, upgrade in priced:
+                new_cost = cost + option_cost
+                if new_cost <= limit:
+                    candidates.append((new_cost, savings + option_savings, (chosen, upgrade)))
+        states = _pareto(candidates, resolution)
+
+    frontier = []
+    for cost, savings, chosen in states:
+        upgrades = []
+        while chosen:
+            chosen, upgrade = chosen
+            upgrades.append(upgrade)
+        frontier.append(UpgradeBundle(
+            upgrades=upgrades[::-1],
+            cost=cost,
+            annual_savings=savings,
+            npv=savings * factor - cost,
+        ))
+
+    feasible = [
+        b for b in frontier
+        if b.upgrades and (target_payback is None or b.payback_years <= target_payback)
+    ]
+    best = max(feasible, key=lambda b: (b.npv, -b.payback_years), default=None)
+
+    return OptimizerResult(best=best, frontier=frontier)
+
+
+if __name__ == "__main__":
+    print("Eagle Eye Upgrade Optimizer")
+    print("=" * 50)
+
+    result = optimize_upgrades(budget=30000, target_payback=10)
+
+    print("\nPareto frontier (cost vs annual savings):")
+    for bundle in result.frontier:
+        print(f"  ${bundle.cost:>9,.0f}  ${bundle.annual_savings:>7,.0f}/yr  "
+              f"NPV ${bundle.npv:>9,.0f}  {', '.join(bundle.ids) or '(none)'}")
+
+    if result.best:
+        print(f"\nBest bundle: {', '.join(result.best.ids)}")
+        print(f"  Cost: ${result.best.cost:,.0f}  Savings: ${result.best.annual_savings:,.0f}/yr")
+        print(f"  NPV: ${result.best.npv:,.0f}  Payback: {result.best.payback_years:.1f} years")
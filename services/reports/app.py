@@ -2,32 +2,155 @@
 Eagle Eye Reports Service
 Jinja2 → PDF/CSV rendering
 """
-from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, meta
 from pathlib import Path
 import csv
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
 from io import StringIO
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
+import weasyprint
+from fastapi import FastAPI
 
-def get_template_env() -> Environment:
-    """Get Jinja2 environment with templates"""
-    template_dir = Path("../../templates")
-    return Environment(loader=FileSystemLoader(str(template_dir)))
+from pdf_renderer import SHARED_CSS, get_pdf_renderer
+from render_cache import RenderCache, cache_key
+from sections import SectionRenderer
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(os.getenv("REPORTS_TEMPLATE_DIR", Path(__file__).resolve().parents[2] / "templates"))
+BYTECODE_CACHE_DIR = Path(os.getenv("REPORTS_BYTECODE_CACHE_DIR", "/tmp/eagle-eye/jinja-bytecode"))
+DEBUG = os.getenv("REPORTS_DEBUG", "").lower() in ("1", "true", "yes")
+RENDER_CACHE_DIR = Path(os.getenv("REPORTS_CACHE_DIR", "/tmp/eagle-eye/render-cache"))
+RENDER_CACHE_MAX_MB = int(os.getenv("REPORTS_CACHE_MAX_MB", "2048"))
+
+_template_env: Optional[Environment] = None
+_template_env_lock = threading.Lock()
 
+# template name -> SectionRenderer (fragment cache per template)
+_section_renderers: Dict[str, SectionRenderer] = {}
 
-def render_proposal_pdf(context: Dict[str, Any], output_path: str):
+# template name -> {"count", "render_s", "pdf_s", "max_s"}
+_render_timings: Dict[str, Dict[str, float]] = {}
+_render_timings_lock = threading.Lock()
+
+
+def get_template_env() -> Environment:
     """
-    Render Eagle Eye Proposal PDF
-    Sections: A-I (Executive, Risk, Code, Structural, Envelope, Estimate, Draw, Submittals, Appendix)
+    Process-wide Jinja2 environment. Templates are compiled once per process
+    (and their bytecode cached on disk across processes); templates are only
+    re-checked for changes on disk in debug mode.
     """
+    global _template_env
+    if _template_env is None:
+        with _template_env_lock:
+            if _template_env is None:
+                BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                _template_env = Environment(
+                    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+                    bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+                    auto_reload=DEBUG,
+                )
+    return _template_env
+
+
+def precompile_templates() -> List[str]:
+    """Compile every template up front (call at startup)"""
     env = get_template_env()
-    template = env.get_template("proposal.pdf.j2")
+    names = env.list_templates(extensions=["j2"])
+    for name in names:
+        env.get_template(name)
+    logger.info("Precompiled %d templates from %s", len(names), TEMPLATE_DIR)
+    return names
+
+
+def _record_timing(template_name: str, render_s: float, pdf_s: float = 0.0):
+    merge_timings({template_name: {"count": 1, "render_s": render_s, "pdf_s": pdf_s, "max_s": render_s + pdf_s}})
+
+
+def merge_timings(timings: Dict[str, Dict[str, float]]):
+    """Add raw timings (from take_timings() in another process) to this process's totals"""
+    with _render_timings_lock:
+        for name, t in timings.items():
+            stats = _render_timings.setdefault(name, {"count": 0, "render_s": 0.0, "pdf_s": 0.0, "max_s": 0.0})
+            stats["count"] += t["count"]
+            stats["render_s"] += t["render_s"]
+            stats["pdf_s"] += t["pdf_s"]
+            stats["max_s"] = max(stats["max_s"], t["max_s"])
+
+
+def take_timings() -> Dict[str, Dict[str, float]]:
+    """Raw timings recorded since the last call, reset (render pool workers hand them to the parent)"""
+    global _render_timings
+    with _render_timings_lock:
+        taken, _render_timings = _render_timings, {}
+    return taken
+
+
+def render_timings() -> Dict[str, Dict[str, float]]:
+    """Per-template mean/max timings in ms (Jinja render and PDF layout separately)"""
+    with _render_timings_lock:
+        snapshot = {name: dict(s) for name, s in _render_timings.items()}
+    return {
+        name: {
+            "count": s["count"],
+            "mean_render_ms": s["render_s"] / s["count"] * 1000,
+            "mean_pdf_ms": s["pdf_s"] / s["count"] * 1000,
+            "max_total_ms": s["max_s"] * 1000,
+        }
+        for name, s in snapshot.items()
+    }
+
+
+def render_pdf(template_name: str, context: Dict[str, Any], output_path: str):
+    """Render a template to HTML, lay it out with WeasyPrint, and time both steps"""
+    started = time.perf_counter()
+    html_content = get_template_env().get_template(template_name).render(**context)
+    rendered = time.perf_counter()
     
-    html_content = template.render(**context)
+    # Shared renderer: fonts, fetched assets and shared CSS are reused across renders
+    get_pdf_renderer(base_url=str(TEMPLATE_DIR) + "/").render(html_content, output_path)
     
-    # Generate PDF
-    HTML(string=html_content).write_pdf(output_path)
+    _record_timing(template_name, rendered - started, time.perf_counter() - rendered)
+
+
+def get_section_renderer(template_name: str) -> SectionRenderer:
+    renderer = _section_renderers.get(template_name)
+    if renderer is None:
+        renderer = _section_renderers.setdefault(template_name, SectionRenderer(get_template_env(), template_name))
+    return renderer
+
+
+def render_sections_pdf(template_name: str, context: Dict[str, Any], output_path: str) -> List[str]:
+    """
+    Like render_pdf, but the HTML is assembled from per-section fragments and
+    only sections whose inputs changed are re-rendered. Returns those sections.
+    """
+    started = time.perf_counter()
+    sections = get_section_renderer(template_name)
+    html_content = sections.render(context)
+    rendered = time.perf_counter()
+    
+    get_pdf_renderer(base_url=str(TEMPLATE_DIR) + "/").render(html_content, output_path)
+    
+    _record_timing(template_name, rendered - started, time.perf_counter() - rendered)
+    return sections.last_rendered
+
+
+def render_proposal_pdf(context: Dict[str, Any], output_path: str, template_name: str = "proposal.pdf.j2"):
+    """
+    Render Eagle Eye Proposal PDF
+    Sections: A-I (Executive, Risk, Code, Structural, Envelope, Estimate, Draw, Submittals, Appendix)
+    Each section is a cached fragment; a finding update re-renders only the
+    sections that display the changed attribute of that finding.
+    """
+    changed = render_sections_pdf(template_name, context, output_path)
+    logger.debug("%s: re-rendered %s", template_name, ", ".join(changed) or "no sections")
     
     print(f"Generated proposal PDF: {output_path}")
 
@@ -37,61 +160,102 @@ def render_lender_summary_pdf(context: Dict[str, Any], output_path: str):
     Render Lender Summary PDF
     Simplified view with totals, risk assessment, draw schedule
     """
-    env = get_template_env()
-    template = env.get_template("lender_summary.pdf.j2")
-    
-    html_content = template.render(**context)
-    HTML(string=html_content).write_pdf(output_path)
+    render_pdf("lender_summary.pdf.j2", context, output_path)
     
     print(f"Generated lender summary PDF: {output_path}")
 
 
-def render_xactimate_csv(line_items: List[Dict[str, Any]], output_path: str):
+XACTIMATE_HEADER = ('WBS', 'Assembly', 'Line Item', 'UoM', 'Qty', 'Unit Cost', 'Ext Cost', 'Notes', 'Alt Group')
+
+
+def xactimate_row(item: Dict[str, Any]) -> Tuple:
+    """One line item in XACTIMATE_HEADER column order"""
+    get = item.get
+    return (
+        get('wbs', ''),
+        get('assembly', ''),
+        get('line_item', ''),
+        get('uom', ''),
+        get('qty', 0),
+        f"{get('unit_cost', 0):.2f}",
+        f"{get('ext_cost', 0):.2f}",
+        get('notes', ''),
+        get('alt_group', ''),
+    )
+
+
+def iter_trade_line_items(trades: Dict[str, Iterable[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Line items of every trade in estimate["base"], without building a combined list"""
+    for items in trades.values():
+        yield from items
+
+
+def stream_xactimate_csv(line_items: Iterable[Dict[str, Any]], rows_per_chunk: int = 500) -> Iterator[str]:
+    """
+    Yield the CSV in text chunks: the header immediately, then every
+    `rows_per_chunk` rows. Memory stays flat regardless of estimate size.
+    
+    Example (FastAPI):
+        StreamingResponse(stream_xactimate_csv(items), media_type="text/csv")
+    """
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    
+    writer.writerow(XACTIMATE_HEADER)
+    yield buffer.getvalue()
+    
+    pending = 0
+    buffer.seek(0)
+    buffer.truncate()
+    for item in line_items:
+        writer.writerow(xactimate_row(item))
+        pending += 1
+        if pending == rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def render_xactimate_csv(line_items: Iterable[Dict[str, Any]], output_path: str):
     """
     Render Xactimate-compatible CSV
     Columns: WBS, Assembly, Line Item, UoM, Qty, Unit, Ext, Notes, Alt Group
+    line_items may be any iterable (e.g. iter_trade_line_items); rows are
+    written as they are produced.
     """
     with open(output_path, 'w', newline='') as csvfile:
-        fieldnames = ['WBS', 'Assembly', 'Line Item', 'UoM', 'Qty', 'Unit Cost', 'Ext Cost', 'Notes', 'Alt Group']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        for item in line_items:
-            writer.writerow({
-                'WBS': item.get('wbs', ''),
-                'Assembly': item.get('assembly', ''),
-                'Line Item': item.get('line_item', ''),
-                'UoM': item.get('uom', ''),
-                'Qty': item.get('qty', 0),
-                'Unit Cost': f"{item.get('unit_cost', 0):.2f}",
-                'Ext Cost': f"{item.get('ext_cost', 0):.2f}",
-                'Notes': item.get('notes', ''),
-                'Alt Group': item.get('alt_group', '')
-            })
+        writer = csv.writer(csvfile)
+        writer.writerow(XACTIMATE_HEADER)
+        writer.writerows(map(xactimate_row, line_items))
     
     print(f"Generated Xactimate CSV: {output_path}")
 
 
-def generate_all_reports(project_data: Dict[str, Any], output_dir: str):
+COMPANY = {
+    "name": "Eagle Eye AI",
+    "address": "Atlanta, GA",
+    "phone": "(555) 123-4567",
+    "email": "proposals@eagleeye.ai"
+}
+
+
+def report_documents(project_data: Dict[str, Any], output_dir: str) -> List[Tuple[str, Any, str]]:
     """
-    Generate all reports for a project
+    The documents in a project's report set, as (renderer, payload, output_path).
+    Each document is independent, so they can be rendered in any order or in parallel.
     """
     output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
     
     # Proposal PDF
     proposal_context = {
         "project": project_data.get("project", {}),
         "findings": project_data.get("findings", []),
         "estimate": project_data.get("estimate", {}),
-        "company": {
-            "name": "Eagle Eye AI",
-            "address": "Atlanta, GA",
-            "phone": "(555) 123-4567",
-            "email": "proposals@eagleeye.ai"
-        }
+        "company": COMPANY
     }
-    render_proposal_pdf(proposal_context, str(output_path / "proposal.pdf"))
     
     # Lender Summary
     lender_context = {
@@ -99,19 +263,160 @@ def generate_all_reports(project_data: Dict[str, Any], output_dir: str):
         "summary": project_data.get("estimate", {}).get("summary", {}),
         "risk_count": len([f for f in project_data.get("findings", []) if f.get("severity") == "Red"])
     }
-    render_lender_summary_pdf(lender_context, str(output_path / "lender_summary.pdf"))
     
-    # Xactimate CSV
-    line_items = []
-    estimate = project_data.get("estimate", {})
-    for trade, items in estimate.get("base", {}).items():
-        line_items.extend(items)
+    # Xactimate CSV: the trade -> items map itself; rows are streamed from it
+    trades = project_data.get("estimate", {}).get("base", {})
+    
+    return [
+        ("proposal_pdf", proposal_context, str(output_path / "proposal.pdf")),
+        ("lender_summary_pdf", lender_context, str(output_path / "lender_summary.pdf")),
+        ("xactimate_csv", trades, str(output_path / "xactimate.csv")),
+    ]
+
+
+RENDERERS = {
+    "proposal_pdf": render_proposal_pdf,
+    "lender_summary_pdf": render_lender_summary_pdf,
+    "xactimate_csv": lambda trades, path: render_xactimate_csv(iter_trade_line_items(trades), path),
+}
+
+
+# Template behind each PDF renderer; its source hash is part of the cache key
+RENDERER_TEMPLATES = {
+    "proposal_pdf": "proposal.pdf.j2",
+    "lender_summary_pdf": "lender_summary.pdf.j2",
+}
+
+# Bump when render_xactimate_csv output changes
+XACTIMATE_CSV_VERSION = "1"
+
+_render_cache: Optional[RenderCache] = None
+
+_template_hashes: Dict[str, str] = {}
+_asset_hash: Optional[str] = None
+
+# url(...) references in shared stylesheets (fonts, logos, backgrounds)
+_CSS_URL = re.compile(r"""url\(\s*['"]?([^'")]+?)['"]?\s*\)""")
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _template_tree_hash(template_name: str) -> str:
+    """Hash of a template and every template it extends, includes or imports"""
+    env = get_template_env()
+    digest = hashlib.sha256()
+    seen = set()
+    pending = [template_name]
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        source, _, _ = env.loader.get_source(env, name)
+        digest.update(f"{name}\0{source}\0".encode("utf-8"))
+        # None marks a dynamic reference; it can't be followed statically
+        pending.extend(sorted(n for n in meta.find_referenced_templates(env.parse(source)) if n))
+    return digest.hexdigest()
+
+
+def _render_assets_hash() -> str:
+    """
+    Everything besides the template that changes a rendered PDF: the shared
+    stylesheets, local files they url(), non-template files beside the
+    templates (logos, images, fonts) and the WeasyPrint version.
+    """
+    files = set()
+    for css in SHARED_CSS:
+        path = Path(css).resolve()
+        files.add(path)
+        for ref in _CSS_URL.findall(path.read_text(encoding="utf-8", errors="replace")):
+            if "://" not in ref and not ref.startswith("data:"):
+                files.add((path.parent / ref).resolve())
+    files.update(p.resolve() for p in TEMPLATE_DIR.rglob("*") if p.is_file() and p.suffix != ".j2")
+
+    digest = hashlib.sha256(f"weasyprint {weasyprint.__version__}\0".encode("utf-8"))
+    for path in sorted(files):
+        if path.is_file():
+            digest.update(f"{path.name}\0{_file_hash(path)}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def renderer_version(renderer: str) -> str:
+    """Template tree + assets + WeasyPrint hash (PDFs) or format version (CSV)"""
+    global _asset_hash
+    template_name = RENDERER_TEMPLATES.get(renderer)
+    if template_name is None:
+        return XACTIMATE_CSV_VERSION
+    if _asset_hash is None or DEBUG:
+        _asset_hash = _render_assets_hash()
+    if template_name not in _template_hashes or DEBUG:
+        _template_hashes[template_name] = _template_tree_hash(template_name)
+    return hashlib.sha256(f"{_template_hashes[template_name]}:{_asset_hash}".encode("utf-8")).hexdigest()
+
+
+def get_render_cache() -> RenderCache:
+    """Process-wide render cache (created on first use; the directory is shared by all workers)"""
+    global _render_cache
+    if _render_cache is None:
+        _render_cache = RenderCache(RENDER_CACHE_DIR, max_bytes=RENDER_CACHE_MAX_MB * 1024 * 1024)
+    return _render_cache
+
+
+def render_document(renderer: str, payload: Any, output_path: str, use_cache: bool = True) -> bool:
+    """
+    Render one document, serving it from the content-addressed cache when an
+    identical one (same data, template and branding) was rendered before.
+    Returns True on a cache hit.
+    """
+    if not use_cache:
+        RENDERERS[renderer](payload, output_path)
+        return False
+    
+    cache = get_render_cache()
+    key = cache_key(renderer, renderer_version(renderer), payload, COMPANY)
+    if cache.fetch(key, output_path):
+        return True
+    RENDERERS[renderer](payload, output_path)
+    cache.store(key, output_path)
+    return False
+
+
+def generate_all_reports(project_data: Dict[str, Any], output_dir: str):
+    """
+    Generate all reports for a project
+    (use render_pool.RenderPool to render many projects concurrently)
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
     
-    render_xactimate_csv(line_items, str(output_path / "xactimate.csv"))
+    for renderer, payload, output_path in report_documents(project_data, output_dir):
+        render_document(renderer, payload, output_path)
     
     print(f"\nAll reports generated in {output_dir}")
 
 
+app = FastAPI(title="Eagle Eye Reports")
+
+@app.on_event("startup")
+def warm_templates():
+    """Compile every template before the first request instead of on it"""
+    precompile_templates()
+
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+@app.get("/api/v1/render-stats")
+def render_stats():
+    """Per-template render timings (this process and its render pool workers) and render cache hit rate"""
+    return {"timings": render_timings(), "render_cache": get_render_cache().stats()}
+
+
 if __name__ == "__main__":
     # Example usage
     mock_project_data = {
@@ -141,4 +446,9 @@ if __name__ == "__main__":
         }
     }
     
+    precompile_templates()
     generate_all_reports(mock_project_data, "./output")
+    
+    for name, stats in render_timings().items():
+        print(f"{name}: {stats['mean_render_ms']:.1f} ms render, {stats['mean_pdf_ms']:.1f} ms PDF")
+    print(f"Render cache: {get_render_cache().stats()}")
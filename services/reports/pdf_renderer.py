@@ -0,0 +1,231 @@
+"""
+Eagle Eye Reports Service - Warm WeasyPrint Renderer
+A bare HTML(string=...).write_pdf() call rebuilds the font configuration,
+re-fetches every stylesheet/logo/web font and re-parses shared CSS on each
+render. PdfRenderer keeps all of that for the life of the process:
+
+- one FontConfiguration (fontconfig setup and @font-face downloads)
+- a byte-bounded cache in front of the URL fetcher (CSS, images, fonts);
+  entries older than REPORTS_FETCH_CACHE_TTL_S are fetched again, so an
+  updated logo or stylesheet is picked up without a restart
+- shared stylesheets parsed once and applied to every document
+- WeasyPrint's decoded-image cache shared across renders and replaced, never
+  pruned mid-render, once it is older than the fetch TTL or over its entry cap
+
+get_pdf_renderer keeps one renderer per base_url, all sharing the fetch cache.
+
+Benchmark:
+    python pdf_renderer.py --renders 20
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+from weasyprint.urls import default_url_fetcher
+
+# Comma-separated stylesheet paths applied to every document (branding, fonts)
+SHARED_CSS = [p for p in os.getenv("REPORTS_SHARED_CSS", "").split(",") if p]
+FETCH_CACHE_MAX_MB = int(os.getenv("REPORTS_FETCH_CACHE_MAX_MB", "64"))
+FETCH_CACHE_TTL_S = float(os.getenv("REPORTS_FETCH_CACHE_TTL_S", "300"))
+IMAGE_CACHE_MAX_ENTRIES = int(os.getenv("REPORTS_IMAGE_CACHE_MAX_ENTRIES", "256"))
+
+
+class CachingUrlFetcher:
+    """Memoizes default_url_fetcher results for ttl_s, least recently used evicted first"""
+
+    def __init__(self, max_bytes: int = FETCH_CACHE_MAX_MB * 1024 * 1024, ttl_s: float = FETCH_CACHE_TTL_S):
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._fetched_at: Dict[str, float] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+
+    def _drop(self, url: str):
+        old = self._entries.pop(url)
+        del self._fetched_at[url]
+        self._bytes -= len(old.get("string") or b"")
+
+    def __call__(self, url: str, *args, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            cached = self._entries.get(url)
+            if cached is not None and time.monotonic() - self._fetched_at[url] < self.ttl_s:
+                self._entries.move_to_end(url)
+                self.hits += 1
+                return dict(cached)
+            if cached is not None:
+                self._drop(url)
+                self.expired += 1
+            self.misses += 1
+
+        result = default_url_fetcher(url, *args, **kwargs)
+        if "file_obj" in result:
+            file_obj = result.pop("file_obj")
+            try:
+                result["string"] = file_obj.read()
+            finally:
+                file_obj.close()
+
+        size = len(result.get("string") or b"")
+        if size <= self.max_bytes:
+            with self._lock:
+                if url in self._entries:
+                    self._drop(url)  # fetched concurrently by another render
+                self._entries[url] = result
+                self._fetched_at[url] = time.monotonic()
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    self._drop(next(iter(self._entries)))
+        return dict(result)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+
+class ImageCache:
+    """
+    WeasyPrint's image cache, shared by renders one generation at a time.
+
+    write_pdf uses the dict it is given both for URL -> image and for each
+    image's bytes, which are only read back when the PDF is written, so no
+    entry may be evicted while a render holds the dict. Instead a render
+    that starts once the current dict is older than ttl_s or holds more than
+    max_entries gets a fresh one; renders still using the old dict keep it.
+    """
+
+    def __init__(self, max_entries: int = IMAGE_CACHE_MAX_ENTRIES, ttl_s: float = FETCH_CACHE_TTL_S):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._current: Dict[Any, Any] = {}
+        self._started = time.monotonic()
+        self.generations = 1
+
+    def for_render(self) -> Dict[Any, Any]:
+        with self._lock:
+            now = time.monotonic()
+            if len(self._current) > self.max_entries or now - self._started >= self.ttl_s:
+                self._current = {}
+                self._started = now
+                self.generations += 1
+            return self._current
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+
+class PdfRenderer:
+    """
+    Example:
+        renderer = PdfRenderer(shared_css=["templates/brand.css"], base_url="templates/")
+        renderer.render(html_content, "proposal.pdf")
+    """
+
+    def __init__(self, shared_css: Iterable[Union[str, Path]] = (), base_url: Optional[str] = None,
+                 fetcher: Optional[CachingUrlFetcher] = None):
+        self.base_url = base_url
+        self.font_config = FontConfiguration()
+        self.url_fetcher = fetcher or CachingUrlFetcher()
+        self.image_cache = ImageCache(ttl_s=self.url_fetcher.ttl_s)
+        self.stylesheets: List[CSS] = [
+            CSS(filename=str(path), font_config=self.font_config, url_fetcher=self.url_fetcher)
+            for path in shared_css
+        ]
+
+    def render(self, html_content: str, target=None, base_url: Optional[str] = None):
+        """Write a PDF to target (path or file object); returns bytes when target is None"""
+        document = HTML(string=html_content, base_url=base_url or self.base_url, url_fetcher=self.url_fetcher)
+        return document.write_pdf(
+            target,
+            stylesheets=self.stylesheets,
+            font_config=self.font_config,
+            cache=self.image_cache.for_render(),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {"fetch": self.url_fetcher.stats(), "images_cached": len(self.image_cache)}
+
+
+_renderers: Dict[Optional[str], PdfRenderer] = {}
+_renderers_lock = threading.Lock()
+_shared_fetcher: Optional[CachingUrlFetcher] = None
+
+
+def get_pdf_renderer(base_url: Optional[str] = None) -> PdfRenderer:
+    """Process-wide renderer for base_url (created on first use, then reused)"""
+    global _shared_fetcher
+    renderer = _renderers.get(base_url)
+    if renderer is None:
+        with _renderers_lock:
+            renderer = _renderers.get(base_url)
+            if renderer is None:
+                if _shared_fetcher is None:
+                    _shared_fetcher = CachingUrlFetcher()
+                renderer = PdfRenderer(shared_css=SHARED_CSS, base_url=base_url, fetcher=_shared_fetcher)
+                _renderers[base_url] = renderer
+    return renderer
+
+
+if __name__ == "__main__":
+    import argparse
+    import base64
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Cold vs warm WeasyPrint render time")
+    parser.add_argument("--renders", type=int, default=20)
+    args = parser.parse_args()
+
+    # A branded document: external stylesheet, logo and a body of tables
+    assets = Path(tempfile.mkdtemp(prefix="pdf-bench-"))
+    png = base64.b64decode(
+        "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+    )
+    (assets / "logo.png").write_bytes(png)
+    (assets / "brand.css").write_text(
+        "@page { size: letter; margin: 0.75in; @bottom-center { content: counter(page) } }\n"
+        "body { font-family: 'DejaVu Sans', Arial, sans-serif; font-size: 10pt; color: #222 }\n"
+        "h1 { color: #0b3d91; border-bottom: 2px solid #0b3d91 }\n"
+        "table { width: 100%; border-collapse: collapse } td, th { border: 1px solid #ccc; padding: 4px }\n"
+        ".logo { width: 120px; height: 40px; background: url(logo.png) no-repeat }\n"
+    )
+    rows = "".join(f"<tr><td>01.{i:02d}</td><td>Line item {i}</td><td>{i * 12.5:.2f}</td></tr>" for i in range(200))
+    page = (
+        "<html><head><link rel='stylesheet' href='brand.css'></head><body>"
+        "<div class='logo'></div><img src='logo.png' width='120'>"
+        f"<h1>Proposal</h1><table><tr><th>WBS</th><th>Item</th><th>Cost</th></tr>{rows}</table>"
+        "</body></html>"
+    )
+    base_url = str(assets) + "/"
+
+    def timed(fn) -> float:
+        started = time.perf_counter()
+        for _ in range(args.renders):
+            fn()
+        return (time.perf_counter() - started) / args.renders
+
+    cold = timed(lambda: HTML(string=page, base_url=base_url).write_pdf())
+    renderer = PdfRenderer(base_url=base_url)
+    renderer.render(page)  # warm-up
+    warm = timed(lambda: renderer.render(page))
+
+    print(f"cold (HTML().write_pdf): {cold * 1000:8.1f} ms/render")
+    print(f"warm (PdfRenderer):      {warm * 1000:8.1f} ms/render")
+    print(f"saved per render:        {(cold - warm) * 1000:8.1f} ms ({(1 - warm / cold) * 100:.0f}%)")
+    print(f"renderer stats: {renderer.stats()}")
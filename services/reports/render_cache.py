@@ -0,0 +1,199 @@
+"""
+Eagle Eye Reports Service - Content-Addressed Render Cache
+A rendered document is stored under the SHA-256 of
+    renderer + template version + canonical context + branding
+so downloading the same proposal again copies the stored file instead of
+re-running Jinja and WeasyPrint. Any change to the data, the template source
+or the company branding produces a new key.
+
+Files live on disk (two-level fan-out by key prefix) and are evicted least
+recently used first once the directory exceeds `max_bytes`. Hit/miss counts
+and the byte total are kept on disk beside them, so stats() covers every
+process sharing the directory (e.g. all RenderPool workers).
+"""
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Union
+
+# A .tmp file this old belongs to a writer that died mid-copy
+STALE_TMP_S = 3600
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if hasattr(value, "model_dump"):  # pydantic models
+        return value.model_dump()
+    return str(value)
+
+
+_CANONICAL = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=_json_default, ensure_ascii=False)
+
+
+def canonical_json(value: Any) -> str:
+    """Stable serialization: sorted keys, no whitespace, deterministic fallbacks"""
+    return _CANONICAL.encode(value)
+
+
+def cache_key(renderer: str, version: str, context: Any, branding: Optional[Dict[str, Any]] = None) -> str:
+    """
+    SHA-256 of the canonical JSON of every part. The context is hashed as the
+    encoder produces it, never held as one string, so keying a large payload
+    (a full trades dict for the Xactimate CSV) stays flat in memory.
+    """
+    digest = hashlib.sha256()
+    for part in (renderer, version):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    for value in (context, branding or {}):
+        for chunk in _CANONICAL.iterencode(value):
+            digest.update(chunk.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Example:
+        key = cache_key("proposal_pdf", template_hash, context, COMPANY)
+        if not cache.fetch(key, "out/proposal.pdf"):
+            render(...)
+            cache.store(key, "out/proposal.pdf")
+        cache.stats()  # {"hits": 12, "misses": 3, "hit_rate": 0.8, ...}
+
+    Several processes (render pool workers, API workers) share one directory,
+    so the size bound, byte total and hit/miss counters live on disk in
+    root/.usage, updated under an exclusive file lock. A store adds its size
+    to the running total; only when that exceeds max_bytes is the directory
+    scanned and the least recently used files (by mtime, touched on every
+    hit) removed, down to LOW_WATER of max_bytes so scans stay rare.
+    Nothing touches the disk until the first fetch or store.
+    """
+
+    LOW_WATER = 0.9
+
+    def __init__(self, root: Union[str, Path], max_bytes: int = 2 * 1024 ** 3):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    @contextmanager
+    def _usage(self) -> Iterator[Dict[str, int]]:
+        """
+        The shared usage record, exclusive across threads of this process and
+        every process sharing root; changes are written back on exit.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.root / ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    usage = json.loads((self.root / ".usage").read_text())
+                    before = dict(usage)
+                except (FileNotFoundError, ValueError):
+                    usage = {"hits": 0, "misses": 0, "evictions": 0}
+                    usage.update(self._scan())
+                    del usage["evicted"]
+                    before = None
+                yield usage
+                if usage != before:
+                    tmp = self.root / f".usage.{os.getpid()}.tmp"
+                    tmp.write_text(json.dumps(usage))
+                    tmp.replace(self.root / ".usage")
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _scan(self, target: Optional[int] = None, keep: Optional[str] = None) -> Dict[str, int]:
+        """Walk the directory, evicting oldest-first down to target bytes (never `keep`); call locked"""
+        now = time.time()
+        files = []
+        for path in self.root.glob("??/*"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue  # replaced or evicted mid-scan
+            if path.name.endswith(".tmp"):
+                # Left behind by a writer that died mid-copy
+                if now - st.st_mtime > STALE_TMP_S:
+                    path.unlink(missing_ok=True)
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        entries = len(files)
+        evicted = 0
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if target is None or total <= target:
+                break
+            if path.name == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            entries -= 1
+            evicted += 1
+        return {"bytes": total, "entries": entries, "evicted": evicted}
+
+    def fetch(self, key: str, output_path: Union[str, Path]) -> bool:
+        """Copy a cached document to output_path; False on a miss"""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, output_path)
+            os.utime(path)
+            hit = True
+        except FileNotFoundError:
+            # Never stored, or evicted by another process sharing the directory
+            hit = False
+        with self._usage() as usage:
+            usage["hits" if hit else "misses"] += 1
+        return hit
+
+    def store(self, key: str, source_path: Union[str, Path]):
+        """Add a freshly rendered document, evicting if the directory is now over max_bytes"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(source_path, tmp)
+        size = tmp.stat().st_size
+        with self._usage() as usage:
+            try:
+                replaced = path.stat().st_size  # stored concurrently by another render
+            except FileNotFoundError:
+                replaced = None
+            tmp.replace(path)
+            usage["bytes"] += size - (replaced or 0)
+            usage["entries"] += replaced is None
+            if usage["bytes"] > self.max_bytes:
+                scanned = self._scan(int(self.max_bytes * self.LOW_WATER), keep=key)
+                usage["evictions"] += scanned.pop("evicted")
+                usage.update(scanned)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters combined across every process sharing root"""
+        with self._usage() as usage:
+            stats = dict(usage)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+            "evictions": stats["evictions"],
+            "entries": stats["entries"],
+            "bytes": stats["bytes"],
+            "max_bytes": self.max_bytes,
+        }
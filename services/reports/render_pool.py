@@ -0,0 +1,202 @@
+"""
+Eagle Eye Reports Service - Parallel Render Pool
+WeasyPrint layout is CPU-bound and single-threaded, so report sets are
+rendered in a pool of worker processes, each with WeasyPrint imported and
+templates precompiled once at startup.
+
+- bounded queue: submit() blocks once `max_pending` documents are in flight
+- per-document timeout, enforced inside the worker (SIGALRM) and as a
+  backstop in the parent
+- render_batch(): N projects' report sets, with throughput reporting
+- workers' per-template render timings are merged into the parent process,
+  so app.render_timings() (and /api/v1/render-stats) covers every worker
+
+Usage:
+    with RenderPool(workers=4) as pool:
+        report = pool.render_batch([(project_data, "/out/proj-1"), ...])
+        print(report.summary())
+"""
+import os
+import signal
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RenderTimeout(Exception):
+    pass
+
+
+@dataclass
+class DocumentResult:
+    renderer: str
+    output_path: str
+    ok: bool
+    elapsed_s: float
+    error: Optional[str] = None
+    cached: bool = False
+    # Raw per-template timings the worker recorded for this document (app.take_timings)
+    timings: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+@dataclass
+class BatchReport:
+    projects: int
+    results: List[DocumentResult] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def failed(self) -> List[DocumentResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def documents_per_sec(self) -> float:
+        return len(self.results) / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def projects_per_sec(self) -> float:
+        return self.projects / self.elapsed_s if self.elapsed_s else 0.0
+
+    @property
+    def cache_hits(self) -> int:
+        return sum(1 for r in self.results if r.cached)
+
+    def summary(self) -> str:
+        return (
+            f"{self.projects} projects, {len(self.results)} documents "
+            f"({len(self.failed)} failed, {self.cache_hits} from cache) in {self.elapsed_s:.1f}s: "
+            f"{self.documents_per_sec:.2f} docs/sec, {self.projects_per_sec:.2f} projects/sec"
+        )
+
+
+def _init_worker():
+    """Warm each worker: import WeasyPrint and compile all templates once"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    import app  # noqa: F401 - imports weasyprint
+    app.precompile_templates()
+
+
+def _on_alarm(signum, frame):
+    raise RenderTimeout("render timed out")
+
+
+def _render_document(renderer: str, payload: Any, output_path: str, timeout_s: float) -> DocumentResult:
+    import app
+
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout_s)
+    started = time.perf_counter()
+    try:
+        cached = app.render_document(renderer, payload, output_path)
+        return DocumentResult(renderer, output_path, True, time.perf_counter() - started, cached=cached,
+                              timings=app.take_timings())
+    except Exception as e:
+        return DocumentResult(renderer, output_path, False, time.perf_counter() - started,
+                              f"{type(e).__name__}: {e}", timings=app.take_timings())
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class RenderPool:
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 timeout_s: float = 120.0):
+        self.workers = workers or os.cpu_count() or 2
+        self.max_pending = max_pending or self.workers * 4
+        self.timeout_s = timeout_s
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def submit(self, renderer: str, payload: Any, output_path: str) -> Future:
+        """Queue one document; blocks while the queue is full"""
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(_render_document, renderer, payload, output_path, self.timeout_s)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _result(self, future: Future, renderer: str, output_path: str) -> DocumentResult:
+        import app
+
+        # Backstop: the worker's own alarm should fire first
+        try:
+            result = future.result(timeout=self.timeout_s + 10)
+        except FutureTimeout:
+            return DocumentResult(renderer, output_path, False, self.timeout_s, "RenderTimeout: no result from worker")
+        except Exception as e:
+            return DocumentResult(renderer, output_path, False, 0.0, f"{type(e).__name__}: {e}")
+        # Workers' timings are combined in this process, where app.render_timings() reports them
+        app.merge_timings(result.timings)
+        return result
+
+    def render_project(self, project_data: Dict[str, Any], output_dir: str) -> List[DocumentResult]:
+        """One project's report set, documents rendered concurrently"""
+        return self.render_batch([(project_data, output_dir)]).results
+
+    def render_batch(self, projects: List[Tuple[Dict[str, Any], str]]) -> BatchReport:
+        """Render every document of every project; results keep submission order"""
+        import app
+
+        started = time.perf_counter()
+        submitted = []
+        for project_data, output_dir in projects:
+            for renderer, payload, output_path in app.report_documents(project_data, output_dir):
+                submitted.append((self.submit(renderer, payload, output_path), renderer, output_path))
+
+        report = BatchReport(projects=len(projects))
+        report.results = [self._result(future, renderer, path) for future, renderer, path in submitted]
+        report.elapsed_s = time.perf_counter() - started
+        return report
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "RenderPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import copy
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Render N sample report sets through the pool")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    sample = {
+        "project": {"name": "123 Main Street Renovation", "address": "123 Main St, Atlanta, GA 30301"},
+        "findings": [{"severity": "Red", "code_citation": "IRC 2018 R602.10",
+                      "impact": "Missing braced wall panels", "recommendation": "Add BWL per facade"}],
+        "estimate": {
+            "base": {"Concrete": [{"wbs": "01.01", "assembly": "Foundation", "line_item": "Foundation",
+                                   "uom": "LF", "qty": 200, "unit_cost": 45.00, "ext_cost": 9000.00}]},
+            "summary": {"subtotal": 50000.00, "grand_total": 60000.00},
+        },
+    }
+
+    out = Path(tempfile.mkdtemp(prefix="render-pool-"))
+    batch = []
+    for i in range(args.projects):
+        data = copy.deepcopy(sample)
+        data["project"]["name"] = f"Project {i + 1}"
+        batch.append((data, str(out / f"project-{i + 1}")))
+
+    with RenderPool(workers=args.workers, timeout_s=args.timeout) as pool:
+        report = pool.render_batch(batch)
+
+    print(report.summary())
+    for result in report.failed[:5]:
+        print(f"  {result.output_path}: {result.error}")
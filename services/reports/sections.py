@@ -0,0 +1,448 @@
+"""
+Eagle Eye Reports Service - Section-Level Rendering
+A long template is split into `{% block section_x %}` sections. Each section
+is rendered to its own HTML fragment, cached under a key built from only the
+context values that section reads, and the document is assembled from the
+fragments.
+
+Dependencies are found by walking each block's Jinja AST: every variable the
+block loads (minus loop/set variables it defines itself), narrowed to the
+attribute path when the block only reads e.g. `estimate.summary.grand_total`.
+Loops and selectattr/groupby are followed into the items, so a block keys on
+the finding attributes it actually shows (each finding's severity for the
+summary counts, only envelope findings' fix text for section E), and a change
+to one finding re-renders only the sections that display what changed.
+
+Usage:
+    sections = SectionRenderer(get_template_env(), "proposal_comprehensive.pdf.j2")
+    html = sections.render(context)
+    sections.last_rendered  # ["section_c"] after one finding's location changes
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from jinja2 import Environment, Template, nodes
+
+from render_cache import cache_key
+
+FRAGMENT_CACHE_MAX_MB = int(os.getenv("REPORTS_FRAGMENT_CACHE_MAX_MB", "256"))
+
+# Names a block can load that never come from the render context
+_BUILTIN_NAMES = {"loop", "self", "super", "caller", "varargs", "kwargs"}
+
+
+class FragmentCache:
+    """Rendered section HTML by key, least recently used evicted first"""
+
+    def __init__(self, max_bytes: int = FRAGMENT_CACHE_MAX_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return fragment
+
+    def put(self, key: str, fragment: str):
+        size = len(fragment)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = fragment
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+
+# ============================================================================
+# DEPENDENCY ANALYSIS
+# ============================================================================
+
+# A dependency is a path into the context. Besides attribute/key names it may
+# contain: ELEMENT (every item of a sequence: ("findings", ELEMENT, "severity")
+# is each finding's severity), LENGTH / TRUTH (only len() / bool() of a value is
+# read) and a _Select (the items a selectattr/rejectattr keeps).
+ELEMENT = "[]"
+LENGTH = "#"
+TRUTH = "?"
+
+# Filters whose result is the input sequence itself (as far as keying is concerned)
+_PASSTHROUGH_FILTERS = {"list", "reverse"}
+_LENGTH_FILTERS = {"length", "count"}
+_SELECT_FILTERS = {"selectattr", "rejectattr"}
+
+Path = Tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class _Select:
+    """findings|selectattr('discipline', 'in', [...]) with literal arguments"""
+    filter: str
+    args: Tuple[Any, ...]
+
+    def apply(self, value: Any, environment: Environment) -> List[Any]:
+        attr, test, test_args = self.args[0], (self.args[1:2] or (None,))[0], self.args[2:]
+        keep = self.filter == "selectattr"
+        selected = []
+        for item in _items(value):
+            attr_value = _lookup(item, attr)
+            passed = bool(attr_value) if test is None else environment.call_test(test, attr_value, test_args)
+            if bool(passed) == keep:
+                selected.append(item)
+        return selected
+
+    def __str__(self) -> str:
+        return f"{self.filter}({', '.join(map(repr, self.args))})"
+
+
+@dataclass(frozen=True)
+class _GroupBy:
+    """findings|groupby('discipline'): iterating yields (grouper, items of path)"""
+    path: Path
+    attr: str
+
+
+def _const(node: nodes.Node) -> bool:
+    return isinstance(node, nodes.Const) or (
+        isinstance(node, (nodes.List, nodes.Tuple)) and all(_const(item) for item in node.items)
+    )
+
+
+def _const_value(node: nodes.Node) -> Any:
+    if isinstance(node, nodes.Const):
+        return node.value
+    return tuple(_const_value(item) for item in node.items)
+
+
+def _target_names(target: nodes.Node) -> List[str]:
+    return [n.name for n in target.find_all(nodes.Name)] if not isinstance(target, nodes.Name) else [target.name]
+
+
+def _calls_self(node: nodes.Node) -> bool:
+    """{{ self.other_block() }}"""
+    return isinstance(node, nodes.Call) and isinstance(node.node, nodes.Getattr) \
+        and isinstance(node.node.node, nodes.Name) and node.node.node.name == "self"
+
+
+class _Dependencies:
+    """Walks one block, tracking which context paths local names stand for"""
+
+    def __init__(self, local: Set[str]):
+        self.local = local
+        self.paths: Set[Path] = set()
+
+    def add(self, value: Any):
+        if isinstance(value, _GroupBy):
+            self.paths.add(value.path)
+        elif value is not None:
+            self.paths.add(value)
+
+    # ---- expressions: return the path the value is, recording any other reads
+
+    def expr(self, node: nodes.Node, scope: Dict[str, Any]) -> Any:
+        if isinstance(node, nodes.Name):
+            if node.name in scope:
+                return scope[node.name]
+            return None if node.name in self.local else (node.name,)
+        if isinstance(node, nodes.Getattr):
+            return self._child(self.expr(node.node, scope), node.attr)
+        if isinstance(node, nodes.Getitem):
+            if isinstance(node.arg, nodes.Const) and isinstance(node.arg.value, str):
+                return self._child(self.expr(node.node, scope), node.arg.value)
+            self.add(self.expr(node.node, scope))
+            self.use(node.arg, scope)
+            return None
+        if isinstance(node, nodes.Filter) and node.node is not None:
+            return self._filter(node, scope)
+        if isinstance(node, nodes.Call) and _calls_self(node):
+            self.paths.add(())
+            return None
+        if isinstance(node, nodes.Call) and isinstance(node.node, nodes.Getattr):
+            # estimate.base.items() depends on estimate.base, not on a method
+            self.add(self.expr(node.node.node, scope))
+            for child in node.iter_child_nodes(exclude=("node",)):
+                self.use(child, scope)
+            return None
+        if isinstance(node, nodes.CondExpr):
+            self.test(node.test, scope)
+            self.use(node.expr1, scope)
+            if node.expr2 is not None:
+                self.use(node.expr2, scope)
+            return None
+        if isinstance(node, nodes.Not):
+            self.test(node.node, scope)
+            return None
+        self.visit(node, scope)
+        return None
+
+    def _child(self, base: Any, part: str) -> Any:
+        if isinstance(base, tuple):
+            return base + (part,)
+        self.add(base)
+        return None
+
+    def _filter(self, node: nodes.Filter, scope: Dict[str, Any]) -> Any:
+        base = self.expr(node.node, scope)
+        literal = all(_const(a) for a in node.args) and not (node.kwargs or node.dyn_args or node.dyn_kwargs)
+        if isinstance(base, tuple):
+            if node.name in _PASSTHROUGH_FILTERS and not node.args:
+                return base
+            if node.name in _LENGTH_FILTERS and not node.args:
+                return base + (LENGTH,)
+            if node.name in _SELECT_FILTERS and node.args and literal and isinstance(node.args[0].value, str):
+                self.add(base + (ELEMENT, node.args[0].value))
+                return base + (_Select(node.name, tuple(_const_value(a) for a in node.args)),)
+            if node.name == "groupby" and len(node.args) == 1 and literal and isinstance(node.args[0].value, str):
+                self.add(base + (ELEMENT, node.args[0].value))
+                return _GroupBy(base, node.args[0].value)
+        elif isinstance(base, _GroupBy) and node.name in _PASSTHROUGH_FILTERS and not node.args:
+            return base
+        self.add(base)
+        for child in node.iter_child_nodes(exclude=("node",)):
+            self.use(child, scope)
+        return None
+
+    def use(self, node: nodes.Node, scope: Dict[str, Any]):
+        self.add(self.expr(node, scope))
+
+    def test(self, node: nodes.Node, scope: Dict[str, Any]):
+        """A value only tested for truth: `if findings|selectattr(...)|list`"""
+        if isinstance(node, nodes.Not):
+            self.test(node.node, scope)
+        elif isinstance(node, (nodes.And, nodes.Or)):
+            self.test(node.left, scope)
+            self.test(node.right, scope)
+        else:
+            value = self.expr(node, scope)
+            self.add(value + (TRUTH,) if isinstance(value, tuple) else value)
+
+    # ---- statements
+
+    def visit(self, node: nodes.Node, scope: Dict[str, Any]):
+        if isinstance(node, (nodes.Include, nodes.Import, nodes.FromImport)) or _calls_self(node):
+            # The included template / other block sees the whole context
+            self.paths.add(())
+        if isinstance(node, nodes.For):
+            self._for(node, scope)
+        elif isinstance(node, nodes.If):
+            self.test(node.test, scope)
+            for child in node.body + node.elif_ + node.else_:
+                self.visit(child, scope)
+        elif isinstance(node, nodes.Assign):
+            value = self.expr(node.node, scope)
+            if isinstance(node.target, nodes.Name):
+                scope[node.target.name] = value
+            else:
+                self.add(value)
+                scope.update(dict.fromkeys(_target_names(node.target)))
+        elif isinstance(node, (nodes.AssignBlock, nodes.Macro, nodes.CallBlock, nodes.With)):
+            inner = dict(scope)
+            for name in node.find_all(nodes.Name):
+                if name.ctx in ("store", "param"):
+                    inner[name.name] = None
+            for child in node.iter_child_nodes():
+                self.visit(child, inner) if not isinstance(child, nodes.Expr) else self.use(child, inner)
+            if isinstance(node, nodes.AssignBlock):
+                scope.update(dict.fromkeys(_target_names(node.target)))
+        else:
+            for child in node.iter_child_nodes():
+                if isinstance(child, nodes.Expr):
+                    self.use(child, scope)
+                else:
+                    self.visit(child, scope)
+
+    def _for(self, node: nodes.For, scope: Dict[str, Any]):
+        source = self.expr(node.iter, scope)
+        inner = dict(scope, **dict.fromkeys(_target_names(node.target)))
+        inner["loop"] = None
+        if isinstance(source, tuple) and isinstance(node.target, nodes.Name):
+            inner[node.target.name] = source + (ELEMENT,)
+        elif isinstance(source, _GroupBy) and isinstance(node.target, nodes.Tuple) and len(node.target.items) == 2 \
+                and all(isinstance(t, nodes.Name) for t in node.target.items):
+            grouper, items = node.target.items
+            inner[grouper.name] = source.path + (ELEMENT, source.attr)
+            inner[items.name] = source.path
+        else:
+            self.add(source)
+        if node.test is not None:
+            self.test(node.test, inner)
+        for child in node.body:
+            self.visit(child, inner)
+        for child in node.else_:
+            self.visit(child, scope)
+
+
+def block_dependencies(environment: Environment, block: nodes.Block) -> List[Path]:
+    """
+    Context paths a block reads, with paths under an already-whole value
+    dropped. Loops are followed into their items, so a block that lists each
+    finding's code and severity depends on those two attributes of every
+    finding, not on the whole findings list.
+    """
+    walker = _Dependencies(_BUILTIN_NAMES | set(environment.globals))
+    scope: Dict[str, Any] = {}
+    for child in block.body:
+        walker.visit(child, scope)
+    paths = walker.paths
+    if () in paths:
+        return [()]
+    return sorted(
+        (path for path in paths if not any(path[:i] in paths for i in range(1, len(path)))),
+        key=lambda path: tuple(map(str, path)),
+    )
+
+
+def _lookup(value: Any, part: str) -> Any:
+    return value.get(part) if isinstance(value, dict) else getattr(value, part, None)
+
+
+def _items(value: Any) -> List[Any]:
+    try:
+        return list(value)
+    except TypeError:
+        return []
+
+
+def resolve_path(context: Dict[str, Any], path: Path, environment: Optional[Environment] = None) -> Any:
+    """The (projected) value of a dependency path, e.g. every finding's severity"""
+    if not path:
+        return context
+    return _resolve(context.get(path[0]), path[1:], environment or _DEFAULT_ENV)
+
+
+def _resolve(value: Any, parts: Path, environment: Environment) -> Any:
+    for i, part in enumerate(parts):
+        if value is None:
+            return None
+        if part == ELEMENT:
+            return [_resolve(item, parts[i + 1:], environment) for item in _items(value)]
+        if part == LENGTH:
+            value = len(_items(value))
+        elif part == TRUTH:
+            value = bool(value)
+        elif isinstance(part, _Select):
+            value = part.apply(value, environment)
+        else:
+            value = _lookup(value, part)
+    return value
+
+
+def path_label(path: Path) -> str:
+    return ".".join(map(str, path))
+
+
+_DEFAULT_ENV = Environment()
+
+
+# ============================================================================
+# RENDERER
+# ============================================================================
+
+def _fragment_func(fragment: str):
+    return lambda context: iter((fragment,))
+
+
+class SectionRenderer:
+    def __init__(self, environment: Environment, template_name: str,
+                 cache: Optional[FragmentCache] = None):
+        self.environment = environment
+        self.template_name = template_name
+        self.cache = cache or FragmentCache()
+        self.last_rendered: List[str] = []
+        self.rendered = 0
+        self.reused = 0
+        self._template: Optional[Template] = None
+        self._version = ""
+        self._dependencies: Dict[str, List[Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Template:
+        """(Re)analyse the template whenever the environment hands back a new one"""
+        template = self.environment.get_template(self.template_name)
+        if template is self._template:
+            return template
+        with self._lock:
+            if template is not self._template:
+                source, _, _ = self.environment.loader.get_source(self.environment, self.template_name)
+                ast = self.environment.parse(source)
+                self._dependencies = {
+                    block.name: block_dependencies(self.environment, block)
+                    for block in ast.find_all(nodes.Block)
+                }
+                self._version = hashlib.sha256(source.encode("utf-8")).hexdigest()
+                self._template = template
+        return template
+
+    def dependencies(self) -> Dict[str, List[str]]:
+        """Section -> dotted context paths it is keyed on"""
+        self._load()
+        return {name: [path_label(path) for path in paths] for name, paths in self._dependencies.items()}
+
+    def section_key(self, name: str, context: Dict[str, Any]) -> str:
+        inputs = {path_label(path): resolve_path(context, path, self.environment) for path in self._dependencies[name]}
+        return cache_key(f"section:{self.template_name}:{name}", self._version, inputs)
+
+    def render_section(self, template: Template, name: str, context: Dict[str, Any]) -> str:
+        return self.environment.concat(template.blocks[name](template.new_context(context)))
+
+    def fragments(self, context: Dict[str, Any]) -> Iterator[Tuple[str, str, bool]]:
+        """(section, html, reused) for every section, rendering only the ones not cached"""
+        template = self._load()
+        for name in template.blocks:
+            key = self.section_key(name, context)
+            fragment = self.cache.get(key)
+            reused = fragment is not None
+            if not reused:
+                fragment = self.render_section(template, name, context)
+                self.cache.put(key, fragment)
+            yield name, fragment, reused
+
+    def render(self, context: Dict[str, Any]) -> str:
+        """Full document HTML; identical to template.render(**context)"""
+        template = self._load()
+        rendered = []
+        ctx = template.new_context(context)
+        for name, fragment, reused in self.fragments(context):
+            ctx.blocks[name] = [_fragment_func(fragment)]
+            if not reused:
+                rendered.append(name)
+
+        self.last_rendered = rendered
+        self.rendered += len(rendered)
+        self.reused += len(template.blocks) - len(rendered)
+        return self.environment.concat(template.root_render_func(ctx))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sections_rendered": self.rendered,
+            "sections_reused": self.reused,
+            "last_rendered": list(self.last_rendered),
+            "fragments": self.cache.stats(),
+        }
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Modules import each other flat (from render_cache import ...)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
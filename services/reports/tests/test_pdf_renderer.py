@@ -0,0 +1,102 @@
+import pytest
+
+pytest.importorskip("weasyprint")
+
+import pdf_renderer
+from pdf_renderer import CachingUrlFetcher, ImageCache, get_pdf_renderer
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    calls = []
+
+    def fetch(url, *args, **kwargs):
+        calls.append(url)
+        return {"string": f"{url}#{len(calls)}".encode(), "mime_type": "text/css"}
+
+    monkeypatch.setattr(pdf_renderer, "default_url_fetcher", fetch)
+    return calls
+
+
+def test_fetcher_serves_repeats_from_memory(fetches):
+    fetcher = CachingUrlFetcher()
+    assert fetcher("file:///brand.css") == fetcher("file:///brand.css")
+    assert fetches == ["file:///brand.css"]
+
+
+def test_fetcher_refetches_after_ttl(fetches):
+    fetcher = CachingUrlFetcher(ttl_s=0)
+    first = fetcher("file:///logo.png")["string"]
+    assert fetcher("file:///logo.png")["string"] != first
+    assert fetcher.stats()["expired"] == 1 and fetcher.stats()["entries"] == 1
+
+
+def test_fetcher_evicts_least_recently_used_past_max_bytes(fetches):
+    fetcher = CachingUrlFetcher(max_bytes=40)
+    fetcher("file:///a.css")
+    fetcher("file:///b.css")
+    fetcher("file:///a.css")
+    fetcher("file:///c.css")
+    assert fetcher.stats()["bytes"] <= 40
+    fetcher("file:///a.css")
+    assert fetches.count("file:///a.css") == 1
+
+
+class TwoPhaseHTML:
+    """Uses the cache like WeasyPrint: images and their bytes stored at layout, bytes read back at write"""
+
+    images = 0
+    during_layout = None
+
+    def __init__(self, string=None, **kwargs):
+        self.string = string
+
+    def write_pdf(self, target=None, cache=None, **kwargs):
+        urls = [f"file:///img{i}.png" for i in range(self.images)]
+        for url in urls:
+            cache.setdefault(url, object())
+            cache[f"{url}#bytes"] = url.encode()
+        if TwoPhaseHTML.during_layout:
+            hook, TwoPhaseHTML.during_layout = TwoPhaseHTML.during_layout, None
+            hook()
+        return b"".join(cache[f"{url}#bytes"] for url in urls)
+
+
+@pytest.fixture
+def two_phase(monkeypatch):
+    monkeypatch.setattr(pdf_renderer, "HTML", TwoPhaseHTML)
+    monkeypatch.setattr(TwoPhaseHTML, "during_layout", None)
+    return TwoPhaseHTML
+
+
+def test_render_with_more_images_than_max_entries(two_phase, monkeypatch):
+    monkeypatch.setattr(two_phase, "images", 5)
+    renderer = pdf_renderer.PdfRenderer(fetcher=CachingUrlFetcher())
+    renderer.image_cache.max_entries = 3
+    expected = b"".join(f"file:///img{i}.png".encode() for i in range(5))
+    # A second render starting mid-write gets a fresh dict and leaves the first one's bytes alone
+    two_phase.during_layout = lambda: renderer.render("<p>other</p>")
+    assert renderer.render("<p>proposal</p>") == expected
+    assert renderer.render("<p>again</p>") == expected
+    assert renderer.image_cache.generations == 3
+
+
+def test_image_cache_expires_on_fetch_ttl():
+    cache = ImageCache(ttl_s=0)
+    first = cache.for_render()
+    first["file:///logo.png"] = object()
+    second = cache.for_render()
+    assert second is not first and "file:///logo.png" not in second
+    assert first  # still intact for a render holding it
+
+    shared = ImageCache(ttl_s=60)
+    assert shared.for_render() is shared.for_render()
+
+
+def test_one_renderer_per_base_url(monkeypatch):
+    monkeypatch.setattr(pdf_renderer, "_renderers", {})
+    first = get_pdf_renderer("templates/a/")
+    assert get_pdf_renderer("templates/a/") is first
+    second = get_pdf_renderer("templates/b/")
+    assert second is not first and second.base_url == "templates/b/"
+    assert second.url_fetcher is first.url_fetcher
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import tracemalloc
+from decimal import Decimal
+
+from render_cache import RenderCache, cache_key, canonical_json
+
+
+def write(path, size):
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_hit_copies_the_stored_document(tmp_path):
+    cache = RenderCache(tmp_path / "cache", max_bytes=1000)
+    key = cache_key("proposal_pdf", "v1", {"a": 1})
+    assert not cache.fetch(key, tmp_path / "out.pdf")
+    cache.store(key, write(tmp_path / "doc.pdf", 10))
+    assert cache.fetch(key, tmp_path / "out.pdf")
+    assert (tmp_path / "out.pdf").read_bytes() == b"x" * 10
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_key_changes_with_version_context_and_branding():
+    base = cache_key("proposal_pdf", "v1", {"a": 1}, {"name": "Eagle Eye"})
+    assert base == cache_key("proposal_pdf", "v1", {"a": 1}, {"name": "Eagle Eye"})
+    assert base != cache_key("proposal_pdf", "v2", {"a": 1}, {"name": "Eagle Eye"})
+    assert base != cache_key("proposal_pdf", "v1", {"a": 2}, {"name": "Eagle Eye"})
+    assert base != cache_key("proposal_pdf", "v1", {"a": 1}, {"name": "Other"})
+
+
+def test_key_is_the_hash_of_the_canonical_json():
+    context = {"b": [1, Decimal("2.50")], "a": {"z": None, "y": "é"}}
+    expected = hashlib.sha256()
+    for part in ("xactimate_csv", "1", canonical_json(context), canonical_json({})):
+        expected.update(part.encode("utf-8") + b"\0")
+    assert cache_key("xactimate_csv", "1", context) == expected.hexdigest()
+
+
+def test_key_does_not_materialize_the_payload():
+    trades = {f"trade-{t}": [{"line_item": f"item {i}", "qty": i, "unit_cost": 1.5} for i in range(500)]
+              for t in range(40)}
+    encoded = len(canonical_json(trades))
+    tracemalloc.start()
+    try:
+        cache_key("xactimate_csv", "1", trades)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < encoded / 4
+
+
+def test_bound_holds_across_instances_sharing_a_directory(tmp_path):
+    root = tmp_path / "cache"
+    first, second = RenderCache(root, max_bytes=250), RenderCache(root, max_bytes=250)
+    for i, cache in enumerate([first, second] * 3):
+        key = cache_key("proposal_pdf", "v1", {"n": i})
+        cache.store(key, write(tmp_path / f"doc{i}.pdf", 100))
+        os.utime(cache._path(key), (i, i))  # distinct mtimes: store order = LRU order
+
+    on_disk = [p for p in root.glob("??/*")]
+    assert sum(p.stat().st_size for p in on_disk) <= 250
+    assert len(on_disk) == 2
+    newest = cache_key("proposal_pdf", "v1", {"n": 5})
+    assert second.fetch(newest, tmp_path / "out.pdf")
+
+
+def test_hits_keep_documents_from_eviction(tmp_path):
+    cache = RenderCache(tmp_path / "cache", max_bytes=250)
+    keys = [cache_key("proposal_pdf", "v1", {"n": i}) for i in range(3)]
+    for i, key in enumerate(keys[:2]):
+        cache.store(key, write(tmp_path / f"doc{i}.pdf", 100))
+        os.utime(cache._path(key), (i, i))
+    assert cache.fetch(keys[0], tmp_path / "out.pdf")  # now most recently used
+    cache.store(keys[2], write(tmp_path / "doc2.pdf", 100))
+    assert cache.fetch(keys[0], tmp_path / "out.pdf")
+    assert not cache.fetch(keys[1], tmp_path / "out.pdf")
+
+
+def test_oversized_document_is_kept_until_the_next_store(tmp_path):
+    cache = RenderCache(tmp_path / "cache", max_bytes=50)
+    key = cache_key("proposal_pdf", "v1", {})
+    cache.store(key, write(tmp_path / "doc.pdf", 100))
+    assert cache.fetch(key, tmp_path / "out.pdf")
+
+
+def test_nothing_touches_disk_until_first_use(tmp_path):
+    cache = RenderCache(tmp_path / "cache")
+    assert not (tmp_path / "cache").exists()
+    cache.fetch(cache_key("proposal_pdf", "v1", {}), tmp_path / "out.pdf")
+    assert (tmp_path / "cache").exists()
+
+
+def test_store_keeps_a_running_total_without_rescanning(tmp_path, monkeypatch):
+    cache = RenderCache(tmp_path / "cache", max_bytes=1000)
+    cache.stats()  # initial scan
+    scans = []
+    monkeypatch.setattr(cache, "_scan", lambda *a, **k: scans.append(a) or {"bytes": 0, "entries": 0, "evicted": 0})
+    for i in range(3):
+        cache.store(cache_key("proposal_pdf", "v1", {"n": i}), write(tmp_path / f"doc{i}.pdf", 100))
+    cache.store(cache_key("proposal_pdf", "v1", {"n": 0}), write(tmp_path / "doc0.pdf", 50))  # replaced
+    assert scans == []
+    assert cache.stats()["bytes"] == 250 and cache.stats()["entries"] == 3
+
+
+def test_hit_rate_is_combined_across_processes(tmp_path):
+    root = tmp_path / "cache"
+    worker_a, worker_b = RenderCache(root), RenderCache(root)
+    key = cache_key("proposal_pdf", "v1", {})
+    worker_a.fetch(key, tmp_path / "out.pdf")
+    worker_a.store(key, write(tmp_path / "doc.pdf", 10))
+    worker_b.fetch(key, tmp_path / "out.pdf")
+    worker_b.fetch(key, tmp_path / "out.pdf")
+    stats = RenderCache(root).stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["entries"] == 1 and stats["bytes"] == 10
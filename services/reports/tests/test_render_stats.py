@@ -0,0 +1,59 @@
+from concurrent.futures import Future
+
+import pytest
+
+pytest.importorskip("weasyprint")
+pytest.importorskip("fastapi")
+
+from fastapi.testclient import TestClient
+
+import app
+import render_pool
+from render_cache import RenderCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_timings(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, "_render_timings", {})
+    monkeypatch.setattr(app, "_render_cache", RenderCache(tmp_path / "cache"))
+
+
+def test_startup_precompiles_templates_and_exposes_stats(monkeypatch):
+    warmed = []
+    monkeypatch.setattr(app, "precompile_templates", lambda: warmed.append(True))
+    app._record_timing("proposal.pdf.j2", 0.010, 0.030)
+
+    with TestClient(app.app) as client:
+        assert warmed == [True]
+        stats = client.get("/api/v1/render-stats").json()
+
+    assert stats["timings"]["proposal.pdf.j2"]["count"] == 1
+    assert stats["render_cache"]["hits"] == 0
+
+
+def test_pool_worker_timings_are_merged_into_the_parent(monkeypatch, tmp_path):
+    def fake_render(payload, output_path):
+        open(output_path, "wb").write(b"%PDF-")
+        app._record_timing("proposal.pdf.j2", 0.010, 0.030)
+
+    monkeypatch.setitem(app.RENDERERS, "proposal_pdf", fake_render)
+
+    # What a worker sends back: its own timings, drained so they are not reported twice
+    result = render_pool._render_document("proposal_pdf", {"n": 1}, str(tmp_path / "p.pdf"), 10.0)
+    assert result.ok and result.timings["proposal.pdf.j2"]["count"] == 1
+    assert app.render_timings() == {}
+
+    pool = render_pool.RenderPool.__new__(render_pool.RenderPool)  # no worker processes
+    pool.timeout_s = 10.0
+    for _ in range(2):
+        pool._result(_done(result), "proposal_pdf", str(tmp_path / "p.pdf"))
+
+    timings = app.render_timings()["proposal.pdf.j2"]
+    assert timings["count"] == 2
+    assert timings["mean_pdf_ms"] == pytest.approx(30.0)
+
+
+def _done(result):
+    future = Future()
+    future.set_result(result)
+    return future
@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("weasyprint")
+
+import app
+
+
+@pytest.fixture
+def assets(tmp_path, monkeypatch):
+    templates = tmp_path / "templates"
+    templates.mkdir()
+    (templates / "base.j2").write_text("<html>{% block body %}{% endblock %}</html>")
+    (templates / "proposal.pdf.j2").write_text("{% extends 'base.j2' %}{% block body %}hi{% endblock %}")
+    (templates / "logo.png").write_bytes(b"logo-v1")
+    brand = tmp_path / "brand.css"
+    (tmp_path / "font.woff").write_bytes(b"font-v1")
+    brand.write_text("@font-face { src: url('font.woff') }")
+
+    monkeypatch.setattr(app, "TEMPLATE_DIR", templates)
+    monkeypatch.setattr(app, "SHARED_CSS", [str(brand)])
+    monkeypatch.setattr(app, "DEBUG", True)  # recompute on every call
+    monkeypatch.setattr(app, "_template_env", None)
+    monkeypatch.setattr(app, "BYTECODE_CACHE_DIR", tmp_path / "bytecode")
+    return tmp_path
+
+
+@pytest.mark.parametrize("changed", [
+    "templates/base.j2", "templates/logo.png", "brand.css", "font.woff",
+])
+def test_version_changes_with_every_render_input(assets, changed):
+    before = app.renderer_version("proposal_pdf")
+    path = assets / changed
+    path.write_bytes(path.read_bytes() + b" ")
+    assert app.renderer_version("proposal_pdf") != before
+
+
+def test_version_changes_with_weasyprint(assets, monkeypatch):
+    before = app.renderer_version("proposal_pdf")
+    monkeypatch.setattr(app.weasyprint, "__version__", "0.0-test")
+    assert app.renderer_version("proposal_pdf") != before
@@ -0,0 +1,93 @@
+import copy
+from pathlib import Path
+
+import pytest
+from jinja2 import DictLoader, Environment, FileSystemLoader
+
+from sections import SectionRenderer
+
+TEMPLATES = Path(__file__).resolve().parents[3] / "templates"
+
+
+def finding(code, severity, discipline, **extra):
+    return {
+        "finding_code": code, "severity": severity, "discipline": discipline,
+        "code_citation": f"IRC 2018 {code}", "location": "A1", "consequence": "Permit rejection",
+        "fix": "Revise the detail per code", "ve_alt": None, "submittal_needed": None, "evidence_refs": [],
+        "status": "open", **extra,
+    }
+
+
+@pytest.fixture
+def context():
+    return {
+        "project": {"name": "123 Main St", "living_sf": 2400, "total_sf": 3100, "spec_tier": "Standard"},
+        "jurisdiction": {"municipality": "Atlanta", "state": "GA", "code_set": "IRC 2018", "climate_zone": "3"},
+        "findings": [
+            finding("F-01", "Red", "Structural", submittal_needed="Truss calcs"),
+            finding("F-02", "Orange", "Envelope", ve_alt="Fluid-applied WRB"),
+            finding("F-03", "Yellow", "Energy"),
+            finding("F-04", "Red", "Envelope"),
+        ],
+        "estimate": {
+            "base": {"Framing": [{"wbs": "06.01", "line_item": "Studs", "uom": "LF", "qty": 100,
+                                  "unit_cost": 2.5, "ext_cost": 250.0}]},
+            "alternates": {},
+            "summary": {"subtotal": 250.0, "overhead_pct": 10, "overhead_amt": 25.0, "profit_pct": 5,
+                        "profit_amt": 12.5, "contingency_pct": 5, "contingency_amt": 12.5,
+                        "total": 300.0, "grand_total": 300.0},
+        },
+        "submittals": [],
+    }
+
+
+def format_grouped(spec, *args):
+    # The template uses "%,.2f", which printf-style % formatting rejects
+    return format(args[0], spec[1:]) if spec.startswith("%,") else spec % args
+
+
+@pytest.fixture
+def sections():
+    env = Environment(loader=FileSystemLoader(str(TEMPLATES)))
+    env.filters["format"] = format_grouped
+    return SectionRenderer(env, "proposal_comprehensive.pdf.j2")
+
+
+def test_assembled_document_matches_full_render(sections, context):
+    expected = sections.environment.get_template(sections.template_name).render(**context)
+    assert sections.render(context) == expected
+    assert sections.render(context) == expected
+    assert sections.last_rendered == []
+
+
+@pytest.mark.parametrize("index, field, value, rerendered", [
+    (0, "status", "resolved", []),                                # no section shows status
+    (2, "location", "B4", ["section_c"]),
+    (2, "fix", "Add R-5 slab edge insulation", ["section_b", "section_c", "section_e"]),
+    (3, "severity", "Orange", ["section_a", "section_b", "section_c", "section_h", "section_i"]),
+])
+def test_one_finding_update_rerenders_only_sections_showing_it(sections, context, index, field, value, rerendered):
+    sections.render(context)
+    updated = copy.deepcopy(context)
+    updated["findings"][index][field] = value
+
+    html = sections.render(updated)
+    assert sections.last_rendered == rerendered
+    assert html == sections.environment.get_template(sections.template_name).render(**updated)
+
+
+def test_appendix_depends_on_severities_not_whole_findings(sections):
+    deps = sections.dependencies()["section_i"]
+    assert "findings" not in deps
+    assert "findings.[].severity" in deps
+
+
+def test_include_keys_on_whole_context():
+    env = Environment(loader=DictLoader({
+        "doc.j2": "{% block body %}{% include 'part.j2' %}{% endblock %}",
+        "part.j2": "{{ anything }}",
+    }))
+    sections = SectionRenderer(env, "doc.j2")
+    assert sections.dependencies() == {"body": [""]}
+    assert sections.render({"anything": 1}) == "1"
+    assert sections.render({"anything": 2}) == "2"